@@ -2,25 +2,28 @@ from preprocessing.dataextraction import JobMatcher
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-from typing import List, Dict, Any
-import spacy
+from scipy import sparse
+from typing import List, Dict, Any, Optional
+from preprocessing.models.patterns import EDUCATION_LEVELS
+from preprocessing.utils.model_registry import get_nlp
+from preprocessing.utils.ranking_utils import top_k
+from preprocessing.utils.skill_matcher import get_skill_matcher
+from preprocessing.utils.skill_vectors import SkillVectorStore
 import re
 
+# Vector similarity above which two differently named skills count as a match
+SKILL_SIMILARITY_THRESHOLD = 0.8
+
 class ResumeRanker:
     def __init__(self):
         self.job_matcher = JobMatcher()
-        self.nlp = spacy.load('en_core_web_lg')
+        self.nlp = get_nlp()
+        # Skill vectors computed once for the known vocabulary; new skills are added on first use
+        self.skill_vectors = SkillVectorStore(self.nlp, get_skill_matcher().categories)
         self.vectorizer = TfidfVectorizer(stop_words='english')
         
         # Education level mapping with scores
-        self.education_levels = {
-            'high school': 1,
-            'associate': 2,
-            'bachelor': 3,
-            'master': 4,
-            'phd': 5,
-            'doctorate': 5
-        }
+        self.education_levels = EDUCATION_LEVELS
         
         # Skill proficiency weights
         self.skill_weights = {
@@ -30,52 +33,202 @@ class ResumeRanker:
             'beginner': 0.4
         }
 
-    def rank_resumes(self, job_description, resumes: List[Any]) -> List[Dict[str, Any]]:
+    def rank_resumes(self, job_description, resumes: List[Any], k: Optional[int] = None,
+                     offset: int = 0, min_score: Optional[float] = None) -> List[Dict[str, Any]]:
         """
         Rank resumes based on multiple criteria with improved scoring
+        
+        Scores are computed for every resume as arrays; only the requested page
+        of results is sorted and gets detailed skill match information.
+        
+        Args:
+            job_description: Job to rank against
+            resumes: Candidate resumes
+            k: Number of results to return; None returns all of them
+            offset: Number of best results to skip, for pagination
+            min_score: Drop resumes whose overall score is below this
         """
         # Pre-process job description
         job_skills = set(skill.lower().strip() for skill in job_description.required_skills)
         job_text = f"{job_description.description} {' '.join(job_skills)}"
         
-        # Calculate TF-IDF vectors for job description
-        job_vector = self.vectorizer.fit_transform([job_text])
+        # Calculate various match scores
+        count = len(resumes)
+        skill_scores = np.fromiter(
+            (self._calculate_skill_match(resume.skills, job_skills) for resume in resumes), dtype=float, count=count)
+        exp_scores = np.fromiter(
+            (self._calculate_experience_match(resume.total_experience, job_description.required_experience) for resume in resumes),
+            dtype=float, count=count)
+        edu_scores = np.fromiter(
+            (self._calculate_education_match(resume.highest_qualification, job_description.required_education) for resume in resumes),
+            dtype=float, count=count)
+        text_similarities = np.fromiter(
+            (self._calculate_text_similarity(resume.resume_text, job_text) for resume in resumes), dtype=float, count=count)
+        location_scores = np.fromiter(
+            (self._calculate_location_match(resume.location, job_description.location) for resume in resumes),
+            dtype=float, count=count)
+        
+        return self._select_results(resumes, job_skills, {
+            'skill_score': skill_scores,
+            'experience_score': exp_scores,
+            'education_score': edu_scores,
+            'text_similarity': text_similarities,
+            'location_score': location_scores
+        }, k, offset, min_score)
+
+    def build_candidate_pool(self, resumes: List[Any]) -> Dict[str, Any]:
+        """
+        Convert resumes into the columnar form scored by rank_resumes_batch
+        
+        Build the pool once and rank any number of jobs against it.
+        
+        Returns:
+            dict with the resumes plus experience and education_level arrays,
+            location_id array (-1 for unknown) with its location_ids
+            vocabulary, a CSR skill bitset matrix with its skill_ids
+            vocabulary, and a TF-IDF matrix with its fitted vectorizer
+        """
+        skill_ids = {}
+        location_ids = {}
+        indptr = [0]
+        indices = []
+        location_id = np.empty(len(resumes), dtype=np.int32)
+        
+        for i, resume in enumerate(resumes):
+            for skill in {skill.lower() for skill in resume.skills}:
+                indices.append(skill_ids.setdefault(skill, len(skill_ids)))
+            indptr.append(len(indices))
+            location = (resume.location or '').lower()
+            location_id[i] = location_ids.setdefault(location, len(location_ids)) if location else -1
+        
+        skills = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(resumes), len(skill_ids))
+        )
+        
+        # Fit once on the whole pool; the job is only transformed at ranking time
+        vectorizer = TfidfVectorizer(stop_words='english')
+        try:
+            tfidf = vectorizer.fit_transform([resume.resume_text or '' for resume in resumes])
+        except ValueError:
+            # Empty pool or no usable terms
+            vectorizer, tfidf = None, None
+        
+        return {
+            'resumes': resumes,
+            'experience': np.array([resume.total_experience or 0.0 for resume in resumes], dtype=np.float64),
+            'education_level': np.array(
+                [self._get_education_level(resume.highest_qualification or '') for resume in resumes], dtype=np.int8),
+            'location_id': location_id,
+            'location_ids': location_ids,
+            'skills': skills,
+            'skill_ids': skill_ids,
+            'vectorizer': vectorizer,
+            'tfidf': tfidf
+        }
+
+    def rank_resumes_batch(self, job_description, pool: Dict[str, Any], k: Optional[int] = None,
+                           offset: int = 0, min_score: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Rank a candidate pool built by build_candidate_pool
+        
+        Computes the same component and overall scores as rank_resumes with
+        array operations over the whole pool instead of a loop per resume.
+        The one difference is text similarity: it uses IDF weights fitted on
+        the pool, not a vectorizer refitted on each resume/job pair.
+        
+        Args:
+            job_description: Job to rank against
+            pool: Columnar candidate pool
+            k: Number of results to return; None returns all of them
+            offset: Number of best results to skip, for pagination
+            min_score: Drop resumes whose overall score is below this
+        """
+        resumes = pool['resumes']
+        count = len(resumes)
+        job_skills = set(skill.lower().strip() for skill in job_description.required_skills)
+        job_text = f"{job_description.description} {' '.join(job_skills)}"
+        
+        # Skills: one (candidates x vocabulary) by (vocabulary x required) product
+        skill_scores = np.zeros(count)
+        required = sorted(job_skills)
+        if required and pool['skill_ids']:
+            vocabulary = list(pool['skill_ids'])
+            # Resume skills that exactly match another required skill never count as semantic matches
+            semantic = self.skill_vectors.similarity(required, vocabulary) > SKILL_SIMILARITY_THRESHOLD
+            semantic &= np.array([skill not in job_skills for skill in vocabulary])
+            for r, skill in enumerate(required):
+                if skill in pool['skill_ids']:
+                    semantic[r, pool['skill_ids'][skill]] = True
+            satisfied = pool['skills'] @ sparse.csr_matrix(semantic.T.astype(np.float32))
+            skill_scores = satisfied.getnnz(axis=1) / len(required) * 100.0
+        
+        # Experience: full marks when met, logarithmic partial credit otherwise
+        exp_scores = np.zeros(count)
+        required_experience = job_description.required_experience
+        if required_experience:
+            experience = pool['experience']
+            partial = np.log1p(np.maximum(experience, 0.0) / required_experience) / np.log1p(1.0)
+            exp_scores = np.where(experience >= required_experience, 1.0, partial)
+        
+        # Education: full marks at or above the required level, half credit scaled below
+        edu_scores = np.zeros(count)
+        if job_description.required_education:
+            required_level = self._get_education_level(job_description.required_education)
+            levels = pool['education_level'].astype(np.float64)
+            if required_level:
+                edu_scores = np.where(levels >= required_level, 1.0, 0.5 * levels / required_level)
+            else:
+                edu_scores = np.ones(count)
+        
+        # Text similarity: rows are L2-normalized, so a dot product is the cosine
+        text_similarities = np.zeros(count)
+        if pool['tfidf'] is not None:
+            job_vector = pool['vectorizer'].transform([job_text])
+            text_similarities = (pool['tfidf'] @ job_vector.T).toarray().ravel()
+        
+        # Location: compare interned IDs
+        location_scores = np.zeros(count)
+        job_location = (job_description.location or '').lower()
+        if job_location in pool['location_ids']:
+            location_scores = (pool['location_id'] == pool['location_ids'][job_location]).astype(np.float64)
+        
+        return self._select_results(resumes, job_skills, {
+            'skill_score': skill_scores,
+            'experience_score': exp_scores,
+            'education_score': edu_scores,
+            'text_similarity': text_similarities,
+            'location_score': location_scores
+        }, k, offset, min_score)
+
+    def _select_results(self, resumes: List[Any], job_skills: set, scores: Dict[str, np.ndarray],
+                        k: Optional[int], offset: int, min_score: Optional[float]) -> List[Dict[str, Any]]:
+        """
+        Weight component scores and build result dicts for the requested page only
+        """
+        # Calculate weighted overall score
+        overall_scores = (
+            scores['skill_score'] * 0.35 +      # Skills weight
+            scores['experience_score'] * 0.25 +        # Experience weight
+            scores['education_score'] * 0.15 +        # Education weight
+            scores['text_similarity'] * 0.15 +   # Text similarity weight
+            scores['location_score'] * 0.10      # Location weight
+        )
+        
+        # Select the page, best first
+        indices, _ = top_k(overall_scores, len(resumes) if k is None else k, offset, min_score)
         
         scored_resumes = []
-        for resume in resumes:
-            # Calculate various match scores
-            skill_score = self._calculate_skill_match(resume.skills, job_skills)
-            exp_score = self._calculate_experience_match(resume.total_experience, job_description.required_experience)
-            edu_score = self._calculate_education_match(resume.highest_qualification, job_description.required_education)
-            text_similarity = self._calculate_text_similarity(resume.resume_text, job_text)
-            location_score = self._calculate_location_match(resume.location, job_description.location)
-            
-            # Calculate weighted overall score
-            overall_score = (
-                skill_score * 0.35 +      # Skills weight
-                exp_score * 0.25 +        # Experience weight
-                edu_score * 0.15 +        # Education weight
-                text_similarity * 0.15 +   # Text similarity weight
-                location_score * 0.10      # Location weight
-            )
-            
-            # Calculate skill match details
-            skill_matches = self._get_skill_match_details(resume.skills, job_skills)
-            
-            scored_resumes.append({
-                'resume': resume,
-                'skill_score': skill_score,
-                'experience_score': exp_score,
-                'education_score': edu_score,
-                'text_similarity': text_similarity,
-                'location_score': location_score,
-                'overall_score': overall_score,
-                'skill_matches': skill_matches,
-                'missing_skills': list(job_skills - set(skill.lower() for skill in resume.skills))
-            })
-        
-        # Sort by overall score
-        return sorted(scored_resumes, key=lambda x: x['overall_score'], reverse=True)
+        for i in indices:
+            resume = resumes[i]
+            result = {'resume': resume}
+            result.update((name, float(values[i])) for name, values in scores.items())
+            result['overall_score'] = float(overall_scores[i])
+            result['skill_matches'] = self._get_skill_match_details(resume.skills, job_skills)
+            result['missing_skills'] = list(job_skills - set(skill.lower() for skill in resume.skills))
+            scored_resumes.append(result)
+        
+        return scored_resumes
 
     def _calculate_skill_match(self, resume_skills: List[str], required_skills: set) -> float:
         """
@@ -92,17 +245,11 @@ class ResumeRanker:
         exact_matches = set(resume_skills_lower).intersection(required_skills_lower)
         
         # Calculate semantic similarity for non-exact matches
-        semantic_matches = 0
-        for req_skill in required_skills_lower:
-            if req_skill not in exact_matches:
-                req_doc = self.nlp(req_skill)
-                for res_skill in resume_skills_lower:
-                    if res_skill not in exact_matches:
-                        res_doc = self.nlp(res_skill)
-                        similarity = req_doc.similarity(res_doc)
-                        if similarity > 0.8:  # High similarity threshold
-                            semantic_matches += 1
-                            break
+        unmatched_required = [skill for skill in required_skills_lower if skill not in exact_matches]
+        unmatched_resume = [skill for skill in resume_skills_lower if skill not in exact_matches]
+        similarity = self.skill_vectors.similarity(unmatched_required, unmatched_resume)
+        # A required skill counts once if any resume skill is similar enough
+        semantic_matches = int((similarity > SKILL_SIMILARITY_THRESHOLD).any(axis=1).sum())
         
         total_matches = len(exact_matches) + semantic_matches
         return (total_matches / len(required_skills)) * 100.0
@@ -113,6 +260,7 @@ class ResumeRanker:
         """
         if not required_experience:
             return 0.0
+        resume_experience = resume_experience or 0.0
             
         if resume_experience >= required_experience:
             # Cap the score at 1.0 for meeting requirements
@@ -163,7 +311,7 @@ class ResumeRanker:
         """
         Get numeric education level
         """
-        education = education.lower()
+        education = (education or '').lower()
         for level, score in self.education_levels.items():
             if level in education:
                 return score
@@ -179,18 +327,20 @@ class ResumeRanker:
             'missing_skills': []
         }
         
-        for req_skill in required_skills:
-            found = False
-            for res_skill in resume_skills:
+        required = list(required_skills)
+        resume_skills = list(resume_skills)
+        similarity = self.skill_vectors.similarity(required, resume_skills)
+        
+        for i, req_skill in enumerate(required):
+            # First resume skill that matches exactly or is similar enough
+            for j, res_skill in enumerate(resume_skills):
                 if req_skill.lower() == res_skill.lower():
                     matches['exact_matches'].append(res_skill)
-                    found = True
                     break
-                elif self.nlp(req_skill).similarity(self.nlp(res_skill)) > 0.8:
+                elif similarity[i, j] > SKILL_SIMILARITY_THRESHOLD:
                     matches['partial_matches'].append(res_skill)
-                    found = True
                     break
-            if not found:
+            else:
                 matches['missing_skills'].append(req_skill)
                 
         return matches
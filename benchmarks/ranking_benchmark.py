@@ -0,0 +1,54 @@
+"""
+Compare ResumeRanker.rank_resumes (per-resume loop) with rank_resumes_batch.
+
+Run from the repository root:
+
+    python -m benchmarks.ranking_benchmark --sizes 1000 10000 100000
+
+The per-resume loop refits a TF-IDF vectorizer for every resume, so by
+default it is only timed up to --loop-max candidates.
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import synthetic_job, synthetic_resumes
+from Notebooks.ranking_algorithm import ResumeRanker
+
+
+def timed(func, *args, **kwargs):
+    """Return (result, elapsed seconds)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark resume ranking')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='Candidate pool sizes')
+    parser.add_argument('--k', type=int, default=50, help='Results returned per ranking')
+    parser.add_argument('--loop-max', type=int, default=10000,
+                        help='Largest pool the per-resume loop is timed on')
+    args = parser.parse_args()
+
+    ranker = ResumeRanker()
+    job = synthetic_job()
+
+    print(f"{'candidates':>10} {'loop (s)':>10} {'pool build (s)':>15} {'batch (s)':>10} {'speedup':>8}")
+    for size in args.sizes:
+        resumes = synthetic_resumes(size)
+
+        loop_time = None
+        if size <= args.loop_max:
+            _, loop_time = timed(ranker.rank_resumes, job, resumes, k=args.k)
+
+        pool, build_time = timed(ranker.build_candidate_pool, resumes)
+        _, batch_time = timed(ranker.rank_resumes_batch, job, pool, k=args.k)
+
+        loop_text = f"{loop_time:10.3f}" if loop_time is not None else f"{'skipped':>10}"
+        speedup = f"{loop_time / batch_time:7.0f}x" if loop_time is not None else f"{'-':>8}"
+        print(f"{size:>10} {loop_text} {build_time:15.3f} {batch_time:10.3f} {speedup}")
+
+
+if __name__ == '__main__':
+    main()
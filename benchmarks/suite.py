@@ -0,0 +1,370 @@
+"""
+Benchmark suite for ingest and ranking.
+
+Run from the repository root:
+
+    python -m benchmarks.suite --sizes 1000 10000 --output benchmarks/results/current.json
+    python -m benchmarks.suite --sizes 1000 --compare benchmarks/results/baseline.json
+
+Synthetic resumes are generated from a fixed seed, so results are comparable
+across commits. Ingest benchmarks parse real PDF/DOCX files written to the
+work directory (capped by --max-files, files are reused between runs), while
+matching and ranking benchmarks work on a database seeded directly. SQLite is
+used unless --db-url names another database; that database is written to.
+
+Each benchmark reports total seconds, throughput and per-call latency
+percentiles. A benchmark that cannot run (e.g. a missing model) is recorded
+as an error and the suite carries on.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.synthetic import (
+    generate_resume_files, seed_database, synthetic_job, synthetic_resumes, synthetic_vectors
+)
+from preprocessing.utils.metrics import metrics
+
+DEFAULT_WORKDIR = os.path.join('benchmarks', '.data')
+DEFAULT_RESULTS_DIR = os.path.join('benchmarks', 'results')
+
+
+def latency_stats(latencies: List[float]) -> Dict[str, float]:
+    """Mean and percentiles in milliseconds"""
+    values = np.asarray(latencies) * 1000
+    return {
+        'mean_ms': float(values.mean()),
+        'p50_ms': float(np.percentile(values, 50)),
+        'p95_ms': float(np.percentile(values, 95)),
+        'p99_ms': float(np.percentile(values, 99)),
+        'max_ms': float(values.max())
+    }
+
+
+def result(items: int, seconds: float, latencies: Optional[List[float]] = None, **extra) -> dict:
+    """Benchmark result: items processed, wall time, throughput and latency percentiles"""
+    data = {'items': items, 'seconds': seconds,
+            'throughput_per_s': items / seconds if seconds else None}
+    if latencies:
+        data['latency'] = latency_stats(latencies)
+    data.update(extra)
+    return data
+
+
+def timed_calls(func: Callable, args_list) -> List[float]:
+    latencies = []
+    for args in args_list:
+        start = time.perf_counter()
+        func(*args)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+class Context:
+    """Per-size paths and settings shared by the benchmarks"""
+
+    def __init__(self, args, size: int):
+        self.args = args
+        self.size = size
+        self.workdir = os.path.abspath(args.workdir)
+        self.run_dir = os.path.join(self.workdir, f"run_{size}")
+        os.makedirs(self.run_dir, exist_ok=True)
+
+    @property
+    def file_count(self) -> int:
+        return min(self.size, self.args.max_files)
+
+    def files_dir(self) -> str:
+        """Directory holding file_count synthetic resumes (shared by all sizes)"""
+        directory = os.path.join(self.workdir, f"files_seed{self.args.seed}")
+        generate_resume_files(directory, self.file_count, seed=self.args.seed)
+        # process_files and process_directory read whole directories, so
+        # each size gets a directory of links to exactly its files
+        sized = os.path.join(self.workdir, f"files_seed{self.args.seed}_{self.file_count}")
+        if not os.path.isdir(sized):
+            os.makedirs(sized)
+            for name in sorted(os.listdir(directory))[:self.file_count]:
+                os.symlink(os.path.join(directory, name), os.path.join(sized, name))
+        return sized
+
+    def db_url(self, name: str) -> str:
+        """A fresh database for one benchmark"""
+        if self.args.db_url:
+            return self.args.db_url
+        path = os.path.join(self.run_dir, f"{name}.db")
+        if os.path.exists(path):
+            os.remove(path)
+        return f"sqlite:///{path}"
+
+
+def bench_resume_processor(ctx: Context) -> dict:
+    """ResumeProcessor.process_directory: parse and store files"""
+    from preprocessing.Database_setup.db_design import Base
+    from preprocessing.database.connection import get_engine
+    from preprocessing.processors.resume_processor import ResumeProcessor
+
+    directory = ctx.files_dir()
+    db_url = ctx.db_url('resume_processor')
+    Base.metadata.create_all(get_engine(db_url))
+    processor = ResumeProcessor(db_url)
+
+    metrics.reset()
+    start = time.perf_counter()
+    processed, failed, _ = processor.process_directory(directory)
+    seconds = time.perf_counter() - start
+    return result(ctx.file_count, seconds, processed=processed, failed=failed, stages=metrics.summary())
+
+
+def bench_document_processor(ctx: Context) -> dict:
+    """DocumentProcessor.process_files: parse, analyze and store files"""
+    from preprocessing.processors.document_processor import DocumentProcessor
+
+    directory = ctx.files_dir()
+    processor = DocumentProcessor(directory, None, db_uri=ctx.db_url('document_processor'))
+
+    metrics.reset()
+    start = time.perf_counter()
+    results = processor.process_files()
+    seconds = time.perf_counter() - start
+    analyzed = sum(1 for entry in results.values() if entry['analysis'])
+    return result(ctx.file_count, seconds, analyzed=analyzed, stages=metrics.summary())
+
+
+def bench_match_score(ctx: Context) -> dict:
+    """JobMatcher.calculate_match_score, one call per resume"""
+    from preprocessing.processors.job_matcher import JobMatcher
+
+    matcher = JobMatcher()
+    job = synthetic_job()
+    description = f"{job.description} {' '.join(job.required_skills)}"
+    resumes = synthetic_resumes(min(ctx.size, ctx.args.max_calls), seed=ctx.args.seed)
+    latencies = timed_calls(matcher.calculate_match_score, [(r.resume_text, description) for r in resumes])
+    return result(len(resumes), sum(latencies), latencies)
+
+
+def bench_score_job(ctx: Context) -> dict:
+    """JobMatcher.fit_corpus once, then score_job against the whole corpus"""
+    from preprocessing.processors.job_matcher import JobMatcher
+
+    matcher = JobMatcher()
+    job = synthetic_job()
+    resumes = synthetic_resumes(ctx.size, seed=ctx.args.seed)
+    start = time.perf_counter()
+    matcher.fit_corpus(range(len(resumes)), [r.resume_text for r in resumes])
+    fit_seconds = time.perf_counter() - start
+    latencies = timed_calls(matcher.score_job, [(job.description,)] * ctx.args.repeat)
+    return result(ctx.size * len(latencies), sum(latencies), latencies, fit_seconds=fit_seconds)
+
+
+def bench_matching_candidates(ctx: Context) -> dict:
+    """recruiter_app.get_matching_candidates: first (full scoring) and cached calls"""
+    import recruiter_app
+
+    db_url = ctx.db_url('recruiter_app')
+    start = time.perf_counter()
+    job_id = seed_database(db_url, ctx.size, seed=ctx.args.seed)
+    seed_seconds = time.perf_counter() - start
+
+    # Point the app at the benchmark database and drop anything it cached
+    recruiter_app.DATABASE_URL = db_url
+    recruiter_app.CORPUS_INDEX_PATH = os.path.join(ctx.run_dir, 'corpus_index.pkl')
+    if os.path.exists(recruiter_app.CORPUS_INDEX_PATH):
+        os.remove(recruiter_app.CORPUS_INDEX_PATH)
+    for cached in (recruiter_app.get_session_factory_cached, recruiter_app.get_job_matcher,
+                   recruiter_app.get_candidate_store):
+        cached.clear()
+
+    start = time.perf_counter()
+    _, total = recruiter_app.get_matching_candidates(job_id)
+    cold_seconds = time.perf_counter() - start
+    if total == 0:
+        raise RuntimeError("get_matching_candidates returned no matches")
+
+    latencies = timed_calls(recruiter_app.get_matching_candidates, [(job_id,)] * ctx.args.repeat)
+    must_have = synthetic_job().required_skills[:2]
+    filtered = timed_calls(lambda: recruiter_app.get_matching_candidates(job_id, must_have=must_have),
+                           [()] * ctx.args.repeat)
+    return result(ctx.size, cold_seconds, latencies, seed_seconds=seed_seconds, cold_seconds=cold_seconds,
+                  must_have_latency=latency_stats(filtered))
+
+
+def bench_rank_resumes(ctx: Context) -> dict:
+    """ResumeRanker.rank_resumes, the per-resume loop"""
+    from Notebooks.ranking_algorithm import ResumeRanker
+
+    resumes = synthetic_resumes(min(ctx.size, ctx.args.loop_max), seed=ctx.args.seed)
+    ranker = ResumeRanker()
+    start = time.perf_counter()
+    ranker.rank_resumes(synthetic_job(), resumes, k=ctx.args.k)
+    return result(len(resumes), time.perf_counter() - start)
+
+
+def bench_rank_resumes_batch(ctx: Context) -> dict:
+    """ResumeRanker.rank_resumes_batch over a prebuilt candidate pool"""
+    from Notebooks.ranking_algorithm import ResumeRanker
+
+    resumes = synthetic_resumes(ctx.size, seed=ctx.args.seed)
+    ranker = ResumeRanker()
+    start = time.perf_counter()
+    pool = ranker.build_candidate_pool(resumes)
+    build_seconds = time.perf_counter() - start
+    job = synthetic_job()
+    latencies = timed_calls(lambda: ranker.rank_resumes_batch(job, pool, k=ctx.args.k), [()] * ctx.args.repeat)
+    return result(ctx.size * len(latencies), sum(latencies), latencies, build_seconds=build_seconds)
+
+
+def bench_ivf_search(ctx: Context) -> dict:
+    """IVFIndex.search latency and recall@k against exhaustive EmbeddingIndex.scores, per nprobe"""
+    from preprocessing.utils.embedding_index import EmbeddingIndex
+    from preprocessing.utils.ivf_index import IVFIndex
+
+    directory = os.path.join(ctx.run_dir, 'embedding_index')
+    shutil.rmtree(directory, ignore_errors=True)
+    index = EmbeddingIndex(directory)
+    for start in range(0, ctx.size, 100000):
+        vectors = synthetic_vectors(min(100000, ctx.size - start), seed=ctx.args.seed, offset=start)
+        index.upsert(range(start, start + len(vectors)), vectors)
+
+    ivf = IVFIndex(index)
+    start = time.perf_counter()
+    ivf.build(seed=ctx.args.seed)
+    build_seconds = time.perf_counter() - start
+
+    # Queries near stored vectors, like a job resembling some resumes
+    rng = np.random.default_rng(ctx.args.seed)
+    queries = np.asarray(index.vectors[rng.integers(0, len(index.ids), ctx.args.repeat)], dtype=np.float32)
+    queries += 0.5 * rng.standard_normal(queries.shape).astype(np.float32) / np.sqrt(queries.shape[1])
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    exhaustive = timed_calls(index.scores, [(query,) for query in queries])
+    probes = {}
+    for nprobe in ctx.args.nprobe:
+        latencies = timed_calls(ivf.search, [(query, ctx.args.ann_k, nprobe) for query in queries])
+        probes[str(nprobe)] = {'recall': ivf.recall(queries, ctx.args.k, nprobe), **latency_stats(latencies)}
+    return result(ctx.size * len(exhaustive), sum(exhaustive), exhaustive, build_seconds=build_seconds,
+                  lists=ivf.n_lists, nprobe=probes)
+
+
+BENCHMARKS = {
+    'resume_processor.process_directory': bench_resume_processor,
+    'document_processor.process_files': bench_document_processor,
+    'job_matcher.calculate_match_score': bench_match_score,
+    'job_matcher.score_job': bench_score_job,
+    'recruiter_app.get_matching_candidates': bench_matching_candidates,
+    'ranker.rank_resumes': bench_rank_resumes,
+    'ranker.rank_resumes_batch': bench_rank_resumes_batch,
+    'ivf_index.search': bench_ivf_search
+}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run(args) -> dict:
+    selected = [name for name in BENCHMARKS if not args.only or any(part in name for part in args.only)]
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'results': []
+    }
+
+    for size in args.sizes:
+        ctx = Context(args, size)
+        for name in selected:
+            print(f"[{size}] {name} ...", flush=True)
+            entry = {'benchmark': name, 'size': size}
+            try:
+                entry.update(BENCHMARKS[name](ctx), status='ok')
+            except Exception as e:
+                entry.update(status='error', error=f"{type(e).__name__}: {e}")
+            report['results'].append(entry)
+            print(f"    {format_entry(entry)}")
+    return report
+
+
+def format_entry(entry: dict) -> str:
+    if entry['status'] != 'ok':
+        return entry['error']
+    text = f"{entry['seconds']:.3f}s"
+    if entry.get('throughput_per_s'):
+        text += f", {entry['throughput_per_s']:.1f}/s"
+    if 'latency' in entry:
+        text += f", p50 {entry['latency']['p50_ms']:.2f}ms, p95 {entry['latency']['p95_ms']:.2f}ms"
+    return text
+
+
+def compare(report: dict, baseline_path: str) -> None:
+    """Print throughput ratios against an earlier report"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(r['benchmark'], r['size']): r for r in baseline['results'] if r['status'] == 'ok'}
+
+    print(f"\nCompared with {baseline.get('commit') or baseline_path}:")
+    print(f"{'benchmark':<40} {'size':>8} {'before/s':>12} {'after/s':>12} {'change':>8}")
+    for entry in report['results']:
+        before = previous.get((entry['benchmark'], entry['size']))
+        if entry['status'] != 'ok' or before is None or not before.get('throughput_per_s'):
+            continue
+        ratio = entry['throughput_per_s'] / before['throughput_per_s']
+        print(f"{entry['benchmark']:<40} {entry['size']:>8} {before['throughput_per_s']:>12.1f} "
+              f"{entry['throughput_per_s']:>12.1f} {ratio:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ingest and ranking')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000],
+                        help='Numbers of resumes (1000 to 1000000)')
+    parser.add_argument('--only', nargs='*', default=None,
+                        help='Run only benchmarks whose name contains one of these strings')
+    parser.add_argument('--db-url', default=None,
+                        help='Database to benchmark against (defaults to a fresh SQLite file per benchmark)')
+    parser.add_argument('--workdir', default=DEFAULT_WORKDIR, help='Generated files and databases')
+    parser.add_argument('--max-files', type=int, default=10000,
+                        help='Most files generated for the ingest benchmarks')
+    parser.add_argument('--max-calls', type=int, default=10000,
+                        help='Most calls timed for per-resume benchmarks')
+    parser.add_argument('--loop-max', type=int, default=10000,
+                        help='Largest pool the per-resume ranking loop is timed on')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed repetitions of whole-pool queries')
+    parser.add_argument('--k', type=int, default=50, help='Results returned per ranking')
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[4, 16, 64],
+                        help='IVF lists probed per query; recall and latency are reported for each')
+    parser.add_argument('--ann-k', type=int, default=2000, help='Candidates retrieved per IVF search')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=None,
+                        help='JSON report path (defaults to benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', default=None, help='Earlier JSON report to compare with')
+    args = parser.parse_args()
+
+    report = run(args)
+
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, f"{(report['commit'] or 'local')[:12]}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""
+Deterministic synthetic resumes and job descriptions for benchmarks.
+
+Everything is derived from a seed, so two runs (or two commits) see the same
+data. Resume files are written once per directory and reused by later runs.
+"""
+import os
+import random
+from types import SimpleNamespace
+from typing import List, Sequence
+
+from sqlalchemy import create_engine, text
+
+from preprocessing.Database_setup.db_design import Base
+from preprocessing.utils.skill_matcher import get_skill_matcher
+
+FIRST_NAMES = ['James', 'Maria', 'Wei', 'Aisha', 'Carlos', 'Priya', 'John', 'Elena', 'Kenji', 'Fatima',
+               'David', 'Sofia', 'Ravi', 'Anna', 'Omar', 'Laura']
+LAST_NAMES = ['Smith', 'Garcia', 'Chen', 'Khan', 'Rossi', 'Sharma', 'Brown', 'Novak', 'Tanaka', 'Ali',
+              'Miller', 'Costa', 'Kumar', 'Schmidt', 'Haddad', 'Jones']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Stark Industries', 'Wayne Enterprises',
+             'Hooli', 'Vandelay Imports', 'Cyberdyne Systems', 'Soylent Analytics']
+TITLES = ['Software Engineer', 'Data Scientist', 'Backend Developer', 'Data Engineer', 'DevOps Engineer',
+          'Machine Learning Engineer', 'Frontend Developer', 'Analyst']
+DEGREES = ['Bachelor of Science in Computer Science', 'Master of Science in Data Science',
+           'Bachelor of Technology', 'PhD in Computer Science', 'Associate Degree', 'High School Diploma']
+UNIVERSITIES = ['State University', 'Institute of Technology', 'City College', 'National University']
+EDUCATION = ['High School Diploma', 'Associate Degree', 'Bachelor of Science',
+             'Master of Science', 'PhD in Computer Science', '']
+LOCATIONS = ['New York', 'San Francisco', 'Austin', 'Seattle', 'Remote', 'London', None]
+WORDS = ['developed', 'designed', 'scalable', 'services', 'pipelines', 'team', 'led',
+         'data', 'platform', 'customers', 'latency', 'deployed', 'cloud', 'models']
+
+
+def _skills() -> List[str]:
+    return sorted(get_skill_matcher().categories)
+
+
+def synthetic_resume_text(rng: random.Random, index: int, skills: Sequence[str]) -> str:
+    """A plain-text resume with contact details, skills, work history and education"""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}{index}@example.com",
+        f"+1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        f"Location: {rng.choice([city for city in LOCATIONS if city])}",
+        "",
+        "Summary",
+        ' '.join(rng.choice(WORDS) for _ in range(40)),
+        "",
+        "Skills",
+        ', '.join(rng.sample(skills, rng.randint(4, 14))),
+        "",
+        "Work Experience"
+    ]
+    year = 2024
+    for _ in range(rng.randint(1, 4)):
+        start = year - rng.randint(1, 5)
+        lines.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)} ({start} - {year})")
+        lines.append(' '.join(rng.choice(WORDS) for _ in range(30)))
+        year = start
+    lines += ["", "Education", f"{rng.choice(DEGREES)}, {rng.choice(UNIVERSITIES)}, {year - 1}"]
+    return '\n'.join(lines)
+
+
+def write_pdf(path: str, text: str) -> None:
+    """Write text to a PDF, continuing on new pages as needed"""
+    import pymupdf
+
+    doc = pymupdf.open()
+    remaining = text.split('\n')
+    while remaining:
+        page = doc.new_page()
+        lines, remaining = remaining[:50], remaining[50:]
+        page.insert_textbox(pymupdf.Rect(50, 50, 545, 800), '\n'.join(lines), fontsize=10)
+    doc.save(path)
+    doc.close()
+
+
+def write_docx(path: str, text: str) -> None:
+    from docx import Document
+
+    doc = Document()
+    for line in text.split('\n'):
+        doc.add_paragraph(line)
+    doc.save(path)
+
+
+WRITERS = {'pdf': write_pdf, 'docx': write_docx}
+
+
+def generate_resume_files(directory: str, count: int, formats: Sequence[str] = ('pdf', 'docx'),
+                          seed: int = 42) -> List[str]:
+    """
+    Write count resumes into directory, alternating formats.
+
+    File i always has the same content for a given seed, and files that
+    already exist are kept, so a larger run extends a smaller one.
+
+    Returns:
+        list: Paths of the count files
+    """
+    os.makedirs(directory, exist_ok=True)
+    skills = _skills()
+    paths = []
+    for index in range(count):
+        fmt = formats[index % len(formats)]
+        path = os.path.join(directory, f"resume_{index:07d}.{fmt}")
+        if not os.path.exists(path):
+            rng = random.Random(f"{seed}-{index}")
+            WRITERS[fmt](path, synthetic_resume_text(rng, index, skills))
+        paths.append(path)
+    return paths
+
+
+def synthetic_resumes(count: int, seed: int = 42):
+    """Generate resume-like objects with the attributes ResumeRanker reads"""
+    rng = random.Random(seed)
+    skills = _skills()
+    resumes = []
+    for _ in range(count):
+        resume_skills = rng.sample(skills, rng.randint(3, 12))
+        text = ' '.join(rng.choice(WORDS) for _ in range(120)) + ' ' + ' '.join(resume_skills)
+        resumes.append(SimpleNamespace(
+            skills=resume_skills,
+            total_experience=round(rng.uniform(0, 15), 1),
+            highest_qualification=rng.choice(EDUCATION),
+            location=rng.choice(LOCATIONS),
+            resume_text=text
+        ))
+    return resumes
+
+
+def synthetic_job():
+    """A job description with the attributes ResumeRanker reads"""
+    return SimpleNamespace(
+        description='Backend engineer building scalable data services and pipelines in the cloud',
+        required_skills=['python', 'sql', 'docker', 'aws', 'machine learning'],
+        required_experience=5.0,
+        required_education='bachelor',
+        location='New York'
+    )
+
+
+def synthetic_vectors(count: int, dim: int = 384, clusters: int = 256, seed: int = 42, offset: int = 0):
+    """
+    Unit vectors scattered around random cluster centers, standing in for
+    resume embeddings where no model is needed.
+
+    The centers depend only on the seed, so batches generated with
+    different offsets belong to the same collection.
+    """
+    import numpy as np
+
+    centers = np.random.default_rng(seed).standard_normal((clusters, dim)).astype(np.float32)
+    rng = np.random.default_rng([seed, offset])
+    vectors = centers[rng.integers(0, clusters, count)] + 1.5 * rng.standard_normal((count, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def seed_database(db_url: str, count: int, seed: int = 42, batch_size: int = 10000) -> int:
+    """
+    Create the schema and fill it with count candidates, their skills and
+    one job description, bypassing the parsers.
+
+    Returns:
+        int: ID of the job description
+    """
+    engine = create_engine(db_url)
+    Base.metadata.create_all(engine)
+    job = synthetic_job()
+
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO job_descriptions
+            (title, description, required_skills, required_experience, required_education, location)
+            VALUES (:title, :description, :skills, :experience, :education, :location)
+        """), {'title': 'Backend Engineer', 'description': job.description,
+               'skills': ','.join(job.required_skills), 'experience': job.required_experience,
+               'education': job.required_education, 'location': job.location})
+        job_id = conn.execute(text("SELECT MAX(job_id) FROM job_descriptions")).scalar()
+
+        offset = conn.execute(text("SELECT COALESCE(MAX(candidate_id), 0) FROM candidates")).scalar()
+        for start in range(0, count, batch_size):
+            resumes = synthetic_resumes(min(batch_size, count - start), seed=seed + start)
+            ids = range(offset + start + 1, offset + start + len(resumes) + 1)
+            conn.execute(text("""
+                INSERT INTO candidates
+                (candidate_id, name, email, total_experience, highest_qualification, location, resume_text)
+                VALUES (:id, :name, :email, :experience, :education, :location, :text)
+            """), [{'id': candidate_id, 'name': f"Candidate {candidate_id}",
+                    'email': f"candidate{candidate_id}@example.com", 'experience': resume.total_experience,
+                    'education': resume.highest_qualification, 'location': resume.location,
+                    'text': resume.resume_text} for candidate_id, resume in zip(ids, resumes)])
+            conn.execute(text(
+                "INSERT INTO skills (candidate_id, skill_name, proficiency_level) VALUES (:id, :skill, 'Expert')"
+            ), [{'id': candidate_id, 'skill': skill}
+                for candidate_id, resume in zip(ids, resumes) for skill in resume.skills])
+    engine.dispose()
+    return job_id
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, Text, Enum, Date, DateTime, Boolean
+from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, Text, Enum, Date, DateTime, Boolean, Index, func
 from sqlalchemy.orm import relationship, declarative_base
 from datetime import datetime
 from sqlalchemy.schema import CreateTable
@@ -46,6 +46,13 @@ class JobMatch(Base):
     candidate = relationship("Candidate", back_populates="job_matches")
     history = relationship("MatchHistory", back_populates="match", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # One row per (job, candidate); MatchStore upserts on it
+        Index('idx_job_matches_job_candidate', 'job_id', 'candidate_id', unique=True),
+        # A job's matches best first, without a sort
+        Index('idx_job_matches_job_score', 'job_id', 'match_score'),
+    )
+
 # Match-History-Table
 class MatchHistory(Base):
     __tablename__ = 'match_history'
@@ -73,6 +80,9 @@ class Candidate(Base):
     university = Column(String(255))
     location = Column(String(255))
     resume_text = Column(Text)
+    # Database-side defaults so raw SQL inserts and updates are stamped too
+    created_at = Column(DateTime, server_default=func.current_timestamp())
+    updated_at = Column(DateTime, server_default=func.current_timestamp(), onupdate=func.current_timestamp())
 
     # Relationships
     skills = relationship("Skill", back_populates="candidate", cascade="all, delete-orphan")
@@ -83,6 +93,30 @@ class Candidate(Base):
     job_matches = relationship("JobMatch", back_populates="candidate", cascade="all, delete-orphan")
     analysis_results = relationship("AnalysisResults", back_populates="candidate", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index('idx_candidates_updated_at', 'updated_at'),
+        Index('idx_candidates_experience', 'total_experience'),
+    )
+
+# Skill-Dictionary-Table: one row per canonical skill
+class SkillDictionary(Base):
+    __tablename__ = 'skill_dictionary'
+    dictionary_id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(255), nullable=False, unique=True)
+    category = Column(String(100))
+
+    aliases = relationship("SkillAlias", back_populates="skill", cascade="all, delete-orphan")
+
+# Skill-Alias-Table: every spelling of a skill, including its canonical name
+class SkillAlias(Base):
+    __tablename__ = 'skill_aliases'
+    alias = Column(String(255), primary_key=True)
+    dictionary_id = Column(Integer, ForeignKey('skill_dictionary.dictionary_id'), nullable=False)
+
+    skill = relationship("SkillDictionary", back_populates="aliases")
+
+    __table_args__ = (Index('idx_skill_aliases_dictionary', 'dictionary_id'),)
+
 # Skills-Table
 class Skill(Base):
     __tablename__ = 'skills'
@@ -90,8 +124,19 @@ class Skill(Base):
     candidate_id = Column(Integer, ForeignKey('candidates.candidate_id'))
     skill_name = Column(String(255))
     proficiency_level = Column(String(12))
+    # Canonical skill; NULL for skills outside the dictionary
+    dictionary_id = Column(Integer, ForeignKey('skill_dictionary.dictionary_id'))
 
     candidate = relationship("Candidate", back_populates="skills")
+    dictionary_entry = relationship("SkillDictionary")
+
+    __table_args__ = (
+        # Must-have skill filters look up candidates by skill name or canonical skill
+        Index('idx_skills_name_candidate', 'skill_name', 'candidate_id'),
+        Index('idx_skills_dictionary_candidate', 'dictionary_id', 'candidate_id'),
+        # A candidate's skills, for store refreshes and re-ingest deletes
+        Index('idx_skills_candidate', 'candidate_id'),
+    )
 
 # Projects-Table
 class Project(Base):
@@ -118,6 +163,8 @@ class WorkExperience(Base):
 
     candidate = relationship("Candidate", back_populates="experiences")
 
+    __table_args__ = (Index('idx_work_experience_candidate', 'candidate_id'),)
+
 # Certifications-Table
 class Certification(Base):
     __tablename__ = 'certifications'
@@ -151,6 +198,8 @@ class Ranking(Base):
     candidate = relationship("Candidate", back_populates="rankings")
     job = relationship("JobDescription", back_populates="rankings")
 
+    __table_args__ = (Index('idx_rankings_job_candidate', 'job_id', 'candidate_id', unique=True),)
+
 # Analysis-Results-Table
 class AnalysisResults(Base):
     __tablename__ = 'analysis_results'
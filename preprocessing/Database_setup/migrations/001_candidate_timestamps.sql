@@ -0,0 +1,11 @@
+-- Stamp candidates with creation and last-update times so cached job matches
+-- can be invalidated for changed candidates only
+ALTER TABLE candidates
+	ADD COLUMN created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+	ADD COLUMN updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP;
+
+CREATE INDEX idx_candidates_updated_at ON candidates (updated_at);
+
+CREATE INDEX idx_job_matches_job_candidate ON job_matches (job_id, candidate_id);
+
+CREATE INDEX idx_rankings_job_candidate ON rankings (job_id, candidate_id);
@@ -0,0 +1,5 @@
+-- Serve the candidate prefilter: must-have skills look up candidates by
+-- skill name, and the experience bound is a range scan
+CREATE INDEX idx_skills_name_candidate ON skills (skill_name, candidate_id);
+
+CREATE INDEX idx_candidates_experience ON candidates (total_experience);
@@ -0,0 +1,32 @@
+-- Indexes for the remaining access paths of ingest and ranking, and a
+-- normalized dictionary of canonical skills with their spellings
+
+-- A job's matches best first (SELECT_MATCHES, COUNT_MATCHES)
+CREATE INDEX idx_job_matches_job_score ON job_matches (job_id, match_score);
+
+-- A candidate's skills and work history (store refreshes, re-ingest deletes)
+CREATE INDEX idx_skills_candidate ON skills (candidate_id);
+
+CREATE INDEX idx_work_experience_candidate ON work_experience (candidate_id);
+
+CREATE TABLE skill_dictionary (
+	dictionary_id INTEGER NOT NULL AUTO_INCREMENT,
+	name VARCHAR(255) NOT NULL,
+	category VARCHAR(100),
+	PRIMARY KEY (dictionary_id),
+	UNIQUE (name)
+);
+
+CREATE TABLE skill_aliases (
+	alias VARCHAR(255) NOT NULL,
+	dictionary_id INTEGER NOT NULL,
+	PRIMARY KEY (alias),
+	INDEX idx_skill_aliases_dictionary (dictionary_id),
+	FOREIGN KEY(dictionary_id) REFERENCES skill_dictionary (dictionary_id)
+);
+
+ALTER TABLE skills
+	ADD COLUMN dictionary_id INTEGER,
+	ADD CONSTRAINT fk_skills_dictionary FOREIGN KEY (dictionary_id) REFERENCES skill_dictionary (dictionary_id);
+
+CREATE INDEX idx_skills_dictionary_candidate ON skills (dictionary_id, candidate_id);
@@ -0,0 +1,34 @@
+-- One cached match and one ranking per (job, candidate), so concurrent saves
+-- of the same job upsert instead of inserting duplicates (MatchStore.save)
+
+-- Keep the newest duplicate; history moves to it before the others go
+UPDATE match_history h
+	JOIN job_matches m ON h.match_id = m.match_id
+	JOIN (
+		SELECT job_id, candidate_id, MAX(match_id) AS keep_id FROM job_matches
+		GROUP BY job_id, candidate_id HAVING COUNT(*) > 1
+	) d ON d.job_id = m.job_id AND d.candidate_id = m.candidate_id
+SET h.match_id = d.keep_id;
+
+DELETE m FROM job_matches m
+	JOIN (
+		SELECT job_id, candidate_id, MAX(match_id) AS keep_id FROM job_matches
+		GROUP BY job_id, candidate_id HAVING COUNT(*) > 1
+	) d ON d.job_id = m.job_id AND d.candidate_id = m.candidate_id
+WHERE m.match_id < d.keep_id;
+
+DELETE r FROM rankings r
+	JOIN (
+		SELECT job_id, candidate_id, MAX(ranking_id) AS keep_id FROM rankings
+		GROUP BY job_id, candidate_id HAVING COUNT(*) > 1
+	) d ON d.job_id = r.job_id AND d.candidate_id = r.candidate_id
+WHERE r.ranking_id < d.keep_id;
+
+-- Swapped in one statement so the job_id foreign keys always have an index
+ALTER TABLE job_matches
+	DROP INDEX idx_job_matches_job_candidate,
+	ADD UNIQUE INDEX idx_job_matches_job_candidate (job_id, candidate_id);
+
+ALTER TABLE rankings
+	DROP INDEX idx_rankings_job_candidate,
+	ADD UNIQUE INDEX idx_rankings_job_candidate (job_id, candidate_id);
@@ -0,0 +1,3 @@
+-- Skill names are written lowercased and trimmed, so the prefilter compares
+-- skills.skill_name directly and can use idx_skills_name_candidate
+UPDATE skills SET skill_name = LOWER(TRIM(skill_name));
@@ -24,8 +24,28 @@ CREATE TABLE  candidates (
 	university VARCHAR(255), 
 	location VARCHAR(255), 
 	resume_text TEXT, 
+	created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+	updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
 	PRIMARY KEY (candidate_id), 
-	UNIQUE (email)
+	UNIQUE (email),
+	INDEX idx_candidates_updated_at (updated_at),
+	INDEX idx_candidates_experience (total_experience)
+);
+
+CREATE TABLE skill_dictionary (
+	dictionary_id INTEGER NOT NULL AUTO_INCREMENT,
+	name VARCHAR(255) NOT NULL,
+	category VARCHAR(100),
+	PRIMARY KEY (dictionary_id),
+	UNIQUE (name)
+);
+
+CREATE TABLE skill_aliases (
+	alias VARCHAR(255) NOT NULL,
+	dictionary_id INTEGER NOT NULL,
+	PRIMARY KEY (alias),
+	INDEX idx_skill_aliases_dictionary (dictionary_id),
+	FOREIGN KEY(dictionary_id) REFERENCES skill_dictionary (dictionary_id)
 );
 
 CREATE TABLE  skills (
@@ -33,8 +53,13 @@ CREATE TABLE  skills (
 	candidate_id INTEGER, 
 	skill_name VARCHAR(255), 
 	proficiency_level VARCHAR(12), 
+	dictionary_id INTEGER,
 	PRIMARY KEY (skill_id), 
-	FOREIGN KEY(candidate_id) REFERENCES candidates (candidate_id)
+	INDEX idx_skills_name_candidate (skill_name, candidate_id),
+	INDEX idx_skills_dictionary_candidate (dictionary_id, candidate_id),
+	INDEX idx_skills_candidate (candidate_id),
+	FOREIGN KEY(candidate_id) REFERENCES candidates (candidate_id),
+	FOREIGN KEY(dictionary_id) REFERENCES skill_dictionary (dictionary_id)
 );
 
 CREATE TABLE  projects (
@@ -57,6 +82,7 @@ CREATE TABLE  work_experience (
 	end_date DATE, 
 	description TEXT, 
 	PRIMARY KEY (work_id), 
+	INDEX idx_work_experience_candidate (candidate_id),
 	FOREIGN KEY(candidate_id) REFERENCES candidates (candidate_id)
 );
 
@@ -87,6 +113,7 @@ CREATE TABLE rankings (
 	match_date DATETIME DEFAULT CURRENT_TIMESTAMP,
 	match_status VARCHAR(20) DEFAULT 'Pending',
 	PRIMARY KEY (ranking_id),
+	UNIQUE INDEX idx_rankings_job_candidate (job_id, candidate_id),
 	FOREIGN KEY(candidate_id) REFERENCES candidates (candidate_id),
 	FOREIGN KEY(job_id) REFERENCES job_descriptions (job_id)
 );
@@ -107,6 +134,8 @@ CREATE TABLE job_matches (
 	status VARCHAR(20) DEFAULT 'New',
 	notes TEXT,
 	PRIMARY KEY (match_id),
+	UNIQUE INDEX idx_job_matches_job_candidate (job_id, candidate_id),
+	INDEX idx_job_matches_job_score (job_id, match_score),
 	FOREIGN KEY(job_id) REFERENCES job_descriptions (job_id),
 	FOREIGN KEY(candidate_id) REFERENCES candidates (candidate_id)
 );
@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import create_engine
 from Database_setup.db_design import Base, ResumeContent, Document, User
-import PyPDF2
+from preprocessing.utils.pdf_utils import extract_pdf_text
 import os
 from datetime import datetime
 
@@ -14,12 +14,7 @@ class DataIngestion:
     def extract_pdf_content(self, file_path):
         """Extract text content from PDF files"""
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-                return text
+            return extract_pdf_text(file_path, separator="")
         except Exception as e:
             print(f"Error extracting PDF content: {str(e)}")
             return None
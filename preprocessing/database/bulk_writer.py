@@ -0,0 +1,281 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import (
+    Column, Float, Integer, MetaData, String, Table, Text,
+    bindparam, insert, text
+)
+from sqlalchemy.exc import SQLAlchemyError
+
+from .skill_dictionary import dictionary_name
+from ..models.skill_taxonomy import normalize_skill
+from ..utils.metrics import metrics
+from ..utils.text_utils import setup_logger
+
+# Column subset of the candidates table written by the ingest path; declared
+# locally so the writer needs no reflection round-trip
+candidates_table = Table(
+    'candidates', MetaData(),
+    Column('candidate_id', Integer, primary_key=True),
+    Column('name', String(255)),
+    Column('email', String(255)),
+    Column('phone', String(20)),
+    Column('total_experience', Float),
+    Column('highest_qualification', String(255)),
+    Column('university', String(255)),
+    Column('location', String(255)),
+    Column('resume_text', Text)
+)
+
+# Names are stored normalized (normalize_skill) so the prefilter can compare them
+# directly; the canonical name is resolved in Python (dictionary_name), its ID
+# through the dictionary
+INSERT_SKILL = """
+    INSERT INTO skills
+    (candidate_id, skill_name, proficiency_level, dictionary_id)
+    VALUES (:candidate_id, :skill_name, :proficiency,
+            (SELECT dictionary_id FROM skill_dictionary WHERE name = :dictionary_name))
+"""
+
+INSERT_WORK = """
+    INSERT INTO work_experience
+    (candidate_id, company_name, job_title, start_date, end_date, description)
+    VALUES (:candidate_id, :company, :title, :start_date, :end_date, :description)
+"""
+
+INSERT_ANALYSIS = """
+    INSERT INTO analysis_results (candidate_id, analysis_date, insights)
+    VALUES (:candidate_id, CURRENT_TIMESTAMP, :insights)
+"""
+
+UPDATE_CANDIDATE = """
+    UPDATE candidates SET
+        name = :name, email = :email, phone = :phone,
+        total_experience = :total_experience,
+        highest_qualification = :highest_qualification,
+        university = :university, location = :location,
+        resume_text = :resume_text,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE candidate_id = :candidate_id
+"""
+
+DELETE_SKILLS = "DELETE FROM skills WHERE candidate_id = :candidate_id"
+
+DELETE_WORK = "DELETE FROM work_experience WHERE candidate_id = :candidate_id"
+
+SELECT_EMAILS = text(
+    "SELECT candidate_id, email FROM candidates WHERE email IN :emails"
+).bindparams(bindparam('emails', expanding=True))
+
+
+def _candidate_row(candidate: Dict) -> Dict:
+    """Map ResumeProcessor's candidate fields to candidates table columns"""
+    return {
+        'name': candidate.get('name'),
+        'email': candidate.get('email'),
+        'phone': candidate.get('phone'),
+        'total_experience': candidate.get('experience'),
+        'highest_qualification': candidate.get('education'),
+        'university': candidate.get('institution'),
+        'location': candidate.get('location'),
+        'resume_text': candidate.get('resume_text')
+    }
+
+
+class BulkResumeWriter:
+    """
+    Accumulate parsed resumes and persist them in one transaction per batch.
+
+    Parsed resumes are the dicts produced by ResumeProcessor.parse_resume_file.
+    A flush looks up existing emails with one query, inserts the new
+    candidates (multi-row with RETURNING where the dialect supports it), then
+    inserts all skills and all work history rows of the batch with one
+    executemany each. If the batch transaction fails, the batch is retried
+    resume by resume so only the failing resumes are lost.
+
+    A parsed resume carrying a 'candidate_id' (a re-ingested, changed file)
+    replaces that candidate: the row is updated and its skills and work
+    history are rewritten. An optional 'analysis' string is stored as an
+    analysis_results row for the candidate.
+    """
+
+    def __init__(self, engine, batch_size: int = 200, logger=None,
+                 on_flush: Optional[Callable[[Dict[str, int], Dict[str, str]], None]] = None):
+        """
+        Args:
+            engine: SQLAlchemy engine
+            batch_size: Number of resumes written per transaction
+            logger: Logger to report through
+            on_flush: Called with (stored, errors) after every flush
+        """
+        self.engine = engine
+        self.batch_size = batch_size
+        self.logger = logger or setup_logger(__name__)
+        self.on_flush = on_flush
+        self.pending: List[Dict] = []
+        self.stored: Dict[str, int] = {}
+        self.errors: Dict[str, str] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+    def add(self, parsed: Dict) -> None:
+        """Queue a parsed resume, flushing when the batch is full"""
+        self.pending.append(parsed)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> Tuple[Dict[str, int], Dict[str, str]]:
+        """
+        Write all pending resumes.
+
+        Returns:
+            Tuple of (stored, errors) for this flush: file path -> candidate ID
+            and file path -> error message
+        """
+        batch, self.pending = self.pending, []
+        if not batch:
+            return {}, {}
+
+        try:
+            with metrics.timer('db_write'), self.engine.begin() as conn:
+                stored = self._write_batch(conn, batch)
+            errors = {}
+        except SQLAlchemyError as e:
+            self.logger.warning(f"Batch insert of {len(batch)} resumes failed, retrying row by row: {str(e)}")
+            with metrics.timer('db_write_retry'):
+                stored, errors = self._write_individually(batch)
+        metrics.inc('resume_rows_written_total', len(stored))
+
+        self.stored.update(stored)
+        self.errors.update(errors)
+        if self.on_flush:
+            self.on_flush(stored, errors)
+        return stored, errors
+
+    def _write_individually(self, batch: List[Dict]) -> Tuple[Dict[str, int], Dict[str, str]]:
+        """Fallback: one transaction per resume so one bad row cannot sink the batch"""
+        stored = {}
+        errors = {}
+        for parsed in batch:
+            try:
+                with self.engine.begin() as conn:
+                    stored.update(self._write_batch(conn, [parsed]))
+            except SQLAlchemyError as e:
+                self.logger.error(f"Database error processing {parsed['file_path']}: {str(e)}")
+                errors[parsed['file_path']] = str(e)
+        return stored, errors
+
+    def _existing_ids(self, conn, batch: List[Dict]) -> Dict[str, int]:
+        """Look up candidate IDs for every email in the batch with a single query"""
+        emails = list({p['candidate']['email'] for p in batch if p['candidate'].get('email')})
+        if not emails:
+            return {}
+        rows = conn.execute(SELECT_EMAILS, {'emails': emails}).fetchall()
+        return {row.email: row.candidate_id for row in rows}
+
+    def _insert_candidates(self, conn, rows: List[Dict]) -> List[int]:
+        """Insert candidate rows and return their IDs in input order"""
+        if not rows:
+            return []
+
+        dialect = conn.dialect
+        if getattr(dialect, 'insert_executemany_returning_sort_by_parameter_order', False):
+            stmt = insert(candidates_table).returning(
+                candidates_table.c.candidate_id, sort_by_parameter_order=True
+            )
+            return list(conn.execute(stmt, rows).scalars())
+
+        # Dialects without multi-row RETURNING (e.g. MySQL) need one insert per candidate for the ID
+        stmt = insert(candidates_table)
+        return [conn.execute(stmt, row).lastrowid for row in rows]
+
+    def _write_batch(self, conn, batch: List[Dict]) -> Dict[str, int]:
+        """Write a batch inside the caller's transaction; returns file path -> candidate ID"""
+        candidate_ids = {}
+
+        # Changed files replace the candidate they produced last time
+        replacements = [parsed for parsed in batch if parsed.get('candidate_id')]
+        if replacements:
+            update_rows = [
+                dict(_candidate_row(parsed['candidate']), candidate_id=parsed['candidate_id'])
+                for parsed in replacements
+            ]
+            id_rows = [{'candidate_id': parsed['candidate_id']} for parsed in replacements]
+            conn.execute(text(UPDATE_CANDIDATE), update_rows)
+            conn.execute(text(DELETE_SKILLS), id_rows)
+            conn.execute(text(DELETE_WORK), id_rows)
+            for parsed in replacements:
+                candidate_ids[id(parsed)] = parsed['candidate_id']
+
+        fresh = [parsed for parsed in batch if not parsed.get('candidate_id')]
+        existing = self._existing_ids(conn, fresh)
+
+        # Decide which resumes need a new candidate row; duplicates by email
+        # (in the DB or earlier in the batch) reuse the existing candidate
+        new_rows = []
+        new_owners = []
+        for parsed in fresh:
+            email = parsed['candidate'].get('email')
+            if email and email in existing:
+                continue
+            new_rows.append(_candidate_row(parsed['candidate']))
+            new_owners.append(parsed)
+            if email:
+                existing[email] = None  # Placeholder until the ID is known
+
+        new_ids = self._insert_candidates(conn, new_rows)
+
+        for parsed, candidate_id in zip(new_owners, new_ids):
+            candidate_ids[id(parsed)] = candidate_id
+            email = parsed['candidate'].get('email')
+            if email:
+                existing[email] = candidate_id
+
+        stored = {}
+        skill_rows = []
+        work_rows = []
+        analysis_rows = []
+        for parsed in batch:
+            candidate_id = candidate_ids.get(id(parsed))
+            if candidate_id is None:
+                # Existing candidate: keep it as is, like the single-file path
+                candidate_id = existing[parsed['candidate']['email']]
+                self.logger.info(f"Found existing candidate with email {parsed['candidate']['email']}, ID: {candidate_id}")
+                stored[parsed['file_path']] = candidate_id
+                continue
+
+            stored[parsed['file_path']] = candidate_id
+            skill_rows.extend(
+                {
+                    'candidate_id': candidate_id,
+                    'skill_name': normalize_skill(skill['name']),
+                    'proficiency': skill['proficiency'],
+                    'dictionary_name': dictionary_name(skill['name'])
+                }
+                for skill in parsed.get('skills', [])
+            )
+            work_rows.extend(
+                {
+                    'candidate_id': candidate_id,
+                    'company': work['company'],
+                    'title': work['title'],
+                    'start_date': work['start_date'],
+                    'end_date': work['end_date'],
+                    'description': work['description']
+                }
+                for work in parsed.get('work_history', [])
+            )
+            if parsed.get('analysis'):
+                analysis_rows.append({'candidate_id': candidate_id, 'insights': parsed['analysis']})
+
+        if skill_rows:
+            conn.execute(text(INSERT_SKILL), skill_rows)
+        if work_rows:
+            conn.execute(text(INSERT_WORK), work_rows)
+        if analysis_rows:
+            conn.execute(text(INSERT_ANALYSIS), analysis_rows)
+
+        return stored
@@ -0,0 +1,125 @@
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, text
+
+from ..models.patterns import EDUCATION_LEVELS
+from ..models.skill_taxonomy import SkillTaxonomy
+from .candidate_store import education_level
+from .skill_dictionary import dictionary_ids
+
+# Job requirements that can be enforced before scoring
+REQUIREMENTS = ('experience', 'education', 'location')
+
+# Share of the required years a candidate needs to be considered at all
+EXPERIENCE_TOLERANCE = float(os.environ.get('RESUME_EXPERIENCE_TOLERANCE', 0.8))
+
+# Job locations that accept candidates from anywhere
+ANYWHERE = ('remote', 'anywhere', '')
+
+SELECT_FILTERED = """
+    SELECT c.candidate_id
+    FROM candidates c
+    {where}
+    ORDER BY c.candidate_id
+"""
+
+# Served by the (dictionary_id, candidate_id) index of migration 003
+HAS_DICTIONARY_SKILL = """
+    c.candidate_id IN (SELECT s.candidate_id FROM skills s WHERE s.dictionary_id = :{param})
+"""
+
+# Skills outside the dictionary; names are stored normalized like the spellings,
+# so the (skill_name, candidate_id) index of migration 002 serves the lookup
+HAS_SKILL = """
+    c.candidate_id IN (SELECT s.candidate_id FROM skills s WHERE s.skill_name IN :{param})
+"""
+
+
+def build_prefilter(job, requirements: Iterable[str] = (), must_have: Optional[Iterable[str]] = None,
+                    taxonomy: Optional[SkillTaxonomy] = None,
+                    skill_ids: Optional[Dict[str, int]] = None) -> Tuple[object, Dict]:
+    """
+    Translate hard job requirements into one SQL query returning candidate IDs.
+
+    Candidates whose experience, qualification or location is unknown are
+    kept: a missing field is a parsing gap, not evidence of a mismatch.
+    ResumeProcessor writes NULL for those; a total_experience of 0 is also
+    treated as unknown, as rows stored before that defaulted to it.
+    Must-have skills with a skill_dictionary entry match on dictionary_id,
+    so every alias and capitalization counts; others match any spelling
+    the taxonomy knows for them, as normalized at write time.
+
+    Args:
+        job: job_descriptions row (required_experience, required_education, location)
+        requirements: Subset of REQUIREMENTS to enforce
+        must_have: Skills every candidate must have
+        taxonomy: Resolves skill aliases; a default SkillTaxonomy if None
+        skill_ids: Dictionary ID of each must-have skill that has one (dictionary_ids())
+
+    Returns:
+        Tuple of (statement, bind parameters)
+    """
+    requirements = set(requirements)
+    unknown = requirements.difference(REQUIREMENTS)
+    if unknown:
+        raise ValueError(f"Unknown requirements: {', '.join(sorted(unknown))}")
+
+    conditions, params, bindparams = [], {}, []
+
+    if 'experience' in requirements and job.required_experience:
+        conditions.append("(c.total_experience IS NULL OR c.total_experience = 0 OR c.total_experience >= :min_experience)")
+        params['min_experience'] = float(job.required_experience) * EXPERIENCE_TOLERANCE
+
+    min_level = education_level(job.required_education) if 'education' in requirements else 0
+    below = [keyword for keyword, level in EDUCATION_LEVELS.items() if level < min_level]
+    if below:
+        # Only qualifications recognized as below the required level are dropped;
+        # ones naming no EDUCATION_LEVELS keyword (e.g. 'B.Tech') count as unknown
+        clauses = []
+        for i, (keyword, level) in enumerate(EDUCATION_LEVELS.items()):
+            clauses.append((level >= min_level, f"LOWER(c.highest_qualification) LIKE :education_{i}"))
+            params[f"education_{i}"] = f"%{keyword}%"
+        at_level = ' OR '.join(clause for enough, clause in clauses if enough)
+        under = ' OR '.join(clause for enough, clause in clauses if not enough)
+        conditions.append(f"(c.highest_qualification IS NULL OR {at_level} OR NOT ({under}))")
+
+    location = (job.location or '').strip().lower()
+    if 'location' in requirements and location not in ANYWHERE:
+        conditions.append(
+            "(c.location IS NULL OR c.location = '' OR LOWER(c.location) LIKE :location "
+            "OR LOWER(c.location) LIKE '%remote%')"
+        )
+        params['location'] = f"%{location}%"
+
+    if must_have:
+        taxonomy = taxonomy or SkillTaxonomy()
+        skill_ids = skill_ids or {}
+        for i, skill in enumerate(dict.fromkeys(must_have)):
+            param = f"skill_{i}"
+            if skill in skill_ids:
+                conditions.append(HAS_DICTIONARY_SKILL.format(param=param).strip())
+                params[param] = skill_ids[skill]
+            else:
+                conditions.append(HAS_SKILL.format(param=param).strip())
+                params[param] = taxonomy.spellings(skill)
+                bindparams.append(bindparam(param, expanding=True))
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    statement = text(SELECT_FILTERED.format(where=where))
+    if bindparams:
+        statement = statement.bindparams(*bindparams)
+    return statement, params
+
+
+def filter_candidates(session, job, requirements: Iterable[str] = (), must_have: Optional[Iterable[str]] = None,
+                      taxonomy: Optional[SkillTaxonomy] = None) -> List[int]:
+    """
+    IDs of the candidates meeting the job's hard requirements.
+
+    Only IDs are selected; no resume text or other wide columns leave the
+    database.
+    """
+    skill_ids = dictionary_ids(session, must_have, taxonomy) if must_have else None
+    statement, params = build_prefilter(job, requirements, must_have, taxonomy, skill_ids)
+    return [row.candidate_id for row in session.execute(statement, params)]
@@ -0,0 +1,320 @@
+import copy
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import bindparam, text
+
+from ..models.patterns import EDUCATION_LEVELS
+from ..models.skill_taxonomy import SkillTaxonomy
+from ..utils.nlp_utils import chunked
+from ..utils.text_utils import setup_logger
+
+# Maximum number of IDs bound into one IN (...) query
+ID_CHUNK_SIZE = 1000
+
+# Candidates fetched per query during the initial load
+LOAD_PAGE_SIZE = 10000
+
+SELECT_CANDIDATES = """
+    SELECT candidate_id, total_experience, highest_qualification, location
+    FROM candidates {where}
+    ORDER BY candidate_id
+"""
+
+SELECT_SKILLS = """
+    SELECT candidate_id, skill_name
+    FROM skills {where}
+    ORDER BY candidate_id
+"""
+
+
+def education_level(qualification: Optional[str]) -> int:
+    """Map a free-text qualification to its EDUCATION_LEVELS score, 0 if unknown"""
+    qualification = (qualification or '').lower()
+    for keyword, level in EDUCATION_LEVELS.items():
+        if keyword in qualification:
+            return level
+    return 0
+
+
+def _pair_skills(candidates: List, skills: List) -> Iterator[Tuple[object, List[str]]]:
+    """Yield (candidate row, skill names); both inputs must be sorted by candidate ID"""
+    skill_rows = iter(skills)
+    pending = next(skill_rows, None)
+    for candidate in candidates:
+        while pending is not None and pending.candidate_id < candidate.candidate_id:
+            pending = next(skill_rows, None)
+        candidate_skills = []
+        while pending is not None and pending.candidate_id == candidate.candidate_id:
+            if pending.skill_name:
+                candidate_skills.append(pending.skill_name)
+            pending = next(skill_rows, None)
+        yield candidate, candidate_skills
+
+
+class CandidateStore:
+    """
+    Compact, columnar in-memory view of the candidate pool for ranking.
+
+    Rows are kept sorted by candidate ID. Each candidate costs a few dozen
+    bytes: typed arrays for ID, experience, education level and interned
+    location, plus its skills as canonical SkillTaxonomy IDs in CSR form
+    (skill_indptr / skill_indices). Resume text is not held; the candidate
+    ID is the reference used to fetch it when needed.
+
+    refresh() loads the pool on first use and afterwards only reloads
+    candidates that are new or updated since the previous refresh, and
+    drops deleted ones. The transposed skill matrix doubles as an inverted
+    skill -> candidates index for must-have filters over the loaded pool;
+    filters against the database run in SQL (candidate_filter).
+    """
+
+    def __init__(self):
+        self.logger = setup_logger(__name__)
+        self.candidate_ids = np.empty(0, dtype=np.int64)
+        self.experience = np.empty(0, dtype=np.float32)
+        self.education_level = np.empty(0, dtype=np.int8)
+        self.location_id = np.empty(0, dtype=np.int32)
+        self.skill_indptr = np.zeros(1, dtype=np.int64)
+        self.skill_indices = np.empty(0, dtype=np.int32)
+
+        # Interned strings; skills use canonical taxonomy IDs so aliases collapse
+        self.taxonomy = SkillTaxonomy()
+        self.location_ids: Dict[str, int] = {}
+        self.locations: List[str] = []
+
+        # Database time of the last refresh
+        self.synced_at = None
+        # Inverted skill -> rows index, rebuilt lazily after the store changes
+        self._postings: Optional[sparse.csc_matrix] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.candidate_ids.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the per-candidate arrays"""
+        return sum(array.nbytes for array in (
+            self.candidate_ids, self.experience, self.education_level,
+            self.location_id, self.skill_indptr, self.skill_indices
+        ))
+
+    def refresh(self, session) -> int:
+        """
+        Bring the store in line with the candidates table.
+
+        Returns:
+            int: Number of candidates (re)loaded
+        """
+        with self._lock:
+            synced_at = session.execute(text("SELECT CURRENT_TIMESTAMP")).scalar()
+
+            if self.synced_at is None:
+                self._clear()
+                loaded = self._load_all(session)
+            else:
+                stored_ids = np.fromiter(
+                    (row.candidate_id for row in session.execute(text("SELECT candidate_id FROM candidates"))),
+                    dtype=np.int64
+                )
+                updated_ids = np.fromiter(
+                    (row.candidate_id for row in session.execute(
+                        text("SELECT candidate_id FROM candidates WHERE updated_at >= :synced_at"),
+                        {'synced_at': self.synced_at}
+                    )),
+                    dtype=np.int64
+                )
+                stale_ids = np.union1d(np.setdiff1d(self.candidate_ids, stored_ids), updated_ids)
+                if stale_ids.size:
+                    self._take(np.flatnonzero(~np.isin(self.candidate_ids, stale_ids)))
+
+                loaded = self._load_ids(session, np.setdiff1d(stored_ids, self.candidate_ids).tolist())
+
+            self.synced_at = synced_at
+            if loaded:
+                self.logger.info(f"Candidate store: loaded {loaded} candidates, {len(self)} total, "
+                                 f"{self.nbytes / len(self):.0f} bytes per candidate")
+            return loaded
+
+    def snapshot(self) -> 'CandidateStore':
+        """
+        Consistent read-only view of the store for scoring while others refresh.
+
+        refresh() replaces the arrays instead of modifying them in place, so
+        a shallow copy taken under the lock keeps one generation of them.
+        """
+        with self._lock:
+            return copy.copy(self)
+
+    def rows_of(self, candidate_ids: Iterable[int]) -> np.ndarray:
+        """Row positions of the given candidate IDs; unknown IDs are skipped"""
+        ids = np.asarray(list(candidate_ids), dtype=np.int64)
+        rows = np.searchsorted(self.candidate_ids, ids)
+        valid = rows < len(self)
+        rows, ids = rows[valid], ids[valid]
+        return rows[self.candidate_ids[rows] == ids]
+
+    def skills_of(self, row: int) -> List[str]:
+        """Skill names of the candidate at a row"""
+        start, end = self.skill_indptr[row], self.skill_indptr[row + 1]
+        return [self.taxonomy.names[i] for i in self.skill_indices[start:end]]
+
+    def location_of(self, row: int) -> Optional[str]:
+        """Location of the candidate at a row"""
+        location_id = self.location_id[row]
+        return self.locations[location_id] if location_id >= 0 else None
+
+    def skill_matrix(self) -> sparse.csr_matrix:
+        """Candidates x skills boolean matrix sharing the store's CSR arrays"""
+        return sparse.csr_matrix(
+            (np.ones(self.skill_indices.shape[0], dtype=bool), self.skill_indices, self.skill_indptr),
+            shape=(len(self), len(self.taxonomy))
+        )
+
+    def skill_ids_of(self, row: int) -> np.ndarray:
+        """Canonical skill IDs of the candidate at a row, sorted"""
+        return self.skill_indices[self.skill_indptr[row]:self.skill_indptr[row + 1]]
+
+    def rows_with_skill(self, skill_id: int) -> np.ndarray:
+        """Posting list: sorted rows of candidates that have a skill"""
+        if self._postings is None:
+            # Column-major copy of the skill matrix: one sorted row list per skill
+            self._postings = self.skill_matrix().tocsc()
+            self._postings.sort_indices()
+        if skill_id >= self._postings.shape[1]:
+            return np.empty(0, dtype=np.int64)
+        start, end = self._postings.indptr[skill_id], self._postings.indptr[skill_id + 1]
+        return self._postings.indices[start:end]
+
+    def rows_with_all_skills(self, skills: Iterable[str]) -> np.ndarray:
+        """
+        Rows of candidates having every given skill (aliases resolved).
+
+        Posting lists are intersected smallest first, each step costing
+        O(current result x log(next list)), so the work scales with the
+        number of matching candidates rather than the pool size.
+        """
+        skill_ids = [self.taxonomy.resolve(skill) for skill in skills]
+        if not skill_ids:
+            return np.arange(len(self))
+        if any(skill_id is None for skill_id in skill_ids):
+            return np.empty(0, dtype=np.int64)
+
+        postings = sorted((self.rows_with_skill(skill_id) for skill_id in set(skill_ids)), key=len)
+        rows = postings[0]
+        for posting in postings[1:]:
+            if not rows.shape[0]:
+                break
+            positions = np.searchsorted(posting, rows)
+            positions[positions == posting.shape[0]] = 0
+            rows = rows[posting[positions] == rows]
+        return rows.astype(np.int64)
+
+    def candidates_with_all_skills(self, skills: Iterable[str]) -> np.ndarray:
+        """Candidate IDs having every given skill"""
+        return self.candidate_ids[self.rows_with_all_skills(skills)]
+
+    def _load_all(self, session) -> int:
+        """Load every candidate, one keyset page of LOAD_PAGE_SIZE at a time"""
+        loaded = 0
+        after = None
+        while True:
+            if after is None:
+                candidates = session.execute(
+                    text(SELECT_CANDIDATES.format(where="") + " LIMIT :limit"), {'limit': LOAD_PAGE_SIZE}
+                ).fetchall()
+            else:
+                candidates = session.execute(
+                    text(SELECT_CANDIDATES.format(where="WHERE candidate_id > :after") + " LIMIT :limit"),
+                    {'after': after, 'limit': LOAD_PAGE_SIZE}
+                ).fetchall()
+            if not candidates:
+                return loaded
+
+            skills = session.execute(
+                text(SELECT_SKILLS.format(where="WHERE candidate_id BETWEEN :first AND :last")),
+                {'first': candidates[0].candidate_id, 'last': candidates[-1].candidate_id}
+            ).fetchall()
+            loaded += self._append(_pair_skills(candidates, skills))
+            after = candidates[-1].candidate_id
+
+    def _load_ids(self, session, candidate_ids: List[int]) -> int:
+        """Load specific candidates, ID_CHUNK_SIZE per query"""
+        loaded = 0
+        for chunk in chunked(candidate_ids, ID_CHUNK_SIZE):
+            params = {'ids': chunk}
+            candidates = session.execute(
+                text(SELECT_CANDIDATES.format(where="WHERE candidate_id IN :ids"))
+                .bindparams(bindparam('ids', expanding=True)), params
+            ).fetchall()
+            skills = session.execute(
+                text(SELECT_SKILLS.format(where="WHERE candidate_id IN :ids"))
+                .bindparams(bindparam('ids', expanding=True)), params
+            ).fetchall()
+            loaded += self._append(_pair_skills(candidates, skills))
+        return loaded
+
+    def _intern_location(self, location: Optional[str]) -> int:
+        location = (location or '').strip()
+        if not location:
+            return -1
+        location_id = self.location_ids.get(location)
+        if location_id is None:
+            location_id = self.location_ids[location] = len(self.locations)
+            self.locations.append(location)
+        return location_id
+
+    def _append(self, rows: Iterable[Tuple[object, List[str]]]) -> int:
+        """Add fetched candidates, keeping rows sorted by candidate ID"""
+        ids, experience, education, locations, lengths, indices = [], [], [], [], [], []
+        for candidate, skills in rows:
+            ids.append(candidate.candidate_id)
+            experience.append(candidate.total_experience or 0.0)
+            education.append(education_level(candidate.highest_qualification))
+            locations.append(self._intern_location(candidate.location))
+            skill_ids = {self.taxonomy.resolve(skill, add=True) for skill in skills}
+            skill_ids.discard(None)
+            lengths.append(len(skill_ids))
+            indices.extend(sorted(skill_ids))
+
+        if not ids:
+            return 0
+
+        count = len(self)
+        self.candidate_ids = np.concatenate([self.candidate_ids, np.asarray(ids, dtype=np.int64)])
+        self.experience = np.concatenate([self.experience, np.asarray(experience, dtype=np.float32)])
+        self.education_level = np.concatenate([self.education_level, np.asarray(education, dtype=np.int8)])
+        self.location_id = np.concatenate([self.location_id, np.asarray(locations, dtype=np.int32)])
+        self.skill_indptr = np.concatenate([
+            self.skill_indptr, self.skill_indptr[-1] + np.cumsum(lengths, dtype=np.int64)
+        ])
+        self.skill_indices = np.concatenate([self.skill_indices, np.asarray(indices, dtype=np.int32)])
+
+        self._postings = None
+        # A full load arrives sorted; increments may interleave with existing IDs
+        if count and self.candidate_ids[count - 1] > self.candidate_ids[count]:
+            self._take(np.argsort(self.candidate_ids, kind='stable'))
+        return len(ids)
+
+    def _take(self, rows: np.ndarray) -> None:
+        """Keep only the given rows, in the given order"""
+        starts = self.skill_indptr[:-1][rows]
+        lengths = self.skill_indptr[1:][rows] - starts
+        indptr = np.zeros(rows.shape[0] + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        # Position of every kept skill entry in the old skill_indices
+        positions = np.repeat(starts - indptr[:-1], lengths) + np.arange(indptr[-1])
+
+        self.skill_indices = self.skill_indices[positions]
+        self.skill_indptr = indptr
+        self.candidate_ids = self.candidate_ids[rows]
+        self.experience = self.experience[rows]
+        self.education_level = self.education_level[rows]
+        self.location_id = self.location_id[rows]
+        self._postings = None
+
+    def _clear(self) -> None:
+        self._take(np.empty(0, dtype=np.int64))
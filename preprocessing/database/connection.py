@@ -0,0 +1,99 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import sessionmaker
+
+# Pool defaults; each can be overridden per call or through the environment
+DEFAULT_POOL_SIZE = int(os.environ.get('RESUME_DB_POOL_SIZE', 5))
+DEFAULT_MAX_OVERFLOW = int(os.environ.get('RESUME_DB_MAX_OVERFLOW', 10))
+DEFAULT_POOL_RECYCLE = int(os.environ.get('RESUME_DB_POOL_RECYCLE', 1800))
+DEFAULT_POOL_PRE_PING = os.environ.get('RESUME_DB_POOL_PRE_PING', '1') != '0'
+
+_lock = threading.Lock()
+_engines: Dict[str, Engine] = {}
+_session_factories: Dict[str, sessionmaker] = {}
+
+
+def get_engine(db_url: str, pool_size: Optional[int] = None, max_overflow: Optional[int] = None,
+               pool_recycle: Optional[int] = None, pool_pre_ping: Optional[bool] = None) -> Engine:
+    """
+    Return the process-wide pooled engine for a database URL.
+
+    The engine is created on first use and reused afterwards, so repeated
+    calls (e.g. on every Streamlit rerun) share one connection pool. Pool
+    settings only apply when the engine is first created.
+
+    Args:
+        db_url: SQLAlchemy database URL
+        pool_size: Number of connections kept open
+        max_overflow: Extra connections allowed above pool_size
+        pool_recycle: Seconds after which a connection is replaced, so
+            MySQL's wait_timeout never hands us a dead connection
+        pool_pre_ping: Test connections before handing them out
+
+    Returns:
+        Engine: The shared engine
+    """
+    engine = _engines.get(db_url)
+    if engine is not None:
+        return engine
+
+    with _lock:
+        engine = _engines.get(db_url)
+        if engine is not None:
+            return engine
+
+        options = {
+            'pool_pre_ping': DEFAULT_POOL_PRE_PING if pool_pre_ping is None else pool_pre_ping,
+            'pool_recycle': DEFAULT_POOL_RECYCLE if pool_recycle is None else pool_recycle
+        }
+        # SQLite picks its own pool class; size limits only apply to server databases
+        if make_url(db_url).get_backend_name() != 'sqlite':
+            options['pool_size'] = DEFAULT_POOL_SIZE if pool_size is None else pool_size
+            options['max_overflow'] = DEFAULT_MAX_OVERFLOW if max_overflow is None else max_overflow
+
+        engine = create_engine(db_url, **options)
+        _engines[db_url] = engine
+        return engine
+
+
+def get_session_factory(db_url: str, **engine_options) -> sessionmaker:
+    """Return the shared sessionmaker bound to get_engine(db_url)"""
+    factory = _session_factories.get(db_url)
+    if factory is None:
+        engine = get_engine(db_url, **engine_options)
+        with _lock:
+            factory = _session_factories.setdefault(db_url, sessionmaker(bind=engine))
+    return factory
+
+
+@contextmanager
+def session_scope(db_url: str):
+    """Provide a session that commits on success and rolls back on error"""
+    session = get_session_factory(db_url)()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def dispose_engines(close: bool = True) -> None:
+    """
+    Dispose every cached engine and forget it.
+
+    Call with close=False in a freshly forked child process so it neither
+    reuses nor closes the parent's pooled connections.
+    """
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose(close=close)
+        _engines.clear()
+        _session_factories.clear()
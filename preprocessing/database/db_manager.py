@@ -1,16 +1,28 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from .connection import get_engine, get_session_factory
 from .schema import (
     Base, Candidate, Skill, Project, WorkExperience,
     Certification, AnalysisResult
 )
+from .skill_dictionary import dictionary_ids
+from ..models.skill_taxonomy import normalize_skill
 from ..utils.text_utils import setup_logger
 import datetime
+import json
+
+
+def _to_date(value):
+    """Date columns accept dates; parse ISO strings and drop anything else"""
+    if value is None or isinstance(value, datetime.date):
+        return value
+    try:
+        return datetime.date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
 
 class DatabaseManager:
     def __init__(self, db_url: str):
-        self.engine = create_engine(db_url)
-        self.Session = sessionmaker(bind=self.engine)
+        self.engine = get_engine(db_url)
+        self.Session = get_session_factory(db_url)
         self.logger = setup_logger(__name__)
         
     def create_tables(self):
@@ -45,19 +57,22 @@ class DatabaseManager:
             session.add(candidate)
             session.flush()  # Get the candidate ID
             
-            # Insert skills
-            for skill_data in extracted_data.get('skills', []):
+            # Insert skills, linked to their dictionary entry
+            skills = extracted_data.get('skills', [])
+            skill_ids = dictionary_ids(session, [skill_data.get('name') for skill_data in skills])
+            for skill_data in skills:
                 skill = Skill(
-                    candidate_id=candidate.id,
-                    skill_name=skill_data.get('name'),
-                    proficiency_level=skill_data.get('proficiency')
+                    candidate_id=candidate.candidate_id,
+                    skill_name=normalize_skill(skill_data.get('name')),
+                    proficiency_level=skill_data.get('proficiency'),
+                    dictionary_id=skill_ids.get(skill_data.get('name'))
                 )
                 session.add(skill)
             
             # Insert projects
             for project_data in extracted_data.get('projects', []):
                 project = Project(
-                    candidate_id=candidate.id,
+                    candidate_id=candidate.candidate_id,
                     project_title=project_data.get('title'),
                     project_description=project_data.get('description'),
                     technologies_used=project_data.get('technologies'),
@@ -68,11 +83,11 @@ class DatabaseManager:
             # Insert work experience
             for exp_data in extracted_data.get('work_experience', []):
                 experience = WorkExperience(
-                    candidate_id=candidate.id,
+                    candidate_id=candidate.candidate_id,
                     company_name=exp_data.get('company'),
                     job_title=exp_data.get('title'),
-                    start_date=exp_data.get('start_date'),
-                    end_date=exp_data.get('end_date'),
+                    start_date=_to_date(exp_data.get('start_date')),
+                    end_date=_to_date(exp_data.get('end_date')),
                     description=exp_data.get('description')
                 )
                 session.add(experience)
@@ -80,24 +95,24 @@ class DatabaseManager:
             # Insert certifications
             for cert_data in extracted_data.get('certifications', []):
                 certification = Certification(
-                    candidate_id=candidate.id,
+                    candidate_id=candidate.candidate_id,
                     certification_name=cert_data.get('name'),
                     issuing_organization=cert_data.get('organization'),
-                    issue_date=cert_data.get('issue_date'),
-                    expiration_date=cert_data.get('expiration_date'),
+                    issue_date=_to_date(cert_data.get('issue_date')),
+                    expiration_date=_to_date(cert_data.get('expiration_date')),
                     credential_url=cert_data.get('url')
                 )
                 session.add(certification)
             
             # Insert analysis results
             analysis = AnalysisResult(
-                candidate_id=candidate.id,
-                insights=extracted_data.get('analysis_insights', {})
+                candidate_id=candidate.candidate_id,
+                insights=json.dumps(extracted_data.get('analysis_insights', {}), default=str)
             )
             session.add(analysis)
             
             session.commit()
-            return candidate.id
+            return candidate.candidate_id
             
         except Exception as e:
             session.rollback()
@@ -118,7 +133,7 @@ class DatabaseManager:
         """
         session = self.Session()
         try:
-            candidate = session.query(Candidate).filter_by(id=candidate_id).first()
+            candidate = session.query(Candidate).filter_by(candidate_id=candidate_id).first()
             if not candidate:
                 return None
                 
@@ -156,7 +171,7 @@ class DatabaseManager:
                         'end_date': w.end_date,
                         'description': w.description
                     }
-                    for w in candidate.work_experience
+                    for w in candidate.experiences
                 ],
                 'certifications': [
                     {
@@ -171,7 +186,7 @@ class DatabaseManager:
                 'analysis_results': [
                     {
                         'date': a.analysis_date,
-                        'insights': a.insights
+                        'insights': json.loads(a.insights) if a.insights else {}
                     }
                     for a in candidate.analysis_results
                 ]
@@ -0,0 +1,200 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from ..utils.text_utils import setup_logger
+
+DEFAULT_MANIFEST_PATH = os.path.join('src', 'components', 'datafiles', 'ingest_manifest.db')
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(file_path: str) -> str:
+    """Hash a file's content without reading it into memory at once"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class IngestManifest:
+    """
+    Local record of which input files have already been ingested.
+
+    Each file is stored with its size, mtime and SHA-256 content hash plus the
+    ID of the DB record it produced. A scan decides per file, before any
+    parsing, whether it is new, changed or unchanged: matching size and mtime
+    skip the file without reading it, otherwise the content hash decides.
+    Files whose content was already ingested under another path are skipped
+    too, and files that disappeared since the last run are reported.
+    """
+
+    def __init__(self, path: str = DEFAULT_MANIFEST_PATH):
+        self.path = path
+        self.logger = setup_logger(__name__)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS ingested_files (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    record_id INTEGER,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ingested_files_sha256 ON ingested_files (sha256)"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Close the manifest database"""
+        self._conn.close()
+
+    def get(self, path: str) -> Optional[dict]:
+        """Return the manifest row for a path, if any"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM ingested_files WHERE path = ?", (os.path.abspath(path),)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def scan(self, file_paths: Iterable[str], root: Optional[str] = None) -> Dict[str, List[dict]]:
+        """
+        Classify files against the manifest without parsing them.
+
+        Args:
+            file_paths: Files currently present
+            root: If given, manifest entries under root that are not in
+                file_paths are reported as deleted
+
+        Returns:
+            dict with 'new', 'changed', 'unchanged', 'duplicate' and 'deleted'
+            lists. Entries are dicts with path, size, mtime_ns, sha256 and the
+            record_id of the previous ingest (for changed/duplicate files).
+        """
+        result = {'new': [], 'changed': [], 'unchanged': [], 'duplicate': [], 'deleted': []}
+        seen = set()
+
+        for file_path in file_paths:
+            path = os.path.abspath(file_path)
+            seen.add(path)
+            stat = os.stat(path)
+            entry = {'path': path, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                     'sha256': None, 'record_id': None}
+            previous = self.get(path)
+
+            # Fast path: same size and mtime means the file was not touched
+            if previous and previous['size'] == entry['size'] and previous['mtime_ns'] == entry['mtime_ns']:
+                entry['sha256'] = previous['sha256']
+                entry['record_id'] = previous['record_id']
+                result['unchanged'].append(entry)
+                continue
+
+            entry['sha256'] = file_sha256(path)
+            if previous and previous['sha256'] == entry['sha256']:
+                # Touched but identical; remember the new stat so the fast path hits next time
+                entry['record_id'] = previous['record_id']
+                self.record(entry, previous['record_id'])
+                result['unchanged'].append(entry)
+                continue
+
+            same_content = self._find_by_hash(entry['sha256'], exclude_path=path)
+            if same_content:
+                entry['record_id'] = same_content['record_id']
+                self.record(entry, same_content['record_id'])
+                result['duplicate'].append(entry)
+            elif previous:
+                entry['record_id'] = previous['record_id']
+                result['changed'].append(entry)
+            else:
+                result['new'].append(entry)
+
+        if root is not None:
+            prefix = os.path.join(os.path.abspath(root), '')
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT * FROM ingested_files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+                ).fetchall()
+            result['deleted'] = [dict(row) for row in rows if row['path'] not in seen]
+
+        return result
+
+    def select(self, file_paths: Iterable[str], root: Optional[str] = None) -> Dict[str, dict]:
+        """
+        Scan files and return only those that need processing.
+
+        Deleted files are logged and dropped from the manifest.
+
+        Returns:
+            dict mapping each new or changed file path (as given) to its
+            manifest entry; pass the entry to record() once it is stored
+        """
+        file_paths = list(file_paths)
+        scan = self.scan(file_paths, root=root)
+
+        for entry in scan['deleted']:
+            self.logger.info(f"File removed since last ingest: {entry['path']} (record {entry['record_id']})")
+        self.forget(entry['path'] for entry in scan['deleted'])
+
+        self.logger.info(
+            f"Manifest scan: {len(scan['new'])} new, {len(scan['changed'])} changed, "
+            f"{len(scan['unchanged'])} unchanged, {len(scan['duplicate'])} duplicate, "
+            f"{len(scan['deleted'])} deleted"
+        )
+
+        pending = {entry['path']: entry for entry in scan['new'] + scan['changed']}
+        return {
+            file_path: pending[os.path.abspath(file_path)]
+            for file_path in file_paths
+            if os.path.abspath(file_path) in pending
+        }
+
+    def record(self, entry: dict, record_id: Optional[int]) -> None:
+        """Mark a scanned file as ingested into record_id"""
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT INTO ingested_files (path, size, mtime_ns, sha256, record_id, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    size = excluded.size,
+                    mtime_ns = excluded.mtime_ns,
+                    sha256 = excluded.sha256,
+                    record_id = excluded.record_id,
+                    updated_at = excluded.updated_at
+            """, (entry['path'], entry['size'], entry['mtime_ns'], entry['sha256'],
+                  record_id, datetime.now().isoformat()))
+
+    def forget(self, paths: Iterable[str]) -> None:
+        """Remove files from the manifest"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM ingested_files WHERE path = ?",
+                [(os.path.abspath(path),) for path in paths]
+            )
+
+    def _find_by_hash(self, sha256: str, exclude_path: str) -> Optional[dict]:
+        """Return another file already ingested with the same content"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM ingested_files WHERE sha256 = ? AND path != ? LIMIT 1",
+                (sha256, exclude_path)
+            ).fetchone()
+        return dict(row) if row else None
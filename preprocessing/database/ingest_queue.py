@@ -0,0 +1,204 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from ..utils.text_utils import setup_logger
+from .ingest_manifest import file_sha256
+
+DEFAULT_QUEUE_PATH = os.path.join('src', 'components', 'datafiles', 'ingest_queue.db')
+DEFAULT_MAX_ATTEMPTS = int(os.environ.get('RESUME_INGEST_MAX_ATTEMPTS', 3))
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class IngestQueue:
+    """
+    Durable queue of files waiting to be ingested.
+
+    Jobs live in a local SQLite database, so they survive restarts of both
+    the uploader and the workers. Any number of processes can share the
+    queue: claim() hands each job to exactly one worker. A job moves from
+    queued to running to done (with the stored candidate ID) or failed;
+    failures are retried until max_attempts is reached.
+    """
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.logger = setup_logger(__name__)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # Autocommit mode; claim() manages its own write transaction
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        # WAL lets the uploader poll status while workers write
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS ingest_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                path TEXT NOT NULL,
+                sha256 TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                candidate_id INTEGER,
+                error TEXT,
+                worker TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ingest_jobs_status ON ingest_jobs (status, id)"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Close the queue database"""
+        self._conn.close()
+
+    def enqueue(self, file_path: str, sha256: Optional[str] = None) -> int:
+        """
+        Add a file to the queue.
+
+        A file whose content is already queued or running is not queued
+        twice; the existing job is returned instead.
+
+        Returns:
+            int: Job ID
+        """
+        path = os.path.abspath(file_path)
+        sha256 = sha256 or file_sha256(path)
+        now = datetime.now().isoformat()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM ingest_jobs WHERE sha256 = ? AND status IN (?, ?) LIMIT 1",
+                (sha256, QUEUED, RUNNING)
+            ).fetchone()
+            if row:
+                return row['id']
+            cursor = self._conn.execute(
+                "INSERT INTO ingest_jobs (path, sha256, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (path, sha256, QUEUED, now, now)
+            )
+        self.logger.info(f"Queued {path} as job {cursor.lastrowid}")
+        return cursor.lastrowid
+
+    def claim(self, worker: str) -> Optional[dict]:
+        """Take the oldest queued job and mark it running; None if the queue is empty"""
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock up front, so two workers
+            # can never select the same job
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT * FROM ingest_jobs WHERE status = ? ORDER BY id LIMIT 1", (QUEUED,)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE ingest_jobs SET status = ?, attempts = attempts + 1, worker = ?, updated_at = ? "
+                    "WHERE id = ?",
+                    (RUNNING, worker, datetime.now().isoformat(), row['id'])
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        job = dict(row)
+        job.update(status=RUNNING, attempts=job['attempts'] + 1, worker=worker)
+        return job
+
+    def complete(self, job_id: int, candidate_id: Optional[int]) -> None:
+        """Mark a job done with the candidate it produced"""
+        self._update(job_id, status=DONE, candidate_id=candidate_id, error=None)
+
+    def fail(self, job_id: int, error: str) -> None:
+        """Record a failed attempt; the job is queued again until max_attempts"""
+        job = self.get(job_id)
+        retry = job is not None and job['attempts'] < self.max_attempts
+        self._update(job_id, status=QUEUED if retry else FAILED, error=error)
+        if not retry:
+            self.logger.error(f"Job {job_id} failed: {error}")
+
+    def get(self, job_id: int) -> Optional[dict]:
+        """Return a job by ID"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM ingest_jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def jobs(self, job_ids: List[int]) -> Dict[int, dict]:
+        """Return several jobs by ID, for status polling"""
+        if not job_ids:
+            return {}
+        placeholders = ', '.join('?' * len(job_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM ingest_jobs WHERE id IN ({placeholders})", list(job_ids)
+            ).fetchall()
+        return {row['id']: dict(row) for row in rows}
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) AS n FROM ingest_jobs GROUP BY status"
+            ).fetchall()
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        counts.update({row['status']: row['n'] for row in rows})
+        return counts
+
+    def requeue_stale(self, timeout: float, worker: Optional[str] = None) -> int:
+        """
+        Put running jobs back in the queue if they have not finished within
+        timeout seconds, e.g. because their worker died. Jobs that used up
+        their attempts are failed instead, so a file that crashes workers
+        cannot loop forever.
+
+        Args:
+            timeout: Seconds a job may run
+            worker: Only requeue jobs claimed by this worker
+
+        Returns:
+            int: Number of jobs requeued
+        """
+        now = datetime.now().isoformat()
+        cutoff = (datetime.now() - timedelta(seconds=timeout)).isoformat()
+        condition = "status = ? AND updated_at <= ?"
+        params = (RUNNING, cutoff)
+        if worker is not None:
+            condition += " AND worker = ?"
+            params += (worker,)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE ingest_jobs SET status = ?, error = ?, updated_at = ? WHERE {condition} AND attempts >= ?",
+                (FAILED, "Worker did not finish the job", now, *params, self.max_attempts)
+            )
+            cursor = self._conn.execute(
+                f"UPDATE ingest_jobs SET status = ?, updated_at = ? WHERE {condition}",
+                (QUEUED, now, *params)
+            )
+        if cursor.rowcount:
+            self.logger.warning(f"Requeued {cursor.rowcount} stale jobs")
+        return cursor.rowcount
+
+    def _update(self, job_id: int, **fields) -> None:
+        fields['updated_at'] = datetime.now().isoformat()
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE ingest_jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id)
+            )
@@ -0,0 +1,310 @@
+import hashlib
+import json
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import bindparam, text
+
+from ..utils.nlp_utils import chunked
+from ..utils.ranking_utils import top_k
+
+# Maximum number of IDs bound into one IN (...) query
+ID_CHUNK_SIZE = 1000
+
+SELECT_FINGERPRINT = text("""
+    SELECT match_details FROM job_matches WHERE job_id = :job_id LIMIT 1
+""")
+
+# Candidates never scored for the job, or changed since their score was stored.
+# '>=' because timestamps have one-second resolution
+SELECT_STALE = text("""
+    SELECT c.candidate_id
+    FROM candidates c
+    LEFT JOIN job_matches m ON m.candidate_id = c.candidate_id AND m.job_id = :job_id
+    WHERE m.match_id IS NULL OR c.updated_at >= m.updated_at
+""")
+
+SELECT_STALE_FOR = text("""
+    SELECT c.candidate_id
+    FROM candidates c
+    LEFT JOIN job_matches m ON m.candidate_id = c.candidate_id AND m.job_id = :job_id
+    WHERE c.candidate_id IN :ids AND (m.match_id IS NULL OR c.updated_at >= m.updated_at)
+""").bindparams(bindparam('ids', expanding=True))
+
+SELECT_MATCHES = text("""
+    SELECT m.candidate_id, c.name, c.email, m.match_score,
+           m.skill_match_percentage
+    FROM job_matches m
+    JOIN candidates c ON c.candidate_id = m.candidate_id
+    WHERE m.job_id = :job_id AND m.match_score >= :min_score
+    ORDER BY m.match_score DESC
+    LIMIT :limit OFFSET :offset
+""")
+
+SELECT_SCORES_FOR = text("""
+    SELECT candidate_id, match_score FROM job_matches
+    WHERE job_id = :job_id AND candidate_id IN :ids
+""").bindparams(bindparam('ids', expanding=True))
+
+SELECT_MATCHES_FOR = text("""
+    SELECT m.candidate_id, c.name, c.email, m.match_score,
+           m.skill_match_percentage
+    FROM job_matches m
+    JOIN candidates c ON c.candidate_id = m.candidate_id
+    WHERE m.job_id = :job_id AND m.candidate_id IN :ids
+""").bindparams(bindparam('ids', expanding=True))
+
+COUNT_MATCHES = text("""
+    SELECT COUNT(*) FROM job_matches WHERE job_id = :job_id AND match_score >= :min_score
+""")
+
+INSERT_MATCH_SQL = """
+    INSERT INTO job_matches
+    (job_id, candidate_id, match_score, skill_match_percentage,
+     experience_match_percentage, education_match_percentage,
+     text_similarity, location_match, match_details, created_at, updated_at)
+    VALUES (:job_id, :candidate_id, :match_score, :skill_match,
+            :experience_match, :education_match,
+            :text_similarity, :location_match, :match_details, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+"""
+
+UPDATE_MATCH = text("""
+    UPDATE job_matches SET
+        match_score = :match_score,
+        skill_match_percentage = :skill_match,
+        experience_match_percentage = :experience_match,
+        education_match_percentage = :education_match,
+        text_similarity = :text_similarity,
+        location_match = :location_match,
+        match_details = :match_details,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE job_id = :job_id AND candidate_id = :candidate_id
+""")
+
+INSERT_RANKING_SQL = """
+    INSERT INTO rankings
+    (job_id, candidate_id, skill_score, experience_score, education_score,
+     text_similarity_score, location_score, overall_score,
+     skill_matches, missing_skills, match_date)
+    VALUES (:job_id, :candidate_id, :skill_match, :experience_match, :education_match,
+            :text_similarity, :location_score, :match_score,
+            :skill_matches, :missing_skills, CURRENT_TIMESTAMP)
+"""
+
+# Columns an upsert overwrites when the (job_id, candidate_id) row exists
+MATCH_COLUMNS = (
+    'match_score', 'skill_match_percentage', 'experience_match_percentage', 'education_match_percentage',
+    'text_similarity', 'location_match', 'match_details', 'updated_at'
+)
+
+RANKING_COLUMNS = (
+    'skill_score', 'experience_score', 'education_score', 'text_similarity_score',
+    'location_score', 'overall_score', 'skill_matches', 'missing_skills', 'match_date'
+)
+
+SELECT_EXISTING = """
+    SELECT candidate_id FROM {table} WHERE job_id = :job_id AND candidate_id IN :ids
+"""
+
+
+def upsert_statement(dialect: str, insert_sql: str, columns: Tuple[str, ...]):
+    """
+    INSERT that updates the given columns when the unique (job_id, candidate_id) key exists.
+
+    Returns:
+        The statement, or None for dialects without a native upsert
+    """
+    if dialect == 'mysql':
+        clause = "ON DUPLICATE KEY UPDATE " + ", ".join(f"{column} = VALUES({column})" for column in columns)
+    elif dialect in ('sqlite', 'postgresql'):
+        clause = ("ON CONFLICT (job_id, candidate_id) DO UPDATE SET "
+                  + ", ".join(f"{column} = excluded.{column}" for column in columns))
+    else:
+        return None
+    return text(f"{insert_sql.rstrip()}\n    {clause}")
+
+UPDATE_RANKING = text("""
+    UPDATE rankings SET
+        skill_score = :skill_match,
+        experience_score = :experience_match,
+        education_score = :education_match,
+        text_similarity_score = :text_similarity,
+        location_score = :location_score,
+        overall_score = :match_score,
+        skill_matches = :skill_matches,
+        missing_skills = :missing_skills,
+        match_date = CURRENT_TIMESTAMP
+    WHERE job_id = :job_id AND candidate_id = :candidate_id
+""")
+
+
+class MatchStore:
+    """
+    Cache of per-job match results in the job_matches and rankings tables.
+
+    Every stored row carries a fingerprint of the job requirements it was
+    computed for. A job whose fingerprint changed is recomputed in full;
+    otherwise only candidates without a row, or updated after their row was
+    written, need scoring.
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+    @staticmethod
+    def job_fingerprint(job, *extra) -> str:
+        """Hash of the job fields that influence scoring, plus any extra scoring settings"""
+        parts = [
+            job.description, job.required_skills, job.required_experience,
+            job.required_education, job.location, *extra
+        ]
+        return hashlib.sha1('\x1f'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+    def stale_candidates(self, job_id: int, fingerprint: str,
+                         candidate_ids: Optional[Iterable[int]] = None) -> Optional[List[int]]:
+        """
+        Return the candidates whose cached score for the job is missing or outdated.
+
+        Args:
+            job_id: Job to check
+            fingerprint: Current fingerprint of the job
+            candidate_ids: Only check these candidates; None checks the whole pool
+
+        Returns:
+            None if the whole pool must be scored (nothing cached yet or the
+            job changed), otherwise the list of candidate IDs to rescore
+        """
+        row = self.session.execute(SELECT_FINGERPRINT, {'job_id': job_id}).fetchone()
+        if row is None or json.loads(row.match_details or '{}').get('job_fingerprint') != fingerprint:
+            return None
+
+        if candidate_ids is None:
+            rows = self.session.execute(SELECT_STALE, {'job_id': job_id}).fetchall()
+            return [row.candidate_id for row in rows]
+        stale = []
+        for chunk in chunked(candidate_ids, ID_CHUNK_SIZE):
+            rows = self.session.execute(SELECT_STALE_FOR, {'job_id': job_id, 'ids': chunk})
+            stale.extend(row.candidate_id for row in rows)
+        return stale
+
+    def clear(self, job_id: int) -> None:
+        """Delete every cached match of a job; committed by the next save()"""
+        self.session.execute(text("DELETE FROM job_matches WHERE job_id = :job_id"), {'job_id': job_id})
+        self.session.execute(text("DELETE FROM rankings WHERE job_id = :job_id"), {'job_id': job_id})
+
+    def save(self, job_id: int, fingerprint: str, matches: List[Dict]) -> None:
+        """
+        Upsert match results for a job and commit.
+
+        Each match needs candidate_id, match_score and skills_match;
+        matched_skills, missing_skills, experience_match, education_match
+        and location_match are optional. Skill lists are best built for
+        the displayed page only, so they are stored just when given.
+        """
+        if not matches:
+            return
+
+        rows = [self._row(job_id, fingerprint, match) for match in matches]
+        self._upsert('job_matches', job_id, rows, INSERT_MATCH_SQL, MATCH_COLUMNS, UPDATE_MATCH)
+        self._upsert('rankings', job_id, rows, INSERT_RANKING_SQL, RANKING_COLUMNS, UPDATE_RANKING)
+        self.session.commit()
+
+    def load(self, job_id: int, k: int = 50, offset: int = 0, min_score: float = 0.0) -> List[Dict]:
+        """
+        Return one page of cached matches for a job, best first.
+
+        Selection and ordering happen in the database, so only the page's
+        rows are fetched.
+        """
+        params = {'job_id': job_id, 'limit': k, 'offset': offset, 'min_score': min_score}
+        return [self._match(row) for row in self.session.execute(SELECT_MATCHES, params)]
+
+    def load_candidates(self, job_id: int, candidate_ids: Iterable[int], k: int = 50, offset: int = 0,
+                        min_score: float = 0.0) -> Tuple[List[Dict], int]:
+        """
+        Return one page of cached matches restricted to a set of candidates.
+
+        Only scores are fetched for the whole set; the page is selected with
+        top_k and just its rows are loaded in full.
+
+        Returns:
+            Tuple of (matches best first, number of candidates in the set
+            scoring at least min_score)
+        """
+        ids, scores = [], []
+        for chunk in chunked(candidate_ids, ID_CHUNK_SIZE):
+            for row in self.session.execute(SELECT_SCORES_FOR, {'job_id': job_id, 'ids': chunk}):
+                ids.append(row.candidate_id)
+                scores.append(row.match_score)
+
+        page, total = top_k(np.asarray(scores, dtype=np.float64), k, offset, min_score)
+        page_ids = [ids[i] for i in page]
+        if not page_ids:
+            return [], total
+
+        rows = self.session.execute(SELECT_MATCHES_FOR, {'job_id': job_id, 'ids': page_ids})
+        by_id = {row.candidate_id: self._match(row) for row in rows}
+        return [by_id[candidate_id] for candidate_id in page_ids if candidate_id in by_id], total
+
+    def count(self, job_id: int, min_score: float = 0.0) -> int:
+        """Number of cached matches for a job scoring at least min_score"""
+        return self.session.execute(COUNT_MATCHES, {'job_id': job_id, 'min_score': min_score}).scalar()
+
+    def _match(self, row) -> Dict:
+        """Turn a job_matches/candidates row into a match dict"""
+        return {
+            'candidate_id': row.candidate_id,
+            'name': row.name,
+            'email': row.email,
+            'match_score': row.match_score,
+            'skills_match': row.skill_match_percentage
+        }
+
+    def _row(self, job_id: int, fingerprint: str, match: Dict) -> Dict:
+        """Bind parameters shared by the job_matches and rankings statements"""
+        location_match = match.get('location_match')
+        matched_skills, missing_skills = match.get('matched_skills'), match.get('missing_skills')
+        details = {'job_fingerprint': fingerprint}
+        if matched_skills is not None:
+            details.update(matched_skills=matched_skills, missing_skills=missing_skills or [])
+        return {
+            'job_id': job_id,
+            'candidate_id': match['candidate_id'],
+            'match_score': float(match['match_score']),
+            'skill_match': float(match['skills_match']),
+            'experience_match': float(match.get('experience_match', 0.0)),
+            'education_match': float(match.get('education_match', 0.0)),
+            'text_similarity': float(match.get('text_similarity', match['match_score'])),
+            'location_match': location_match,
+            'location_score': 1.0 if location_match else 0.0,
+            'skill_matches': ','.join(matched_skills) if matched_skills is not None else None,
+            'missing_skills': ','.join(missing_skills) if missing_skills is not None else None,
+            'match_details': json.dumps(details)
+        }
+
+    def _upsert(self, table: str, job_id: int, rows: List[Dict], insert_sql: str,
+                columns: Tuple[str, ...], update_stmt) -> None:
+        """
+        Write rows keyed on the unique (job_id, candidate_id) index with one executemany.
+
+        MySQL, PostgreSQL and SQLite upsert natively, so concurrent saves of
+        the same job cannot insert duplicates. Other dialects update the
+        batch's existing rows and insert the rest.
+        """
+        upsert = upsert_statement(self.session.get_bind().dialect.name, insert_sql, columns)
+        if upsert is not None:
+            self.session.execute(upsert, rows)
+            return
+
+        existing = set()
+        select_existing = text(SELECT_EXISTING.format(table=table)).bindparams(bindparam('ids', expanding=True))
+        for chunk in chunked([row['candidate_id'] for row in rows], ID_CHUNK_SIZE):
+            existing.update(
+                row.candidate_id for row in self.session.execute(select_existing, {'job_id': job_id, 'ids': chunk})
+            )
+        updates = [row for row in rows if row['candidate_id'] in existing]
+        inserts = [row for row in rows if row['candidate_id'] not in existing]
+        if updates:
+            self.session.execute(update_stmt, updates)
+        if inserts:
+            self.session.execute(text(insert_sql), inserts)
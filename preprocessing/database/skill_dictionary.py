@@ -0,0 +1,102 @@
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import bindparam, text
+
+from ..models.skill_taxonomy import SkillTaxonomy
+
+SELECT_DICTIONARY = text("SELECT dictionary_id, name FROM skill_dictionary")
+
+SELECT_ALIASES = text("SELECT alias FROM skill_aliases")
+
+INSERT_SKILL = text("INSERT INTO skill_dictionary (name, category) VALUES (:name, :category)")
+
+INSERT_ALIAS = text("INSERT INTO skill_aliases (alias, dictionary_id) VALUES (:alias, :dictionary_id)")
+
+SELECT_IDS = text("""
+    SELECT dictionary_id, name FROM skill_dictionary WHERE name IN :names
+""").bindparams(bindparam('names', expanding=True))
+
+SELECT_UNLINKED = text("SELECT DISTINCT skill_name FROM skills WHERE dictionary_id IS NULL")
+
+# Link skill rows written before their skill was in the dictionary
+LINK_SKILL = text("""
+    UPDATE skills SET dictionary_id = :dictionary_id
+    WHERE dictionary_id IS NULL AND skill_name = :skill_name
+""")
+
+_default_taxonomy = None
+
+
+def _taxonomy(taxonomy: Optional[SkillTaxonomy]) -> SkillTaxonomy:
+    global _default_taxonomy
+    if taxonomy is not None:
+        return taxonomy
+    if _default_taxonomy is None:
+        _default_taxonomy = SkillTaxonomy()
+    return _default_taxonomy
+
+
+def dictionary_name(skill_name: str, taxonomy: Optional[SkillTaxonomy] = None) -> str:
+    """
+    Name a skill is listed under in skill_dictionary.
+
+    Spellings are resolved in Python, so case, whitespace and aliases
+    ('Node.js', 'nodejs') all map to the same canonical name. Skills outside
+    the taxonomy come back normalized and have no dictionary entry.
+    """
+    return _taxonomy(taxonomy).canonical(skill_name)
+
+
+def dictionary_ids(conn, skill_names: Iterable[str], taxonomy: Optional[SkillTaxonomy] = None) -> Dict[str, int]:
+    """
+    Dictionary IDs of skills, keyed by the name as given.
+
+    Skills without a dictionary entry are left out.
+    """
+    names = {skill_name: dictionary_name(skill_name, taxonomy) for skill_name in skill_names if skill_name}
+    if not names:
+        return {}
+    ids = {row.name: row.dictionary_id for row in conn.execute(SELECT_IDS, {'names': list(set(names.values()))})}
+    return {skill_name: ids[name] for skill_name, name in names.items() if name in ids}
+
+
+def sync_skill_dictionary(conn, taxonomy: Optional[SkillTaxonomy] = None) -> Dict[str, int]:
+    """
+    Add the taxonomy's skills and spellings to the dictionary tables and link
+    skill rows that have no dictionary entry yet.
+
+    Existing entries are never renumbered, so it is safe to run repeatedly.
+
+    Args:
+        conn: Connection inside a transaction
+        taxonomy: Skill vocabulary; a default SkillTaxonomy if None
+
+    Returns:
+        dict: Number of skills, aliases and skill rows added or linked
+    """
+    taxonomy = _taxonomy(taxonomy)
+    ids = {row.name: row.dictionary_id for row in conn.execute(SELECT_DICTIONARY)}
+
+    new_skills = [
+        {'name': name, 'category': taxonomy.category(skill_id)}
+        for skill_id, name in enumerate(taxonomy.names) if name not in ids
+    ]
+    if new_skills:
+        conn.execute(INSERT_SKILL, new_skills)
+        ids = {row.name: row.dictionary_id for row in conn.execute(SELECT_DICTIONARY)}
+
+    known_aliases = {row.alias for row in conn.execute(SELECT_ALIASES)}
+    new_aliases = [
+        {'alias': spelling, 'dictionary_id': ids[taxonomy.name(skill_id)]}
+        for spelling, skill_id in taxonomy.spelling_items() if spelling not in known_aliases
+    ]
+    if new_aliases:
+        conn.execute(INSERT_ALIAS, new_aliases)
+
+    unlinked = [row.skill_name for row in conn.execute(SELECT_UNLINKED)]
+    links = [
+        {'skill_name': skill_name, 'dictionary_id': dictionary_id}
+        for skill_name, dictionary_id in dictionary_ids(conn, unlinked, taxonomy).items()
+    ]
+    linked = conn.execute(LINK_SKILL, links).rowcount if links else 0
+    return {'skills': len(new_skills), 'aliases': len(new_aliases), 'linked': linked}
@@ -2,18 +2,27 @@ import os
 import re
 import logging
 from typing import Dict, Optional, List
-from PyPDF2 import PdfReader
 from docx import Document
 from sqlalchemy.orm import declarative_base
-from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, Text, Enum, Date, DateTime,JSON
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text, Enum, Date, DateTime,JSON
 import datetime 
 from transformers import pipeline
-import spacy
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
+from preprocessing.database.bulk_writer import BulkResumeWriter
+from preprocessing.database.connection import get_engine, get_session_factory
+from preprocessing.database.ingest_manifest import DEFAULT_MANIFEST_PATH, IngestManifest
+from preprocessing.processors.legacy_converter import LEGACY_EXTENSIONS, get_legacy_converter
+from preprocessing.utils.model_registry import get_nlp
+from preprocessing.utils.pdf_utils import extract_pdf_text, stop_at_sections
+from preprocessing.utils.skill_matcher import get_skill_matcher
+from preprocessing.utils.nlp_utils import (
+    DEFAULT_BATCH_SIZE, DEFAULT_N_PROCESS,
+    chunked, doc_features, pipe_docs
+)
+
 # Common resume section patterns
 SECTION_PATTERNS = {
     'experience': r'(work|employment|experience) history?',
@@ -85,48 +94,53 @@ class DocumentProcessor:
         
         # Initialize database connection
         if db_uri:
-            self.engine = create_engine(db_uri)
+            self.engine = get_engine(db_uri)
             Base.metadata.create_all(self.engine)
-            self.Session = sessionmaker(bind=self.engine)
+            self.Session = get_session_factory(db_uri)
         
         if output_directory and not os.path.exists(output_directory):
             os.makedirs(output_directory)
 
-        # Define ORM models for the schema tables
-        from sqlalchemy import Table, MetaData, select
-        metadata = MetaData()
-        metadata.reflect(bind=self.engine)
-
-        self.candidates_table = metadata.tables.get('candidates')
-        self.skills_table = metadata.tables.get('skills')
-        self.projects_table = metadata.tables.get('projects')
-        self.work_experience_table = metadata.tables.get('work_experience')
-        self.certifications_table = metadata.tables.get('certifications')
-        self.rankings_table = metadata.tables.get('rankings')
-        self.analysis_results_table = metadata.tables.get('analysis_results')
+    @property
+    def nlp_model(self):
+        """Shared spaCy pipeline, loaded on first use"""
+        return get_nlp()
 
     def process_pdf(self, file_path: str) -> Optional[dict]:
         """Enhanced PDF extraction with section detection"""
+        text = self._read_pdf(file_path)
+        return self._analyze_resume(text) if text is not None else None
+            
+    def process_docx(self, file_path: str) -> Optional[dict]:
+        """Enhanced DOCX extraction with section detection"""
+        text = self._read_docx(file_path)
+        return self._analyze_resume(text) if text is not None else None
+
+    def _read_pdf(self, file_path: str) -> Optional[str]:
+        """Extract cleaned text from a PDF file"""
         try:
-            text = ""
-            with open(file_path, 'rb') as file:
-                reader = PdfReader(file)
-                for page in reader.pages:
-                    text += self._clean_text(page.extract_text()) + "\n"
-            return self._analyze_resume(text)
+            return extract_pdf_text(file_path, clean=self._clean_text, stop_when=stop_at_sections())
         except Exception as e:
             self.logger.error(f"PDF processing error: {str(e)}")
             return None
-            
-    def process_docx(self, file_path: str) -> Optional[dict]:
-        """Enhanced DOCX extraction with section detection"""
+
+    def _read_docx(self, file_path: str) -> Optional[str]:
+        """Extract cleaned text from a DOCX file"""
         try:
             doc = Document(file_path)
-            text = "\n".join([self._clean_text(para.text) for para in doc.paragraphs])
-            return self._analyze_resume(text)
+            return "\n".join([self._clean_text(para.text) for para in doc.paragraphs])
         except Exception as e:
             self.logger.error(f"DOCX processing error: {str(e)}")
             return None
+
+    def _read_legacy(self, file_path: str) -> Optional[str]:
+        """Extract cleaned text from a .doc or .rtf file via the legacy converter"""
+        try:
+            text = get_legacy_converter().convert(file_path)
+            return "\n".join(self._clean_text(line) for line in text.splitlines()) if text else None
+        except Exception as e:
+            self.logger.error(f"Legacy document conversion error: {str(e)}")
+            return None
             
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text"""
@@ -136,46 +150,18 @@ class DocumentProcessor:
 
     def _analyze_with_nlp(self, text: str) -> dict:
         """Perform NLP analysis on resume text"""
-        model=spacy.load('en_core_web_lg')
-        doc = model(text)
-        
-        # Extract entities
-        entities = {
-            'PERSON': [],
-            'ORG': [],
-            'DATE': [],
-            'CGPA': [],
-            'TECH': []
-        }
-        
-        for ent in doc.ents:
-            if ent.label_ in entities:
-                entities[ent.label_].append(ent.text)
-        
-        # Extract skills using noun chunks and matching
-        skills = []
-        for chunk in doc.noun_chunks:
-            if any(skill.lower() in chunk.text.lower() for skill in SKILL_KEYWORDS):
-                skills.append(chunk.text)
-        
-        return {
-            'entities': entities,
-            'skills': list(set(skills))
-        }
+        return doc_features(self.nlp_model(text))
 
-    def _analyze_resume(self, text: str) -> dict:
-        """Enhanced resume analysis with NLP, contact info and dates"""
+    def _analyze_patterns(self, text: str) -> dict:
+        """Regex-based analysis: sections, skills, contact info and dates"""
         # Detect sections
         sections = {
             name: bool(re.search(pattern, text, re.I))
             for name, pattern in SECTION_PATTERNS.items()
         }
         
-        # Extract skills
-        skills = [
-            skill for skill in SKILL_KEYWORDS
-            if re.search(rf'\b{re.escape(skill)}\b', text, re.I)
-        ]
+        # Extract skills in a single pass over the text
+        skills = get_skill_matcher().find_skills(text)
         
         # Extract contact info
         contacts = {
@@ -190,13 +176,17 @@ class DocumentProcessor:
         }
         
         # Basic analysis
-        analysis = {
+        return {
             'raw_text': text,
             'sections': sections,
             'skills': skills,
             'contacts': contacts,
             'dates': dates
         }
+
+    def _analyze_resume(self, text: str) -> dict:
+        """Enhanced resume analysis with NLP, contact info and dates"""
+        analysis = self._analyze_patterns(text)
         
         # Add NLP analysis
         nlp_analysis = self._analyze_with_nlp(text)
@@ -204,6 +194,14 @@ class DocumentProcessor:
         
         return analysis
 
+    def analyze_texts(self, texts, batch_size: int = DEFAULT_BATCH_SIZE,
+                      n_process: int = DEFAULT_N_PROCESS):
+        """Analyze many resume texts with one batched nlp.pipe run, yielding results in input order"""
+        for text, doc in pipe_docs(self.nlp_model, texts, batch_size=batch_size, n_process=n_process):
+            analysis = self._analyze_patterns(text)
+            analysis.update(doc_features(doc))
+            yield analysis
+
     def extract_from_pdf(self, file_path: str) -> str:
         """Legacy method - use process_pdf instead"""
         result = self.process_pdf(file_path)
@@ -216,191 +214,181 @@ class DocumentProcessor:
 
     def save_to_db(self, file_name: str, analysis_data: dict):
         """Save analysis results to database"""
+        return self._save_resume(file_name, analysis_data) is not None
+
+    def _save_resume(self, file_name: str, analysis_data: dict, resume_id: Optional[int] = None) -> Optional[int]:
+        """Insert an analysis, or overwrite resume_id when given; returns the row ID"""
         if not hasattr(self, 'Session'):
             self.logger.warning("No database connection configured")
-            return False
+            return None
             
         session = self.Session()
         try:
-            resume = Resume(
-                file_name=file_name,
-                raw_text=analysis_data['raw_text'],
-                extracted_data=analysis_data
-            )
-            session.add(resume)
+            resume = session.get(Resume, resume_id) if resume_id else None
+            if resume is None:
+                resume = Resume(file_name=file_name)
+                session.add(resume)
+            resume.raw_text = analysis_data['raw_text']
+            resume.extracted_data = analysis_data
             session.commit()
-            return True
+            return resume.id
         except Exception as e:
             session.rollback()
             self.logger.error(f"Database error: {str(e)}")
-            return False
+            return None
         finally:
             session.close()
 
-    def insert_candidate(self, session, candidate_data):
-        """Insert candidate data into candidates table and return candidate_id"""
-        insert_stmt = self.candidates_table.insert().values(**candidate_data)
-        result = session.execute(insert_stmt)
-        session.commit()
-        return result.inserted_primary_key[0]
-
-    def insert_skills(self, session, candidate_id, skills):
-        """Insert skills for a candidate"""
-        for skill in skills:
-            skill_data = {
-                'candidate_id': candidate_id,
-                'skill_name': skill,
-                'proficiency_level': None  # Can be extended to extract proficiency
-            }
-            session.execute(self.skills_table.insert().values(**skill_data))
-        session.commit()
-
-    def insert_projects(self, session, candidate_id, projects):
-        """Insert projects for a candidate"""
-        for project in projects:
-            project_data = {
-                'candidate_id': candidate_id,
-                'project_title': project.get('title'),
-                'project_description': project.get('description'),
-                'technologies_used': project.get('technologies'),
-                'project_url': project.get('url')
-            }
-            session.execute(self.projects_table.insert().values(**project_data))
-        session.commit()
-
-    def insert_work_experience(self, session, candidate_id, work_experiences):
-        """Insert work experience for a candidate"""
-        for work in work_experiences:
-            work_data = {
-                'candidate_id': candidate_id,
-                'company_name': work.get('company'),
-                'job_title': work.get('title'),
-                'start_date': work.get('start_date'),
-                'end_date': work.get('end_date'),
-                'description': work.get('description')
-            }
-            session.execute(self.work_experience_table.insert().values(**work_data))
-        session.commit()
-
-    def insert_certifications(self, session, candidate_id, certifications):
-        """Insert certifications for a candidate"""
-        for cert in certifications:
-            cert_data = {
-                'candidate_id': candidate_id,
-                'certification_name': cert.get('name'),
-                'issuing_organization': cert.get('organization'),
-                'issue_date': cert.get('issue_date'),
-                'expiration_date': cert.get('expiration_date'),
-                'credential_url': cert.get('url')
-            }
-            session.execute(self.certifications_table.insert().values(**cert_data))
-        session.commit()
-
-    def insert_analysis_results(self, session, candidate_id, insights):
-        """Insert analysis results for a candidate"""
-        analysis_data = {
-            'candidate_id': candidate_id,
-            'analysis_date': datetime.datetime.now(),
-            'insights': insights
+    def _select_files(self, filenames, manifest: Optional[IngestManifest]):
+        """Drop files the manifest reports as unchanged; returns (filenames, entries by filename)"""
+        if manifest is None:
+            return filenames, {}
+        paths = {
+            os.path.join(self.input_directory, f): f for f in filenames
+            if os.path.isfile(os.path.join(self.input_directory, f))
         }
-        session.execute(self.analysis_results_table.insert().values(**analysis_data))
-        session.commit()
+        selected = manifest.select(paths, root=self.input_directory)
+        entries = {paths[path]: entry for path, entry in selected.items()}
+        return [f for f in filenames if f in entries], entries
+
+    def _store(self, filename: str, analysis: dict, manifest: Optional[IngestManifest], entries: dict,
+               writer: Optional[BulkResumeWriter] = None):
+        """
+        Save an analysis and record it in the manifest, replacing the old row for changed files.
+
+        With a writer the analysis is also queued for the candidates schema.
+        """
+        entry = entries.get(filename)
+        resume_id = self._save_resume(filename, analysis, entry['record_id'] if entry else None)
+        if manifest is not None and entry and resume_id is not None:
+            manifest.record(entry, resume_id)
+        if writer is not None:
+            self.map_and_insert(filename, analysis, writer)
+
+    def _writer(self) -> Optional[BulkResumeWriter]:
+        """Bulk writer for the candidates schema, None without a database"""
+        if not hasattr(self, 'Session'):
+            return None
+        return BulkResumeWriter(self.engine, logger=self.logger)
+
+    def map_and_insert(self, file_name: str, analysis_data: dict,
+                       writer: Optional[BulkResumeWriter] = None) -> bool:
+        """
+        Map extracted data to the candidates schema and write it with BulkResumeWriter.
 
-    def map_and_insert(self, file_name: str, analysis_data: dict):
-        """Map extracted data to schema and insert into database"""
+        With a writer the resume is only queued, so many resumes share one
+        transaction and one executemany per table; without one it is written
+        in its own transaction.
+
+        Returns:
+            bool: Whether the resume was queued or stored
+        """
         if not hasattr(self, 'Session'):
             self.logger.warning("No database connection configured")
             return False
 
-        session = self.Session()
-        try:
-            # Map candidate data
-            candidate_data = {
-                'name': None,
-                'email': None,
-                'phone': None,
-                'linkedin': None,
-                'github': None,
-                'total_experience': None,
-                'highest_qualification': None,
-                'university': None,
-                'location': None,
+        # Basic contact info and the first PERSON entity as the name
+        contacts = analysis_data.get('contacts', {})
+        emails = contacts.get('emails', [])
+        phones = contacts.get('phones', [])
+        persons = analysis_data.get('entities', {}).get('PERSON', [])
+        parsed = {
+            'file_path': file_name,
+            'candidate': {
+                'name': persons[0] if persons else None,
+                'email': emails[0] if emails else None,
+                'phone': phones[0] if phones else None,
                 'resume_text': analysis_data.get('raw_text')
-            }
-
-            # Extract basic contact info from analysis_data
-            contacts = analysis_data.get('contacts', {})
-            emails = contacts.get('emails', [])
-            phones = contacts.get('phones', [])
-            candidate_data['email'] = emails[0] if emails else None
-            candidate_data['phone'] = phones[0] if phones else None
-
-            # Extract name from entities PERSON if available
-            entities = analysis_data.get('entities', {})
-            persons = entities.get('PERSON', [])
-            candidate_data['name'] = persons[0] if persons else None
-
-            # TODO: Extract linkedin, github, total_experience, highest_qualification, university, location from text or entities
-
-            # Insert candidate and get candidate_id
-            candidate_id = self.insert_candidate(session, candidate_data)
-
-            # Insert skills
-            skills = analysis_data.get('skills', [])
-            self.insert_skills(session, candidate_id, skills)
-
-            # Insert projects - placeholder empty list for now
-            projects = []  # Can be extracted from analysis_data if available
-            self.insert_projects(session, candidate_id, projects)
-
-            # Insert work experience - placeholder empty list for now
-            work_experiences = []  # Can be extracted from analysis_data if available
-            self.insert_work_experience(session, candidate_id, work_experiences)
-
-            # Insert certifications - placeholder empty list for now
-            certifications = []  # Can be extracted from analysis_data if available
-            self.insert_certifications(session, candidate_id, certifications)
-
-            # Insert analysis results
-            insights = "Extracted data from resume"
-            self.insert_analysis_results(session, candidate_id, insights)
+            },
+            'skills': [{'name': skill, 'proficiency': None} for skill in analysis_data.get('skills', [])],
+            'work_history': [],
+            'analysis': "Extracted data from resume"
+        }
 
+        if writer is not None:
+            writer.add(parsed)
             return True
-        except Exception as e:
-            session.rollback()
-            self.logger.error(f"Error inserting mapped data: {str(e)}")
-            return False
-        finally:
-            session.close()
-
-    def process_files(self) -> Dict[str, str]:
-        """Process all PDF/DOCX files, analyze with NLP and store in DB."""
+        with BulkResumeWriter(self.engine, batch_size=1, logger=self.logger) as single:
+            single.add(parsed)
+        return file_name in single.stored
+
+    def _read_single_file(self, file_path: str) -> Optional[str]:
+        """Extract text from a PDF/DOCX/DOC/RTF file; other types are skipped"""
+        if file_path.lower().endswith('.pdf'):
+            return self._read_pdf(file_path)
+        elif file_path.lower().endswith('.docx'):
+            return self._read_docx(file_path)
+        elif file_path.lower().endswith(LEGACY_EXTENSIONS):
+            return self._read_legacy(file_path)
+        return None
+
+    def process_files(self, manifest: Optional[IngestManifest] = None) -> Dict[str, str]:
+        """Process all PDF/DOCX/DOC/RTF files, analyze with NLP and store in DB; a manifest skips unchanged files."""
         results = {}
+        filenames, entries = self._select_files([
+            f for f in os.listdir(self.input_directory)
+            if f.lower().endswith(('.pdf', '.docx') + LEGACY_EXTENSIONS)
+        ], manifest)
+        writer = self._writer()
         
-        for filename in os.listdir(self.input_directory):
-            file_path = os.path.join(self.input_directory, filename)
-            
-            if filename.lower().endswith('.pdf'):
-                analysis = self.process_pdf(file_path)
-            elif filename.lower().endswith('.docx'):
-                analysis = self.process_docx(file_path)
-            else:
-                continue
+        for filename in filenames:
+            text = self._read_single_file(os.path.join(self.input_directory, filename))
+            analysis = self._analyze_resume(text) if text is not None else None
                 
             # Save to database
             if analysis:
-                self.save_to_db(filename, analysis)
+                self._store(filename, analysis, manifest, entries, writer)
             
             results[filename] = {
                 'analysis': analysis
             }
-            
+
+        if writer is not None:
+            writer.flush()
         return results
 
+    def process_files_batched(self, batch_size: int = DEFAULT_BATCH_SIZE, n_process: int = DEFAULT_N_PROCESS,
+                              chunk_size: int = 1000, manifest: Optional[IngestManifest] = None):
+        """
+        Batched variant of process_files using nlp.pipe.
+
+        Text is extracted for chunk_size files at a time and each chunk is
+        analyzed in one nlp.pipe run. Yields (filename, analysis) in directory
+        order; analysis is None if text extraction failed. With a manifest,
+        unchanged files are skipped before any parsing. Candidate rows are
+        written with one BulkResumeWriter transaction per chunk.
+        """
+        filenames, entries = self._select_files(sorted(
+            f for f in os.listdir(self.input_directory)
+            if f.lower().endswith(('.pdf', '.docx') + LEGACY_EXTENSIONS)
+        ), manifest)
+        writer = self._writer()
+
+        for chunk in chunked(filenames, chunk_size):
+            texts = {}
+            get_legacy_converter().prefetch(os.path.join(self.input_directory, f) for f in chunk)
+            for filename in chunk:
+                text = self._read_single_file(os.path.join(self.input_directory, filename))
+                if text is not None:
+                    texts[filename] = text
+
+            analyses = self.analyze_texts(texts.values(), batch_size=batch_size, n_process=n_process)
+            by_name = dict(zip(texts.keys(), analyses))
+
+            for filename in chunk:
+                analysis = by_name.get(filename)
+                if analysis:
+                    self._store(filename, analysis, manifest, entries, writer)
+            # Written before yielding so a consumer that stops early loses nothing
+            if writer is not None:
+                writer.flush()
+            for filename in chunk:
+                yield filename, by_name.get(filename)
+
 class EnhancedDocumentProcessor:
     def __init__(self):
         # Load NLP models
-        self.nlp = spacy.load('en_core_web_lg')
+        self.nlp = get_nlp()
         self.classifier = pipeline("text-classification", model="distilbert-base-uncased")
         
     def extract_structured_data(self, text):
@@ -445,8 +433,13 @@ def main():
     # Create processor instance
     processor = DocumentProcessor(input_dir, None, db_uri=DATABASE_URL)
     
-    # Process all files
-    results = processor.process_files()
+    # Process new and changed files, batching the NLP step
+    manifest_path = os.path.join(current_dir, '..', DEFAULT_MANIFEST_PATH)
+    with IngestManifest(manifest_path) as manifest:
+        results = {
+            filename: {'analysis': analysis}
+            for filename, analysis in processor.process_files_batched(manifest=manifest)
+        }
     
     # Print results
     print("\nProcessing Complete!")         
@@ -1,9 +1,11 @@
 from preprocessing.models.patterns import (
-    SECTION_PATTERNS, SKILL_KEYWORDS,
-    CONTACT_PATTERNS, DATE_PATTERNS
+    SECTION_PATTERNS, SKILL_KEYWORDS, SKILL_CATEGORIES,
+    EDUCATION_LEVELS, CONTACT_PATTERNS, DATE_PATTERNS
 )
+from preprocessing.models.skill_taxonomy import SKILL_ALIASES, SkillTaxonomy, normalize_skill
 
 __all__ = [
-    'SECTION_PATTERNS', 'SKILL_KEYWORDS',
-    'CONTACT_PATTERNS', 'DATE_PATTERNS'
-] 
\ No newline at end of file
+    'SECTION_PATTERNS', 'SKILL_KEYWORDS', 'SKILL_CATEGORIES',
+    'EDUCATION_LEVELS', 'CONTACT_PATTERNS', 'DATE_PATTERNS',
+    'SKILL_ALIASES', 'SkillTaxonomy', 'normalize_skill'
+]
\ No newline at end of file
@@ -31,6 +31,45 @@ SKILL_KEYWORDS = [
     'project management', 'agile', 'scrum', 'git', 'linux'
 ]
 
+# Categorised skills used for resume skill extraction
+SKILL_CATEGORIES = {
+    'programming': [
+        'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'ruby', 'php',
+        'swift', 'kotlin', 'go', 'rust', 'scala', 'perl', 'r', 'matlab'
+    ],
+    'web_development': [
+        'html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'django',
+        'flask', 'spring', 'asp.net', 'laravel', 'jquery', 'bootstrap', 'sass'
+    ],
+    'databases': [
+        'sql', 'mysql', 'postgresql', 'mongodb', 'oracle', 'sqlite', 'redis',
+        'cassandra', 'elasticsearch', 'dynamodb', 'neo4j'
+    ],
+    'cloud_platforms': [
+        'aws', 'azure', 'gcp', 'heroku', 'digitalocean', 'ibm cloud',
+        'alibaba cloud', 'oracle cloud'
+    ],
+    'devops': [
+        'docker', 'kubernetes', 'jenkins', 'git', 'github', 'gitlab',
+        'ansible', 'terraform', 'puppet', 'chef', 'prometheus', 'grafana'
+    ],
+    'data_science': [
+        'machine learning', 'deep learning', 'data analysis', 'data mining',
+        'statistics', 'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch',
+        'keras', 'spark', 'hadoop', 'hive', 'pig', 'tableau', 'power bi'
+    ]
+}
+
+# Education levels by keyword, higher is more advanced
+EDUCATION_LEVELS = {
+    'high school': 1,
+    'associate': 2,
+    'bachelor': 3,
+    'master': 4,
+    'phd': 5,
+    'doctorate': 5
+}
+
 # Contact info patterns
 CONTACT_PATTERNS = {
     'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b',
@@ -0,0 +1,127 @@
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from preprocessing.models.patterns import SKILL_CATEGORIES, SKILL_KEYWORDS
+
+DEFAULT_CATEGORY = 'other'
+
+# Alternative spellings, keyed by canonical skill name
+SKILL_ALIASES = {
+    'javascript': ['js', 'ecmascript'],
+    'typescript': ['ts'],
+    'c++': ['cpp'],
+    'c#': ['csharp', 'c sharp'],
+    'go': ['golang'],
+    'node.js': ['node', 'nodejs', 'node js'],
+    'react': ['reactjs', 'react.js'],
+    'vue': ['vuejs', 'vue.js'],
+    'angular': ['angularjs', 'angular.js'],
+    'asp.net': ['aspnet', 'asp net'],
+    'postgresql': ['postgres', 'psql'],
+    'mongodb': ['mongo'],
+    'elasticsearch': ['elastic search'],
+    'aws': ['amazon web services'],
+    'azure': ['microsoft azure'],
+    'gcp': ['google cloud', 'google cloud platform'],
+    'kubernetes': ['k8s'],
+    'ci/cd': ['cicd', 'ci cd'],
+    'machine learning': ['ml'],
+    'deep learning': ['dl'],
+    'scikit-learn': ['sklearn', 'scikit learn'],
+    'power bi': ['powerbi']
+}
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_skill(name: str) -> str:
+    """Lowercase a skill name and collapse whitespace"""
+    return _WHITESPACE.sub(' ', (name or '').strip().lower())
+
+
+class SkillTaxonomy:
+    """
+    Canonical integer IDs for skills.
+
+    Every known skill gets an ID and a category; aliases resolve to the ID of
+    their canonical skill, so 'node', 'nodejs' and 'node.js' are the same
+    skill. IDs of the built-in vocabulary are stable (assigned in definition
+    order). Free-text skills outside the vocabulary, such as noun chunks,
+    can be added on the fly and get the next free ID.
+    """
+
+    def __init__(self, categories: Dict[str, List[str]] = SKILL_CATEGORIES,
+                 keywords: Iterable[str] = SKILL_KEYWORDS,
+                 aliases: Dict[str, List[str]] = SKILL_ALIASES):
+        self.names: List[str] = []
+        self.categories: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        for category, skills in categories.items():
+            for skill in skills:
+                self._add(skill, category)
+        for skill in keywords:
+            self._add(skill, DEFAULT_CATEGORY)
+        for canonical, alternatives in aliases.items():
+            skill_id = self._add(canonical, DEFAULT_CATEGORY)
+            for alias in alternatives:
+                self._ids.setdefault(normalize_skill(alias), skill_id)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_skill(name) in self._ids
+
+    def resolve(self, name: str, add: bool = False) -> Optional[int]:
+        """
+        Return the canonical ID of a skill name or alias.
+
+        Args:
+            name: Skill as written
+            add: Register unknown skills instead of returning None
+
+        Returns:
+            The skill ID, or None for unknown skills when add is False
+        """
+        key = normalize_skill(name)
+        skill_id = self._ids.get(key)
+        if skill_id is None and add and key:
+            with self._lock:
+                skill_id = self._add(key, DEFAULT_CATEGORY)
+        return skill_id
+
+    def canonical(self, name: str) -> str:
+        """Canonical name of a skill; unknown skills are only normalized"""
+        skill_id = self._ids.get(normalize_skill(name))
+        return self.names[skill_id] if skill_id is not None else normalize_skill(name)
+
+    def spellings(self, name: str) -> List[str]:
+        """Every known name of a skill: its canonical name and aliases (normalized)"""
+        key = normalize_skill(name)
+        skill_id = self._ids.get(key)
+        if skill_id is None:
+            return [key] if key else []
+        return [spelling for spelling, spelling_id in self._ids.items() if spelling_id == skill_id]
+
+    def spelling_items(self) -> List[Tuple[str, int]]:
+        """Every known (spelling, skill ID) pair, canonical names included"""
+        return list(self._ids.items())
+
+    def name(self, skill_id: int) -> str:
+        return self.names[skill_id]
+
+    def category(self, skill_id: int) -> str:
+        return self.categories[skill_id]
+
+    def _add(self, name: str, category: str) -> int:
+        """Register a canonical skill unless already known; returns its ID"""
+        key = normalize_skill(name)
+        skill_id = self._ids.get(key)
+        if skill_id is None:
+            skill_id = self._ids[key] = len(self.names)
+            self.names.append(key)
+            self.categories.append(category)
+        return skill_id
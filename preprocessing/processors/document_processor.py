@@ -1,37 +1,41 @@
 import os
-from typing import Dict, Optional
-from PyPDF2 import PdfReader
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 from docx import Document
-from sqlalchemy import create_engine, Table, MetaData
-from sqlalchemy.orm import sessionmaker
-import spacy
+from sqlalchemy import Table, MetaData
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import re
 
 from preprocessing.dataextraction import Base, Resume
+from preprocessing.database.connection import get_engine, get_session_factory
+from preprocessing.database.ingest_manifest import IngestManifest
+from preprocessing.processors.legacy_converter import LEGACY_EXTENSIONS, get_legacy_converter
 from preprocessing.models.patterns import (
-    SECTION_PATTERNS, SKILL_KEYWORDS, 
+    SECTION_PATTERNS,
     CONTACT_PATTERNS, DATE_PATTERNS
 )
+from preprocessing.utils.metrics import metrics
 from preprocessing.utils.text_utils import clean_text, setup_logger
+from preprocessing.utils.model_registry import get_nlp
+from preprocessing.utils.pdf_utils import extract_pdf_text, stop_at_sections
+from preprocessing.utils.nlp_utils import (
+    DEFAULT_BATCH_SIZE, DEFAULT_N_PROCESS,
+    chunked, doc_features, pipe_docs
+)
 
 class DocumentProcessor:
-    """A class to process PDF/DOCX files, extract text, analyze with NLP and store in DB."""
+    """A class to process PDF/DOCX/DOC/RTF files, extract text, analyze with NLP and store in DB."""
     
     def __init__(self, input_directory: str = None, output_directory: str = None, db_uri: str = None):
         self.logger = setup_logger(__name__)
         self.input_directory = input_directory
         self.output_directory = output_directory
         
-        # Load spacy model once
-        self.nlp_model = spacy.load('en_core_web_lg')
-        
         # Initialize database connection
         if db_uri:
-            self.engine = create_engine(db_uri)
+            self.engine = get_engine(db_uri)
             Base.metadata.create_all(self.engine)
-            self.Session = sessionmaker(bind=self.engine)
+            self.Session = get_session_factory(db_uri)
         
         if output_directory and not os.path.exists(output_directory):
             os.makedirs(output_directory)
@@ -49,60 +53,53 @@ class DocumentProcessor:
             self.rankings_table = metadata.tables.get('rankings')
             self.analysis_results_table = metadata.tables.get('analysis_results')
 
+    @property
+    def nlp_model(self):
+        """Shared spaCy pipeline, loaded on first use"""
+        return get_nlp()
+
     def process_pdf(self, file_path: str) -> Optional[dict]:
         """Enhanced PDF extraction with section detection"""
+        text = self._read_pdf(file_path)
+        return self._analyze_resume(text) if text is not None else None
+            
+    def process_docx(self, file_path: str) -> Optional[dict]:
+        """Enhanced DOCX extraction with section detection"""
+        text = self._read_docx(file_path)
+        return self._analyze_resume(text) if text is not None else None
+
+    def _read_pdf(self, file_path: str) -> Optional[str]:
+        """Extract cleaned text from a PDF file"""
         try:
-            texts = []
-            with open(file_path, 'rb') as file:
-                reader = PdfReader(file)
-                for page in reader.pages:
-                    texts.append(clean_text(page.extract_text()))
-            text = "\n".join(texts)
-            return self._analyze_resume(text)
+            return extract_pdf_text(file_path, clean=clean_text, stop_when=stop_at_sections())
         except Exception as e:
             self.logger.error(f"PDF processing error: {str(e)}")
             return None
-            
-    def process_docx(self, file_path: str) -> Optional[dict]:
-        """Enhanced DOCX extraction with section detection"""
+
+    def _read_docx(self, file_path: str) -> Optional[str]:
+        """Extract cleaned text from a DOCX file"""
         try:
             doc = Document(file_path)
-            text = "\n".join([clean_text(para.text) for para in doc.paragraphs])
-            return self._analyze_resume(text)
+            return "\n".join([clean_text(para.text) for para in doc.paragraphs])
         except Exception as e:
             self.logger.error(f"DOCX processing error: {str(e)}")
             return None
 
+    def _read_legacy(self, file_path: str) -> Optional[str]:
+        """Extract cleaned text from a .doc or .rtf file via the legacy converter"""
+        try:
+            text = get_legacy_converter().convert(file_path)
+            return "\n".join(clean_text(line) for line in text.splitlines()) if text else None
+        except Exception as e:
+            self.logger.error(f"Legacy document conversion error: {str(e)}")
+            return None
+
     def _analyze_with_nlp(self, text: str) -> dict:
         """Perform NLP analysis on resume text"""
-        doc = self.nlp_model(text)
-        
-        # Extract entities
-        entities = {
-            'PERSON': [],
-            'ORG': [],
-            'DATE': [],
-            'CGPA': [],
-            'TECH': []
-        }
-        
-        for ent in doc.ents:
-            if ent.label_ in entities:
-                entities[ent.label_].append(ent.text)
-        
-        # Extract skills using noun chunks and matching
-        skills = []
-        for chunk in doc.noun_chunks:
-            if any(skill.lower() in chunk.text.lower() for skill in SKILL_KEYWORDS):
-                skills.append(chunk.text)
-        
-        return {
-            'entities': entities,
-            'skills': list(set(skills))
-        }
+        return doc_features(self.nlp_model(text))
 
-    def _analyze_resume(self, text: str) -> dict:
-        """Enhanced resume analysis with NLP, contact info and dates"""
+    def _analyze_patterns(self, text: str) -> dict:
+        """Regex-based analysis: sections, contact info and dates"""
         # Detect sections
         sections = {
             name: bool(re.search(pattern, text, re.I))
@@ -123,62 +120,131 @@ class DocumentProcessor:
         }
         
         # Basic analysis
-        analysis = {
+        return {
             'raw_text': text,
             'sections': sections,
             'contacts': contacts,
             'dates': dates
         }
+
+    def _analyze_resume(self, text: str) -> dict:
+        """Enhanced resume analysis with NLP, contact info and dates"""
+        with metrics.timer('regex'):
+            analysis = self._analyze_patterns(text)
         
         # Add NLP analysis
-        nlp_analysis = self._analyze_with_nlp(text)
+        with metrics.timer('nlp'):
+            nlp_analysis = self._analyze_with_nlp(text)
         analysis.update(nlp_analysis)
         
         return analysis
 
+    def analyze_texts(self, texts: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE,
+                      n_process: int = DEFAULT_N_PROCESS) -> Iterator[dict]:
+        """
+        Analyze many resume texts with a single batched nlp.pipe run.
+        
+        Args:
+            texts: Resume texts to analyze
+            batch_size: Number of texts per spaCy batch
+            n_process: Number of spaCy worker processes
+            
+        Returns:
+            Iterator of analysis dicts, in the same order as texts
+        """
+        docs = pipe_docs(self.nlp_model, texts, batch_size=batch_size, n_process=n_process)
+        while True:
+            # The pipe parses a whole batch on the first next() of each batch
+            with metrics.timer('nlp'):
+                item = next(docs, None)
+                if item is None:
+                    return
+                text, doc = item
+                features = doc_features(doc)
+            with metrics.timer('regex'):
+                analysis = self._analyze_patterns(text)
+            analysis.update(features)
+            yield analysis
+
     def save_to_db(self, file_name: str, analysis_data: dict) -> bool:
         """Save analysis results to database"""
+        return self._save_resume(file_name, analysis_data) is not None
+
+    def _save_resume(self, file_name: str, analysis_data: dict, resume_id: Optional[int] = None) -> Optional[int]:
+        """Insert an analysis, or overwrite resume_id when given; returns the row ID"""
         if not hasattr(self, 'Session'):
             self.logger.warning("No database connection configured")
-            return False
+            return None
             
         session = self.Session()
         try:
-            resume = Resume(
-                file_name=file_name,
-                raw_text=analysis_data['raw_text'],
-                extracted_data=analysis_data
-            )
-            session.add(resume)
+            resume = session.get(Resume, resume_id) if resume_id else None
+            if resume is None:
+                resume = Resume(file_name=file_name)
+                session.add(resume)
+            resume.raw_text = analysis_data['raw_text']
+            resume.extracted_data = analysis_data
             session.commit()
-            return True
+            return resume.id
         except Exception as e:
             session.rollback()
             self.logger.error(f"Database error: {str(e)}")
-            return False
+            return None
         finally:
             session.close()
 
+    def _select_files(self, filenames, manifest: Optional[IngestManifest]):
+        """Drop files the manifest reports as unchanged; returns (filenames, entries by filename)"""
+        if manifest is None:
+            return filenames, {}
+        paths = {
+            os.path.join(self.input_directory, f): f for f in filenames
+            if os.path.isfile(os.path.join(self.input_directory, f))
+        }
+        selected = manifest.select(paths, root=self.input_directory)
+        entries = {paths[path]: entry for path, entry in selected.items()}
+        return [f for f in filenames if f in entries], entries
+
+    def _store(self, filename: str, analysis: dict, manifest: Optional[IngestManifest], entries: dict):
+        """Save an analysis and record it in the manifest, replacing the old row for changed files"""
+        entry = entries.get(filename)
+        resume_id = self._save_resume(filename, analysis, entry['record_id'] if entry else None)
+        if manifest is not None and entry and resume_id is not None:
+            manifest.record(entry, resume_id)
+
+    def _read_single_file(self, file_path: str) -> Optional[str]:
+        """Extract text from a single file based on its extension."""
+        with metrics.timer('extract', format=os.path.splitext(file_path)[1].lower()):
+            if file_path.lower().endswith('.pdf'):
+                return self._read_pdf(file_path)
+            elif file_path.lower().endswith('.docx'):
+                return self._read_docx(file_path)
+            elif file_path.lower().endswith(LEGACY_EXTENSIONS):
+                return self._read_legacy(file_path)
+        self.logger.warning(f"Unsupported file type: {file_path}")
+        return None
+
     def _process_single_file(self, file_path: str) -> Optional[dict]:
         """Process a single file based on its extension."""
-        if file_path.lower().endswith('.pdf'):
-            return self.process_pdf(file_path)
-        elif file_path.lower().endswith('.docx'):
-            return self.process_docx(file_path)
-        else:
-            self.logger.warning(f"Unsupported file type: {file_path}")
-            return None
+        text = self._read_single_file(file_path)
+        return self._analyze_resume(text) if text is not None else None
 
-    def process_files(self) -> Dict[str, dict]:
-        """Process all PDF/DOCX files, analyze with NLP and store in DB."""
+    def process_files(self, manifest: Optional[IngestManifest] = None) -> Dict[str, dict]:
+        """
+        Process all PDF/DOCX files, analyze with NLP and store in DB.
+        
+        With a manifest, unchanged files are skipped before parsing and
+        changed files overwrite the row they produced previously.
+        """
         results = {}
+        filenames, entries = self._select_files(os.listdir(self.input_directory), manifest)
 
-        for filename in os.listdir(self.input_directory):
+        for filename in filenames:
             file_path = os.path.join(self.input_directory, filename)
             analysis = self._process_single_file(file_path)
 
             if analysis:
-                self.save_to_db(filename, analysis)
+                self._store(filename, analysis, manifest, entries)
 
             results[filename] = {
                 'analysis': analysis
@@ -186,3 +252,45 @@ class DocumentProcessor:
 
         self.logger.info(f"Processed {len(results)} files from {self.input_directory}")
         return results
+
+    def process_files_batched(self, batch_size: int = DEFAULT_BATCH_SIZE, n_process: int = DEFAULT_N_PROCESS,
+                              chunk_size: int = 1000,
+                              manifest: Optional[IngestManifest] = None) -> Iterator[Tuple[str, Optional[dict]]]:
+        """
+        Batched variant of process_files using nlp.pipe.
+        
+        Text is extracted for chunk_size files at a time, the chunk is analyzed
+        in one nlp.pipe run and each analysis is saved to the DB.
+        
+        Args:
+            batch_size: Number of texts per spaCy batch
+            n_process: Number of spaCy worker processes
+            chunk_size: Number of files whose text is held in memory at once
+            manifest: Optional ingest manifest used to skip unchanged files
+            
+        Returns:
+            Iterator of (filename, analysis) tuples in directory order;
+            analysis is None for files whose text could not be extracted
+        """
+        filenames, entries = self._select_files(sorted(os.listdir(self.input_directory)), manifest)
+        total = 0
+
+        for chunk in chunked(filenames, chunk_size):
+            texts = {}
+            get_legacy_converter().prefetch(os.path.join(self.input_directory, f) for f in chunk)
+            for filename in chunk:
+                text = self._read_single_file(os.path.join(self.input_directory, filename))
+                if text is not None:
+                    texts[filename] = text
+
+            analyses = self.analyze_texts(texts.values(), batch_size=batch_size, n_process=n_process)
+            by_name = dict(zip(texts.keys(), analyses))
+
+            for filename in chunk:
+                analysis = by_name.get(filename)
+                if analysis:
+                    self._store(filename, analysis, manifest, entries)
+                total += 1
+                yield filename, analysis
+
+        self.logger.info(f"Processed {total} files from {self.input_directory}")
@@ -0,0 +1,186 @@
+import hashlib
+import os
+import re
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from preprocessing.utils.embedding_index import EmbeddingIndex
+from preprocessing.utils.ivf_index import IVFIndex
+from preprocessing.utils.metrics import metrics
+from preprocessing.utils.model_registry import DEFAULT_EMBEDDING_MODEL, get_sentence_encoder
+
+DEFAULT_INDEX_ROOT = os.path.join('src', 'components', 'datafiles', 'embedding_index')
+DEFAULT_BATCH_SIZE = int(os.environ.get('RESUME_EMBEDDING_BATCH_SIZE', 64))
+
+
+def text_digest(text: str) -> int:
+    """Signed 64-bit digest of a resume text, stored with its vector"""
+    digest = hashlib.sha1((text or "").encode('utf-8')).digest()[:8]
+    return int.from_bytes(digest, 'little', signed=True) or 1
+
+
+class EmbeddingMatcher:
+    """Match resumes with job descriptions using sentence embeddings.
+
+    Each resume is encoded once, when it is stored, and its vector kept in a
+    persisted EmbeddingIndex. Scoring a job encodes only the job description
+    and takes one matrix product with the index, so ranking the same pool
+    again never re-encodes a resume.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL, index_dir: str = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Args:
+            model_name: sentence-transformers model
+            index_dir: Index directory; defaults to one per model under DEFAULT_INDEX_ROOT
+            batch_size: Texts encoded per forward pass
+        """
+        self.model_name = model_name
+        self.batch_size = batch_size
+        index_dir = index_dir or os.path.join(DEFAULT_INDEX_ROOT, re.sub(r'[^\w.-]+', '_', model_name))
+        self.index = EmbeddingIndex(index_dir, model=model_name)
+        self._ivf = None
+        self._ivf_build = None
+        self._ivf_lock = threading.Lock()
+
+    @property
+    def encoder(self):
+        """Shared sentence encoder, loaded on first use"""
+        return get_sentence_encoder(self.model_name)
+
+    @property
+    def ivf(self) -> IVFIndex:
+        """Approximate nearest-neighbor lists over the index, loaded on first use"""
+        if self._ivf is None:
+            self._ivf = IVFIndex(self.index)
+        return self._ivf
+
+    @property
+    def candidate_ids(self) -> np.ndarray:
+        """IDs of the candidates with a vector"""
+        self.index.load()
+        return self.index.ids[self.index.ids >= 0]
+
+    @property
+    def synced_at(self):
+        """Database time the index was last brought up to date, as a string"""
+        return self.index.synced_at
+
+    def encode(self, texts: Iterable[str]) -> np.ndarray:
+        """Encode texts in batches on CPU into unit-length float32 vectors"""
+        texts = [text or "" for text in texts]
+        with metrics.timer('embed'):
+            vectors = self.encoder.encode(texts, batch_size=self.batch_size, convert_to_numpy=True,
+                                          normalize_embeddings=True, show_progress_bar=False)
+        metrics.inc('resume_embeddings_total', len(texts))
+        return np.asarray(vectors, dtype=np.float32)
+
+    def add_documents(self, candidate_ids: Iterable[int], resume_texts: Iterable[str], synced_at=None) -> None:
+        """
+        Encode resumes and store their vectors, replacing earlier ones.
+
+        Args:
+            candidate_ids: Candidate IDs, aligned with resume_texts
+            resume_texts: Resume text for each candidate
+            synced_at: Database time the index is up to date with, if known
+        """
+        ids = list(candidate_ids)
+        texts = list(resume_texts)
+        if len(ids) != len(texts):
+            raise ValueError("candidate_ids and resume_texts must have the same length")
+        vectors = self.encode(texts) if ids else None
+        self.index.upsert(ids, vectors, digests=[text_digest(text) for text in texts], synced_at=synced_at)
+
+    def remove_documents(self, candidate_ids: Iterable[int]) -> None:
+        """Drop candidates from the index"""
+        self.index.remove(candidate_ids)
+
+    def score_job(self, job_description: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score a job description against every indexed candidate.
+
+        Returns:
+            Tuple of (candidate_ids, cosine similarities)
+        """
+        query = self.encode([job_description])[0]
+        with metrics.timer('embedding_score'):
+            return self.index.scores(query)
+
+    def score_candidates(self, job_description: str, candidate_ids: Iterable[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score a job description against some candidates only.
+
+        Returns:
+            Tuple of (candidate_ids, cosine similarities) for the candidates with a vector
+        """
+        query = self.encode([job_description])[0]
+        with metrics.timer('embedding_score'):
+            self.index.load()
+            rows = self.index.rows_of(candidate_ids)
+            return self.index.ids[rows], self.index.score_rows(rows, query)
+
+    def shortlist(self, job_description: str, k: int, nprobe: int = None,
+                  allowed: Optional[Iterable[int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-k candidates for a job from the IVF lists.
+
+        Stale lists are not rebuilt here (see refresh_ivf); search falls
+        back to an exhaustive scan until lists for the current index exist.
+
+        Args:
+            job_description: Job text
+            k: Result size
+            nprobe: Lists probed
+            allowed: Candidate IDs the result is restricted to
+
+        Returns:
+            Tuple of (candidate_ids, cosine similarities), best first
+        """
+        query = self.encode([job_description])[0]
+        if allowed is not None:
+            allowed = np.asarray(list(allowed), dtype=np.int64)
+        with metrics.timer('ann_search'):
+            return self.ivf.search(query, k, nprobe, allowed)
+
+    def refresh_ivf(self, background: bool = True) -> bool:
+        """
+        Rebuild the IVF lists if they are stale.
+
+        Args:
+            background: Build in a daemon thread instead of the caller's
+
+        Returns:
+            bool: True if a rebuild was started (or, without background, done)
+        """
+        with self._ivf_lock:
+            if self._ivf_build is not None and self._ivf_build.is_alive():
+                return False
+            if not self.ivf.needs_rebuild:
+                return False
+            if background:
+                self._ivf_build = threading.Thread(target=self._build_ivf, name='ivf-build', daemon=True)
+                self._ivf_build.start()
+                return True
+        self._build_ivf()
+        return True
+
+    def _build_ivf(self) -> None:
+        with metrics.timer('ann_build'):
+            self.ivf.build()
+
+    def calculate_match_score(self, resume_text: str, job_description: str) -> float:
+        """Cosine similarity of one resume and one job description"""
+        resume_vector, job_vector = self.encode([resume_text, job_description])
+        return float(resume_vector @ job_vector)
+
+    def is_current(self, candidate_id: int, resume_text: str) -> bool:
+        """True if the candidate's vector was computed from this exact text"""
+        return self.index.digest_of(candidate_id) == text_digest(resume_text)
+
+    def missing(self, candidate_ids: Iterable[int]) -> List[int]:
+        """Candidates that have no vector yet"""
+        self.index.load()
+        return self.index.missing(candidate_ids)
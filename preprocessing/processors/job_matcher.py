@@ -1,26 +1,200 @@
+import os
+import pickle
+from typing import Iterable, Optional
+
+import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+# Refit the vocabulary/IDF once documents added since the fit exceed this share of the fitted corpus
+REFIT_RATIO = float(os.environ.get('RESUME_TFIDF_REFIT_RATIO', 0.2))
+
 class JobMatcher:
-    """A class to match resumes with job descriptions using TF-IDF and cosine similarity."""
-    
-    def __init__(self):
+    """A class to match resumes with job descriptions using TF-IDF and cosine similarity.
+
+    The matcher can hold a corpus index: a vectorizer fitted once over every stored
+    resume plus the sparse candidate matrix, so a job is scored against the whole
+    pool with a single sparse matrix-vector product instead of one fit per pair.
+    Documents added later are only transformed, so their unseen terms are
+    dropped; needs_refit() tells when the corpus has grown enough to refit.
+    """
+
+    def __init__(self, index_path: Optional[str] = None):
         self.vectorizer = TfidfVectorizer()
-        
+        self.index_path = index_path
+
+        # Corpus index state
+        self.corpus_vectorizer = None
+        self.candidate_ids = np.empty(0, dtype=np.int64)
+        self.candidate_matrix = None
+        # Corpus size at the last fit and documents transformed into the index since
+        self.fitted_rows = 0
+        self.added_rows = 0
+        # Database time of the last sync, so candidates updated since can be re-indexed
+        self.synced_at = None
+
+    @property
+    def is_fitted(self) -> bool:
+        """Whether a corpus index has been built or loaded."""
+        return self.corpus_vectorizer is not None
+
+    def needs_refit(self, pending: int = 0) -> bool:
+        """
+        Whether the vocabulary/IDF is stale.
+
+        Args:
+            pending: Documents about to be added
+
+        Returns:
+            bool: True if unfitted, or if documents added since the fit
+            (pending included) exceed REFIT_RATIO of the fitted corpus
+        """
+        if not self.is_fitted:
+            return True
+        return self.added_rows + pending > REFIT_RATIO * max(self.fitted_rows, 1)
+
     def calculate_match_score(self, resume_text: str, job_description: str) -> float:
         """
         Calculate the match score between a resume and job description.
-        
+
+        Uses the corpus vocabulary/IDF when an index is fitted, otherwise falls
+        back to fitting on the two documents.
+
         Args:
             resume_text: The text content of the resume
             job_description: The text content of the job description
-            
+
         Returns:
             float: A similarity score between 0 and 1
         """
         # Convert texts to vectors
-        vectors = self.vectorizer.fit_transform([resume_text, job_description])
-        
+        if self.is_fitted:
+            vectors = self.corpus_vectorizer.transform([resume_text or "", job_description or ""])
+        else:
+            vectors = self.vectorizer.fit_transform([resume_text, job_description])
+
         # Calculate cosine similarity
         similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
-        return similarity 
\ No newline at end of file
+        return similarity
+
+    def fit_corpus(self, candidate_ids: Iterable[int], resume_texts: Iterable[str]) -> None:
+        """
+        Fit the vocabulary/IDF once over all resumes and keep the candidate matrix.
+
+        Args:
+            candidate_ids: Candidate IDs, aligned with resume_texts
+            resume_texts: Resume text for each candidate
+        """
+        ids = np.asarray(list(candidate_ids), dtype=np.int64)
+        texts = [text or "" for text in resume_texts]
+        if len(ids) != len(texts):
+            raise ValueError("candidate_ids and resume_texts must have the same length")
+
+        vectorizer = TfidfVectorizer(dtype=np.float32)
+        matrix = vectorizer.fit_transform(texts)
+
+        self.corpus_vectorizer = vectorizer
+        self.candidate_ids = ids
+        self.candidate_matrix = matrix.tocsr()
+        self.fitted_rows = len(ids)
+        self.added_rows = 0
+
+    def add_documents(self, candidate_ids: Iterable[int], resume_texts: Iterable[str]) -> None:
+        """
+        Add or replace candidates in a fitted index without refitting the vocabulary.
+
+        Args:
+            candidate_ids: Candidate IDs, aligned with resume_texts
+            resume_texts: Resume text for each candidate
+        """
+        if not self.is_fitted:
+            self.fit_corpus(candidate_ids, resume_texts)
+            return
+
+        ids = np.asarray(list(candidate_ids), dtype=np.int64)
+        texts = [text or "" for text in resume_texts]
+        if len(ids) == 0:
+            return
+
+        # Replaced candidates are dropped first so each ID appears once
+        self.remove_documents(ids)
+        new_rows = self.corpus_vectorizer.transform(texts)
+        self.candidate_matrix = sparse.vstack([self.candidate_matrix, new_rows], format='csr')
+        self.candidate_ids = np.concatenate([self.candidate_ids, ids])
+        self.added_rows += len(ids)
+
+    def remove_documents(self, candidate_ids: Iterable[int]) -> None:
+        """Drop candidates from the index."""
+        if not self.is_fitted:
+            return
+        keep = ~np.isin(self.candidate_ids, np.asarray(list(candidate_ids), dtype=np.int64))
+        if keep.all():
+            return
+        self.candidate_matrix = self.candidate_matrix[keep]
+        self.candidate_ids = self.candidate_ids[keep]
+
+    def score_job(self, job_description: str) -> np.ndarray:
+        """
+        Score a job description against every indexed candidate.
+
+        Rows of the candidate matrix are L2-normalised by the vectorizer, so the
+        cosine similarity is a plain sparse dot product.
+
+        Args:
+            job_description: The text content of the job description
+
+        Returns:
+            np.ndarray: Similarity scores aligned with self.candidate_ids
+        """
+        if not self.is_fitted or self.candidate_matrix.shape[0] == 0:
+            return np.empty(0, dtype=np.float32)
+
+        job_vector = self.corpus_vectorizer.transform([job_description or ""])
+        scores = self.candidate_matrix @ job_vector.T
+        return np.asarray(scores.todense()).ravel()
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Persist the corpus index to disk."""
+        path = path or self.index_path
+        if not path or not self.is_fitted:
+            return
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Write to a temp file first so readers never see a partial index
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({
+                'vectorizer': self.corpus_vectorizer,
+                'candidate_ids': self.candidate_ids,
+                'candidate_matrix': self.candidate_matrix,
+                'fitted_rows': self.fitted_rows,
+                'added_rows': self.added_rows,
+                'synced_at': self.synced_at
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def load(self, path: Optional[str] = None) -> bool:
+        """
+        Load a persisted corpus index.
+
+        Returns:
+            bool: True if an index was found and loaded
+        """
+        path = path or self.index_path
+        if not path or not os.path.exists(path):
+            return False
+
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        self.corpus_vectorizer = state['vectorizer']
+        self.candidate_ids = state['candidate_ids']
+        self.candidate_matrix = state['candidate_matrix']
+        self.synced_at = state.get('synced_at')
+        # Indexes saved without fit counts were fitted on an unknown share of the corpus; refit them
+        self.fitted_rows = state.get('fitted_rows', 0)
+        self.added_rows = state.get('added_rows', len(self.candidate_ids))
+        return True
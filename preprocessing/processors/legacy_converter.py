@@ -0,0 +1,271 @@
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from typing import Dict, Iterable, Optional
+
+from preprocessing.database.ingest_manifest import file_sha256
+from preprocessing.utils.text_utils import setup_logger
+
+LEGACY_EXTENSIONS = ('.doc', '.rtf')
+
+DEFAULT_CACHE_DIR = os.path.join('src', 'components', 'datafiles', 'converted_cache')
+DEFAULT_WORKERS = int(os.environ.get('RESUME_CONVERTER_WORKERS', 2))
+DEFAULT_TIMEOUT = float(os.environ.get('RESUME_CONVERTER_TIMEOUT', 60))
+
+# External converters tried in order, per extension. {input} and {outdir}
+# are substituted; converters writing to stdout have no {outdir}.
+CONVERTERS = {
+    '.doc': [
+        ('antiword', ['antiword', '-w', '0', '{input}']),
+        ('catdoc', ['catdoc', '-w', '{input}']),
+        ('soffice', ['soffice', '--headless', '--norestore', '-env:UserInstallation=file://{profile}',
+                     '--convert-to', 'txt:Text', '--outdir', '{outdir}', '{input}']),
+    ],
+    '.rtf': [
+        ('unrtf', ['unrtf', '--text', '--nopict', '{input}']),
+        ('soffice', ['soffice', '--headless', '--norestore', '-env:UserInstallation=file://{profile}',
+                     '--convert-to', 'txt:Text', '--outdir', '{outdir}', '{input}']),
+    ]
+}
+
+# RTF destinations whose content is not document text
+_RTF_SKIP_DESTINATIONS = {
+    'fonttbl', 'colortbl', 'stylesheet', 'info', 'pict', 'object', 'header', 'footer',
+    'headerl', 'headerr', 'footerl', 'footerr', 'listtable', 'listoverridetable',
+    'revtbl', 'rsidtbl', 'themedata', 'colorschememapping', 'latentstyles', 'datastore',
+    'xmlnstbl', 'generator', 'filetbl', 'fldinst'
+}
+_RTF_TOKEN = re.compile(r"\\([a-z]{1,32})(-?\d{1,10})? ?|\\'([0-9a-f]{2})|\\([^a-z])|([{}])|[\r\n]+|(.)", re.I | re.S)
+_RTF_CHARS = {'par': '\n', 'line': '\n', 'sect': '\n', 'page': '\n', 'row': '\n',
+              'tab': '\t', 'cell': '\t', 'emdash': '\u2014', 'endash': '\u2013',
+              'lquote': '\u2018', 'rquote': '\u2019', 'ldblquote': '\u201c', 'rdblquote': '\u201d',
+              'bullet': '\u2022'}
+
+
+def rtf_to_text(rtf: str) -> str:
+    """Plain text of an RTF document; used when no external converter is installed"""
+    stack = []
+    skip = False
+    unicode_skip = 1
+    pending_skip = 0
+    out = []
+
+    for match in _RTF_TOKEN.finditer(rtf):
+        word, arg, hex_code, symbol, brace, char = match.groups()
+        if brace == '{':
+            stack.append((skip, unicode_skip))
+        elif brace == '}':
+            if stack:
+                skip, unicode_skip = stack.pop()
+        elif symbol:
+            if symbol == '*':
+                skip = True
+            elif not skip and symbol in '\\{}':
+                out.append(symbol)
+            elif not skip and symbol == '~':
+                out.append('\u00a0')
+        elif word:
+            if word in _RTF_SKIP_DESTINATIONS:
+                skip = True
+            elif word == 'uc':
+                unicode_skip = int(arg or 1)
+            elif word == 'u' and not skip:
+                code = int(arg)
+                out.append(chr(code + 0x10000 if code < 0 else code))
+                pending_skip = unicode_skip
+                continue
+            elif not skip and word in _RTF_CHARS:
+                out.append(_RTF_CHARS[word])
+        elif hex_code:
+            if pending_skip:
+                pending_skip -= 1
+            elif not skip:
+                out.append(bytes([int(hex_code, 16)]).decode('cp1252', errors='replace'))
+            continue
+        elif char and not skip:
+            if pending_skip:
+                pending_skip -= 1
+                continue
+            out.append(char)
+        pending_skip = 0
+
+    return ''.join(out)
+
+
+def convert_file(file_path: str, timeout: float = DEFAULT_TIMEOUT) -> Optional[str]:
+    """
+    Convert one legacy document to plain text.
+
+    Runs the first installed external converter for the file type; each run
+    is killed after timeout seconds. RTF falls back to rtf_to_text.
+
+    Returns:
+        str: Extracted text, or None if nothing could convert the file
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    with open(file_path, 'rb') as file:
+        head = file.read(8)
+    # Legacy extensions are often renamed RTF files
+    if head.startswith(b'{\\rtf'):
+        extension = '.rtf'
+
+    with tempfile.TemporaryDirectory(prefix='resume_convert_') as workdir:
+        for name, command in CONVERTERS.get(extension, []):
+            if shutil.which(command[0]) is None:
+                continue
+            args = [part.format(input=os.path.abspath(file_path), outdir=workdir,
+                                profile=os.path.join(workdir, 'profile')) for part in command]
+            try:
+                result = subprocess.run(args, capture_output=True, timeout=timeout, check=True)
+            except (subprocess.SubprocessError, OSError):
+                continue
+
+            if '{outdir}' in command:
+                output = os.path.join(workdir, os.path.splitext(os.path.basename(file_path))[0] + '.txt')
+                if not os.path.exists(output):
+                    continue
+                with open(output, 'rb') as f:
+                    data = f.read()
+            else:
+                data = result.stdout
+            text = data.decode('utf-8', errors='replace').strip()
+            if text:
+                return text
+
+    if extension == '.rtf':
+        with open(file_path, 'rb') as file:
+            return rtf_to_text(file.read().decode('latin-1')).strip() or None
+    return None
+
+
+class LegacyConverter:
+    """
+    Convert .doc and .rtf resumes to text through a pool of converter processes.
+
+    The pool is long-lived and bounded by max_workers, so a slow conversion
+    never blocks more than one slot. Every conversion is subject to a
+    timeout, and converted text is cached on disk under the SHA-256 of the
+    file content, so unchanged files are never converted twice.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_workers: int = DEFAULT_WORKERS,
+                 timeout: float = DEFAULT_TIMEOUT):
+        """
+        Args:
+            cache_dir: Directory holding converted text
+            max_workers: Converter processes; 0 converts in the calling process
+            timeout: Seconds allowed per conversion
+        """
+        self.logger = setup_logger(__name__)
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._pool = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the converter processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def convert(self, file_path: str) -> Optional[str]:
+        """Return the text of a legacy document, converting it if not cached"""
+        digest = file_sha256(file_path)
+        text = self._cached(digest)
+        if text is not None:
+            return text
+
+        try:
+            if self.max_workers:
+                # The worker's own subprocess timeout normally fires first
+                text = self.pool.submit(convert_file, file_path, self.timeout).result(timeout=self.timeout * 2)
+            else:
+                text = convert_file(file_path, self.timeout)
+        except FutureTimeoutError:
+            self.logger.error(f"Conversion timed out: {file_path}")
+            return None
+        except Exception as e:
+            self.logger.error(f"Conversion failed for {file_path}: {str(e)}")
+            return None
+
+        return self._store(digest, file_path, text)
+
+    def prefetch(self, file_paths: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Convert many legacy documents concurrently and fill the cache.
+
+        Returns:
+            dict mapping each file path to its text (None on failure)
+        """
+        results = {}
+        futures = {}
+        for file_path in file_paths:
+            if not file_path.lower().endswith(LEGACY_EXTENSIONS):
+                continue
+            digest = file_sha256(file_path)
+            text = self._cached(digest)
+            if text is not None or not self.max_workers:
+                results[file_path] = text if text is not None else self.convert(file_path)
+                continue
+            futures[self.pool.submit(convert_file, file_path, self.timeout)] = (file_path, digest)
+
+        for future in as_completed(futures):
+            file_path, digest = futures[future]
+            try:
+                results[file_path] = self._store(digest, file_path, future.result())
+            except Exception as e:
+                self.logger.error(f"Conversion failed for {file_path}: {str(e)}")
+                results[file_path] = None
+
+        if futures:
+            self.logger.info(f"Converted {len(futures)} legacy documents with {self.max_workers} workers")
+        return results
+
+    def _cache_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, f"{digest}.txt")
+
+    def _cached(self, digest: str) -> Optional[str]:
+        try:
+            with open(self._cache_path(digest), encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _store(self, digest: str, file_path: str, text: Optional[str]) -> Optional[str]:
+        """Cache converted text atomically; failures are not cached so they are retried"""
+        if text is None:
+            self.logger.warning(f"No converter could read {file_path}")
+            return None
+        path = self._cache_path(digest)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+        return text
+
+
+_converter: Optional[LegacyConverter] = None
+
+
+def get_legacy_converter() -> LegacyConverter:
+    """Return the process-wide legacy converter"""
+    global _converter
+    if _converter is None:
+        _converter = LegacyConverter()
+    return _converter
@@ -1,3 +1,4 @@
 from preprocessing.utils.text_utils import clean_text, setup_logger
+from preprocessing.utils.model_registry import get_nlp, get_sentence_encoder, model_stats
 
-__all__ = ['clean_text', 'setup_logger'] 
\ No newline at end of file
+__all__ = ['clean_text', 'setup_logger', 'get_nlp', 'get_sentence_encoder', 'model_stats']
@@ -0,0 +1,310 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from preprocessing.utils.text_utils import setup_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of one process are serialized
+    fcntl = None
+
+# Rows converted to float32 per matrix product when scoring
+SCORE_CHUNK_ROWS = 65536
+# Indexes whose float32 copy fits in this many MB are scored from memory
+FLOAT32_CACHE_MB = int(os.environ.get('RESUME_EMBEDDING_CACHE_MB', 512))
+# Compact once this share of the rows are replaced or removed entries
+COMPACT_RATIO = 0.5
+
+
+class EmbeddingIndex:
+    """
+    Unit-normalized float16 vectors keyed by candidate_id, memory-mapped from disk.
+
+    The directory holds the vector file (rows x dim float16, row-major),
+    arrays of the candidate ID and the text digest of each row and meta.json. Rows are only ever
+    appended: a replaced or removed candidate's old row is marked with ID -1,
+    and the files are compacted into a new generation once too many rows are
+    dead. meta.json is written last and names the current generation and row
+    count, so readers always see a consistent index and pick up changes by
+    calling load() again.
+
+    Writers in several processes are serialized with a lock file.
+    """
+
+    def __init__(self, directory: str, model: Optional[str] = None):
+        """
+        Args:
+            directory: Index directory, created on first write
+            model: Name of the model the vectors come from, recorded in meta.json
+        """
+        self.logger = setup_logger(__name__)
+        self.directory = directory
+        self.model = model
+        self.dim = None
+        self.ids = np.empty(0, dtype=np.int64)
+        self.digests = np.empty(0, dtype=np.int64)
+        self.vectors = np.empty((0, 0), dtype=np.float16)
+        self.synced_at = None
+        self._rows = {}
+        self._float32 = None
+        self._version = None
+        self._generation = 0
+        self._lock = threading.RLock()
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, candidate_id: int) -> bool:
+        return int(candidate_id) in self._rows
+
+    @property
+    def generation(self) -> int:
+        """Generation of the files in use; row numbers change when it does"""
+        return self._generation
+
+    @property
+    def nbytes(self) -> int:
+        return self.vectors.nbytes + self.ids.nbytes
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _vector_path(self, generation: int) -> str:
+        return self._path(f"vectors.{generation}.f16")
+
+    def _ids_path(self, generation: int) -> str:
+        return self._path(f"ids.{generation}.npy")
+
+    def _digests_path(self, generation: int) -> str:
+        return self._path(f"digests.{generation}.npy")
+
+    def load(self) -> bool:
+        """
+        (Re)load the index if it changed since the last load.
+
+        Only meta.json is read when nothing changed.
+
+        Returns:
+            bool: True if an index exists on disk
+        """
+        try:
+            with open(self._path('meta.json')) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return False
+
+        with self._lock:
+            if meta['version'] == self._version:
+                return True
+            if self.model and meta.get('model') and meta['model'] != self.model:
+                raise ValueError(f"Index in {self.directory} was built with {meta['model']}, not {self.model}")
+
+            rows, dim, generation = meta['rows'], meta['dim'], meta['generation']
+            # The ID and digest files may already hold rows appended after this meta.json
+            ids = np.load(self._ids_path(generation))[:rows]
+            digests = np.load(self._digests_path(generation))[:rows]
+            if rows:
+                vectors = np.memmap(self._vector_path(generation), dtype=np.float16, mode='r', shape=(rows, dim))
+            else:
+                vectors = np.empty((0, dim), dtype=np.float16)
+
+            live = np.flatnonzero(ids >= 0)
+            self.ids, self.digests, self.vectors, self.dim = ids, digests, vectors, dim
+            self._float32 = None
+            self._rows = dict(zip(ids[live].tolist(), live.tolist()))
+            self._generation = generation
+            self.synced_at = meta.get('synced_at')
+            self._version = meta['version']
+        return True
+
+    def missing(self, candidate_ids: Iterable[int]) -> List[int]:
+        """Candidates without a vector"""
+        return [int(cid) for cid in candidate_ids if int(cid) not in self._rows]
+
+    def rows_of(self, candidate_ids: Iterable[int]) -> np.ndarray:
+        """Rows of the given candidates; ones without a vector are skipped"""
+        rows = (self._rows.get(int(cid)) for cid in candidate_ids)
+        return np.fromiter((row for row in rows if row is not None), dtype=np.int64)
+
+    def digest_of(self, candidate_id: int) -> Optional[int]:
+        """Digest of the text a candidate's vector was computed from, None if not indexed"""
+        row = self._rows.get(int(candidate_id))
+        return None if row is None else int(self.digests[row])
+
+    def vectors_of(self, candidate_ids: Iterable[int]) -> np.ndarray:
+        """float32 vectors of the given candidates; zero rows for unknown ones"""
+        candidate_ids = list(candidate_ids)
+        result = np.zeros((len(candidate_ids), self.dim or 0), dtype=np.float32)
+        for position, cid in enumerate(candidate_ids):
+            row = self._rows.get(int(cid))
+            if row is not None:
+                result[position] = self.vectors[row]
+        return result
+
+    def scores(self, query: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Dot product of a unit query vector with every live vector.
+
+        float16 has no BLAS kernel. A float32 copy is kept in memory when it
+        fits in FLOAT32_CACHE_MB, making scoring a single matrix-vector
+        product; larger indexes are converted and multiplied in chunks.
+
+        Returns:
+            Tuple of (candidate_ids, scores)
+        """
+        self.load()
+        with self._lock:
+            ids, vectors, dense = self.ids, self.vectors, self._float32
+            if dense is None and vectors.size * 4 <= FLOAT32_CACHE_MB * 1024 * 1024:
+                dense = self._float32 = np.asarray(vectors, dtype=np.float32)
+
+        query = np.asarray(query, dtype=np.float32).ravel()
+        if dense is not None:
+            scores = dense @ query
+        else:
+            scores = np.empty(len(ids), dtype=np.float32)
+            for start in range(0, len(ids), SCORE_CHUNK_ROWS):
+                chunk = np.asarray(vectors[start:start + SCORE_CHUNK_ROWS], dtype=np.float32)
+                scores[start:start + len(chunk)] = chunk @ query
+        live = ids >= 0
+        return ids[live], scores[live]
+
+    def score_rows(self, rows: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """
+        Dot product of a unit query vector with the given rows (dead rows included).
+
+        Rows are read in ascending order so memory-mapped reads stay sequential.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        query = np.asarray(query, dtype=np.float32).ravel()
+        dense = self._float32
+        if dense is not None and len(dense) == len(self.ids):
+            return dense[rows] @ query
+        order = np.argsort(rows, kind='stable')
+        scores = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), SCORE_CHUNK_ROWS):
+            chunk = order[start:start + SCORE_CHUNK_ROWS]
+            scores[chunk] = np.asarray(self.vectors[rows[chunk]], dtype=np.float32) @ query
+        return scores
+
+    def upsert(self, candidate_ids: Iterable[int], vectors: np.ndarray, digests: Optional[Iterable[int]] = None,
+               synced_at=None) -> None:
+        """
+        Store vectors for candidates, replacing any they had.
+
+        Args:
+            candidate_ids: Candidate IDs, aligned with the rows of vectors
+            vectors: Unit-normalized vectors
+            digests: Digest of each vector's source text, so unchanged text
+                need not be encoded again; 0 means unknown
+            synced_at: If given, recorded as the time the index was last
+                brought up to date with the database
+        """
+        ids = np.asarray(list(candidate_ids), dtype=np.int64)
+        digests = np.zeros(len(ids), dtype=np.int64) if digests is None else np.asarray(list(digests), dtype=np.int64)
+        if len(ids) == 0:
+            if synced_at is None:
+                return
+            vectors = np.empty((0, self.dim or 0), dtype=np.float16)
+        else:
+            vectors = np.asarray(vectors, dtype=np.float16).reshape(len(ids), -1)
+
+        with self._write_lock():
+            dim = self.dim or vectors.shape[1]
+            if len(ids) and vectors.shape[1] != dim:
+                raise ValueError(f"Vectors have dimension {vectors.shape[1]}, index has {dim}")
+
+            # Keep the last vector given for a duplicated ID
+            _, last = np.unique(ids[::-1], return_index=True)
+            keep = np.sort(len(ids) - 1 - last)
+            ids, vectors, digests = ids[keep], vectors[keep], digests[keep]
+
+            all_ids = self.ids.copy()
+            self._tombstone(all_ids, ids)
+            with open(self._vector_path(self._generation), 'ab') as f:
+                # Drop bytes a crashed writer may have appended past the last committed row
+                f.truncate(len(all_ids) * dim * 2)
+                f.write(np.ascontiguousarray(vectors).tobytes())
+            all_ids = np.concatenate([all_ids, ids])
+            self._commit(all_ids, np.concatenate([self.digests, digests]), dim, synced_at)
+
+    def remove(self, candidate_ids: Iterable[int]) -> None:
+        """Drop candidates from the index"""
+        with self._write_lock():
+            all_ids = self.ids.copy()
+            if self._tombstone(all_ids, np.asarray(list(candidate_ids), dtype=np.int64)):
+                self._commit(all_ids, self.digests, self.dim, None)
+
+    def _tombstone(self, all_ids: np.ndarray, candidate_ids: np.ndarray) -> int:
+        rows = [self._rows[cid] for cid in candidate_ids.tolist() if cid in self._rows]
+        all_ids[rows] = -1
+        return len(rows)
+
+    def _commit(self, all_ids: np.ndarray, digests: np.ndarray, dim: int, synced_at) -> None:
+        """Write the ID and digest arrays and meta.json for the current generation, compacting if worthwhile"""
+        previous = generation = self._generation
+        dead = int((all_ids < 0).sum())
+        if dead and dead >= COMPACT_RATIO * len(all_ids):
+            generation = self._compact(all_ids, dim)
+            digests = digests[all_ids >= 0]
+            all_ids = all_ids[all_ids >= 0]
+
+        self._write_atomic(self._ids_path(generation), lambda f: np.save(f, all_ids))
+        self._write_atomic(self._digests_path(generation), lambda f: np.save(f, digests))
+        meta = {
+            'model': self.model,
+            'dim': dim,
+            'rows': len(all_ids),
+            'generation': generation,
+            'version': (self._version or 0) + 1,
+            'synced_at': str(synced_at) if synced_at is not None else self.synced_at
+        }
+        self._write_atomic(self._path('meta.json'), lambda f: f.write(json.dumps(meta).encode('utf-8')))
+        self.load()
+
+        if generation != previous:
+            for old in (self._vector_path(previous), self._ids_path(previous), self._digests_path(previous)):
+                try:
+                    os.remove(old)
+                except OSError:
+                    # Still mapped by a reader on Windows; the next compaction retries
+                    pass
+
+    def _compact(self, all_ids: np.ndarray, dim: int) -> int:
+        """Copy live rows into the next generation's vector file"""
+        generation = self._generation + 1
+        live = np.flatnonzero(all_ids >= 0)
+        source = np.memmap(self._vector_path(self._generation), dtype=np.float16, mode='r',
+                           shape=(len(all_ids), dim)) if len(all_ids) else None
+        with open(self._vector_path(generation), 'wb') as f:
+            for start in range(0, len(live), SCORE_CHUNK_ROWS):
+                f.write(np.ascontiguousarray(source[live[start:start + SCORE_CHUNK_ROWS]]).tobytes())
+        self.logger.info(f"Compacted embedding index: {len(all_ids)} -> {len(live)} rows")
+        return generation
+
+    @staticmethod
+    def _write_atomic(path: str, write) -> None:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+
+    @contextmanager
+    def _write_lock(self):
+        """Serialize writers across threads and processes, starting from the latest state"""
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock, open(self._path('index.lock'), 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self.load()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
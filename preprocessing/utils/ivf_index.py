@@ -0,0 +1,230 @@
+import os
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+
+from preprocessing.utils.embedding_index import SCORE_CHUNK_ROWS, EmbeddingIndex
+from preprocessing.utils.text_utils import setup_logger
+
+# Average rows per inverted list; a query scores about nprobe lists, so its
+# cost stays roughly constant as the index grows
+ROWS_PER_LIST = int(os.environ.get('RESUME_ANN_ROWS_PER_LIST', 1024))
+# Lists probed per query; the recall/latency knob
+DEFAULT_NPROBE = int(os.environ.get('RESUME_ANN_NPROBE', 16))
+# Training rows per centroid for k-means (capped by MAX_TRAIN_ROWS)
+TRAIN_ROWS_PER_LIST = 32
+MAX_TRAIN_ROWS = 262144
+KMEANS_ITERATIONS = 10
+# Rebuild once rows appended since the build exceed this share of the built rows
+REBUILD_RATIO = 0.2
+
+
+class IVFIndex:
+    """
+    Inverted-file approximate nearest-neighbor search over an EmbeddingIndex.
+
+    Vectors are clustered with spherical k-means; each row is listed under
+    its nearest centroid. A query scores the centroids, then scores exactly
+    the rows of the nprobe closest lists, plus any rows appended to the
+    embedding index since the build. Raising nprobe trades latency for
+    recall; recall() measures it against exhaustive search.
+
+    Lists hold row numbers of the embedding index, so they stay valid while
+    that index only appends and tombstones rows. A compaction renumbers
+    rows and makes the lists stale until build() runs again.
+    """
+
+    def __init__(self, index: EmbeddingIndex, path: Optional[str] = None, nprobe: int = DEFAULT_NPROBE):
+        """
+        Args:
+            index: Embedding index to search
+            path: File the lists are saved to; defaults to ivf.npz in the index directory
+            nprobe: Lists scored per query
+        """
+        self.logger = setup_logger(__name__)
+        self.index = index
+        self.path = path or os.path.join(index.directory, 'ivf.npz')
+        self.nprobe = nprobe
+        self.centroids = None
+        self.rows = None
+        self.offsets = None
+        self.generation = None
+        self.built_rows = 0
+        # _lock guards the lists while they are swapped; _build_lock serializes builds
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self.load()
+
+    @property
+    def n_lists(self) -> int:
+        return 0 if self.centroids is None else len(self.centroids)
+
+    def load(self) -> bool:
+        """Load saved lists; returns False if none exist"""
+        try:
+            with np.load(self.path) as data, self._lock:
+                self.centroids = data['centroids']
+                self.rows = data['rows']
+                self.offsets = data['offsets']
+                self.generation = int(data['generation'])
+                self.built_rows = int(data['built_rows'])
+        except FileNotFoundError:
+            return False
+        return True
+
+    def save(self) -> None:
+        def write(f):
+            np.savez(f, centroids=self.centroids, rows=self.rows, offsets=self.offsets,
+                     generation=self.generation, built_rows=self.built_rows)
+        EmbeddingIndex._write_atomic(self.path, write)
+
+    @property
+    def needs_rebuild(self) -> bool:
+        """True if the lists are missing, refer to an old generation or miss too many appended rows"""
+        self.index.load()
+        lists = self._lists()
+        if lists is None:
+            return True
+        built_rows = lists[3]
+        return len(self.index.ids) - built_rows > REBUILD_RATIO * max(built_rows, 1)
+
+    def build(self, n_lists: Optional[int] = None, seed: int = 0) -> None:
+        """
+        Cluster the live vectors and assign every row to a list, then save.
+
+        Searches keep using the previous lists until the new ones are
+        swapped in, so build() can run in a background thread.
+
+        Args:
+            n_lists: Number of lists; defaults to one per ROWS_PER_LIST live rows
+            seed: Seed for training sample and initial centroids
+        """
+        self.index.load()
+        with self._build_lock:
+            ids, vectors, generation = self.index.ids, self.index.vectors, self.index.generation
+            live = np.flatnonzero(ids >= 0)
+            n_lists = max(1, min(n_lists or len(live) // ROWS_PER_LIST, len(live)))
+
+            rng = np.random.default_rng(seed)
+            sample_size = min(len(live), max(n_lists * TRAIN_ROWS_PER_LIST, n_lists), MAX_TRAIN_ROWS)
+            sample = np.sort(rng.choice(live, size=sample_size, replace=False))
+            centroids = self._kmeans(np.asarray(vectors[sample], dtype=np.float32), n_lists, rng)
+
+            assignments = np.empty(len(live), dtype=np.int32)
+            for start in range(0, len(live), SCORE_CHUNK_ROWS):
+                chunk = np.asarray(vectors[live[start:start + SCORE_CHUNK_ROWS]], dtype=np.float32)
+                assignments[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+
+            order = np.argsort(assignments, kind='stable')
+            offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=n_lists))])
+            with self._lock:
+                self.centroids = centroids
+                self.rows = live[order]
+                self.offsets = offsets
+                self.generation = generation
+                self.built_rows = len(ids)
+                self.save()
+        self.logger.info(f"Built IVF index: {len(live)} rows in {n_lists} lists")
+
+    @staticmethod
+    def _kmeans(sample: np.ndarray, n_lists: int, rng) -> np.ndarray:
+        """Spherical k-means: centroids are unit vectors, assignment by dot product"""
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty lists keep their previous centroid
+            filled = norms[:, 0] > 0
+            centroids[filled] = sums[filled] / norms[filled]
+        return centroids
+
+    def _lists(self) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, int]]:
+        """(centroids, rows, offsets, built_rows) if lists exist for the index's generation"""
+        with self._lock:
+            if self.centroids is None or self.generation != self.index.generation:
+                return None
+            return self.centroids, self.rows, self.offsets, self.built_rows
+
+    def candidate_rows(self, query: np.ndarray, nprobe: Optional[int] = None, lists=None) -> np.ndarray:
+        """Rows of the nprobe closest lists plus rows appended since the build, dead rows removed"""
+        centroids, list_rows, offsets, built_rows = lists or self._lists()
+        nprobe = min(nprobe or self.nprobe, len(centroids))
+        centroid_scores = centroids @ query
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        parts = [list_rows[offsets[l]:offsets[l + 1]] for l in probe]
+        parts.append(np.arange(built_rows, len(self.index.ids), dtype=np.int64))
+        rows = np.concatenate(parts)
+        return rows[self.index.ids[rows] >= 0]
+
+    def search(self, query: np.ndarray, k: int, nprobe: Optional[int] = None,
+               allowed: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-k candidates for a unit query vector, with exact scores.
+
+        Falls back to exhaustive search while no lists are built for the
+        index's current generation. With allowed, only those candidates are
+        returned. nprobe is scaled up by the inverse share of allowed rows,
+        so about as many allowed rows are scored as an unfiltered search
+        scores rows, then doubled while the probed lists hold fewer than k.
+
+        Args:
+            query: Unit query vector
+            k: Result size
+            nprobe: Lists probed; defaults to self.nprobe
+            allowed: Candidate IDs the result is restricted to
+
+        Returns:
+            Tuple of (candidate_ids, scores), best first
+        """
+        query = np.asarray(query, dtype=np.float32).ravel()
+        self.index.load()
+        lists = self._lists()
+        if lists is None:
+            candidate_ids, scores = self.index.scores(query)
+            if allowed is not None:
+                keep = np.isin(candidate_ids, allowed)
+                candidate_ids, scores = candidate_ids[keep], scores[keep]
+        else:
+            nprobe = nprobe or self.nprobe
+            if allowed is not None:
+                live = max(len(self.index), 1)
+                nprobe = int(np.ceil(nprobe * live / max(len(allowed), 1)))
+            nprobe = min(nprobe, len(lists[0]))
+            while True:
+                rows = self.candidate_rows(query, nprobe, lists)
+                if allowed is not None:
+                    rows = rows[np.isin(self.index.ids[rows], allowed)]
+                if allowed is None or len(rows) >= k or nprobe >= len(lists[0]):
+                    break
+                nprobe = min(nprobe * 2, len(lists[0]))
+            candidate_ids, scores = self.index.ids[rows], self.index.score_rows(rows, query)
+
+        if k < len(scores):
+            best = np.argpartition(-scores, k - 1)[:k]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return candidate_ids[best], scores[best]
+
+    def recall(self, queries: np.ndarray, k: int, nprobe: Optional[int] = None) -> float:
+        """
+        Mean share of the exhaustive top-k that search() also returns.
+
+        Args:
+            queries: Unit query vectors, one per row
+            k: Result size compared
+            nprobe: Lists probed; defaults to self.nprobe
+        """
+        hits = []
+        for query in np.atleast_2d(queries):
+            exact_ids, exact_scores = self.index.scores(query)
+            top = min(k, len(exact_scores))
+            if top == 0:
+                continue
+            expected = exact_ids[np.argpartition(-exact_scores, top - 1)[:top]]
+            found, _ = self.search(query, k, nprobe)
+            hits.append(len(np.intersect1d(expected, found)) / top)
+        return float(np.mean(hits)) if hits else 1.0
@@ -0,0 +1,240 @@
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds in seconds; covers a fast regex pass up to a slow scanned PDF
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Directory where worker processes dump their metrics for aggregation
+DEFAULT_METRICS_DIR = os.environ.get('RESUME_METRICS_DIR', os.path.join('src', 'components', 'datafiles', 'metrics'))
+
+STAGE_SECONDS = 'resume_stage_seconds'
+STAGE_ERRORS = 'resume_stage_errors_total'
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in pairs) + '}'
+
+
+class MetricsRegistry:
+    """
+    In-process counters and latency histograms.
+
+    Recording is a dict lookup and a few additions under one lock, cheap
+    enough for per-file and per-stage use on the ingest hot path. Metrics are
+    keyed by name plus labels (e.g. stage='extract'). A registry can be
+    snapshotted to a plain dict, merged with snapshots from other processes,
+    and rendered in the Prometheus text format.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        # name -> labels -> [bucket counts..., +Inf count, sum]
+        self._histograms: Dict[str, Dict[Labels, List[float]]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """Add value to a counter"""
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Record one observation in a histogram"""
+        key = _labels(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            counts = series.get(key)
+            if counts is None:
+                counts = series[key] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    @contextmanager
+    def timer(self, stage: str, **labels) -> Iterator[None]:
+        """Time a pipeline stage; exceptions are counted as stage errors and re-raised"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc(STAGE_ERRORS, stage=stage, **labels)
+            raise
+        finally:
+            self.observe(STAGE_SECONDS, time.perf_counter() - start, stage=stage, **labels)
+
+    def snapshot(self) -> dict:
+        """All metrics as a JSON-serializable dict"""
+        with self._lock:
+            return {
+                'buckets': list(self.buckets),
+                'counters': {
+                    name: [[dict(key), value] for key, value in series.items()]
+                    for name, series in self._counters.items()
+                },
+                'histograms': {
+                    name: [[dict(key), list(counts)] for key, counts in series.items()]
+                    for name, series in self._histograms.items()
+                }
+            }
+
+    def merge(self, snapshot: dict) -> None:
+        """Add a snapshot (e.g. from a worker process) into this registry"""
+        if tuple(snapshot.get('buckets', self.buckets)) != self.buckets:
+            raise ValueError("Cannot merge histograms with different buckets")
+        with self._lock:
+            for name, series in snapshot.get('counters', {}).items():
+                target = self._counters.setdefault(name, {})
+                for labels, value in series:
+                    key = _labels(labels)
+                    target[key] = target.get(key, 0) + value
+            for name, series in snapshot.get('histograms', {}).items():
+                target = self._histograms.setdefault(name, {})
+                for labels, counts in series:
+                    key = _labels(labels)
+                    current = target.setdefault(key, [0] * len(counts))
+                    for index, count in enumerate(counts):
+                        current[index] += count
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in series.items():
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, counts in series.items():
+                    cumulative = 0
+                    for bound, count in zip(self.buckets, counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {cumulative:g}")
+                    cumulative += counts[-2]
+                    lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {cumulative:g}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {counts[-1]:.6f}")
+                    lines.append(f"{name}_count{_format_labels(key)} {cumulative:g}")
+        return '\n'.join(lines) + '\n'
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage count, total and mean seconds and errors (other labels summed), for logs and reports"""
+        stages = {}
+        with self._lock:
+            for key, counts in self._histograms.get(STAGE_SECONDS, {}).items():
+                stats = stages.setdefault(dict(key).get('stage', ''), {'count': 0, 'seconds': 0.0, 'errors': 0})
+                stats['count'] += sum(counts[:-1])
+                stats['seconds'] += counts[-1]
+                stats['errors'] += self._counters.get(STAGE_ERRORS, {}).get(key, 0)
+        for stats in stages.values():
+            stats['mean_ms'] = 1000 * stats['seconds'] / stats['count'] if stats['count'] else 0.0
+        return stages
+
+
+# Process-wide registry used by the ingest pipeline
+metrics = MetricsRegistry()
+
+
+def dump_json(path: str, registry: MetricsRegistry = metrics) -> None:
+    """Write a registry snapshot atomically, so readers never see a partial file"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(registry.snapshot(), f)
+    os.replace(tmp_path, path)
+
+
+def load_merged(metrics_dir: str = DEFAULT_METRICS_DIR, registry: Optional[MetricsRegistry] = None) -> MetricsRegistry:
+    """Merge every JSON dump in a directory (one per worker) into one registry"""
+    merged = MetricsRegistry()
+    if registry is not None:
+        merged.merge(registry.snapshot())
+    for path in glob.glob(os.path.join(metrics_dir, '*.json')):
+        try:
+            with open(path) as f:
+                merged.merge(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return merged
+
+
+class PeriodicDump:
+    """Dump a registry to a JSON file every interval seconds from a daemon thread"""
+
+    def __init__(self, path: str, interval: float = 10.0, registry: MetricsRegistry = metrics):
+        self.path = path
+        self.interval = interval
+        self.registry = registry
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='metrics-dump', daemon=True)
+
+    def start(self) -> 'PeriodicDump':
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop and write a final dump"""
+        self._stop.set()
+        self._thread.join()
+        dump_json(self.path, self.registry)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            dump_json(self.path, self.registry)
+
+
+def start_http_server(port: int, metrics_dir: Optional[str] = None,
+                      registry: MetricsRegistry = metrics) -> ThreadingHTTPServer:
+    """
+    Serve /metrics (Prometheus text) and /metrics.json from a daemon thread.
+
+    With metrics_dir, worker dumps in that directory are merged into the
+    local registry on every request.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            source = load_merged(metrics_dir, registry) if metrics_dir else registry
+            if self.path == '/metrics':
+                body, content_type = source.render_prometheus(), 'text/plain; version=0.0.4'
+            elif self.path == '/metrics.json':
+                body, content_type = json.dumps(source.snapshot()), 'application/json'
+            else:
+                self.send_error(404)
+                return
+            data = body.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('', port), Handler)
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from preprocessing.utils.text_utils import setup_logger
+
+DEFAULT_SPACY_MODEL = 'en_core_web_lg'
+# Small sentence-transformers model; fast enough to encode resumes on CPU
+DEFAULT_EMBEDDING_MODEL = os.environ.get('RESUME_EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
+
+# Components none of the processors use; skipping them saves load time and memory
+DEFAULT_EXCLUDE = ('lemmatizer',)
+
+logger = setup_logger(__name__)
+
+_lock = threading.Lock()
+_models: Dict[Tuple[str, Tuple[str, ...]], object] = {}
+_vocabs: Dict[str, object] = {}
+_load_stats: Dict[str, dict] = {}
+
+
+def _current_rss_mb() -> Optional[float]:
+    """Return the resident set size of this process in MB, if it can be determined"""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def get_nlp(name: str = DEFAULT_SPACY_MODEL, exclude: Optional[Iterable[str]] = None):
+    """
+    Return a process-wide spaCy pipeline, loading it on first use.
+
+    Pipelines requested with different component sets are cached separately
+    but share the same vocab, so the large vector table is only held once.
+
+    Args:
+        name: spaCy model package name
+        exclude: Pipeline components to leave out (defaults to DEFAULT_EXCLUDE)
+
+    Returns:
+        spacy.language.Language: The shared pipeline
+    """
+    exclude = tuple(sorted(DEFAULT_EXCLUDE if exclude is None else exclude))
+    key = (name, exclude)
+
+    nlp = _models.get(key)
+    if nlp is not None:
+        return nlp
+
+    with _lock:
+        # Another thread may have finished loading while we waited
+        nlp = _models.get(key)
+        if nlp is not None:
+            return nlp
+
+        import spacy
+
+        rss_before = _current_rss_mb()
+        start = time.perf_counter()
+        vocab = _vocabs.get(name, True)
+        nlp = spacy.load(name, vocab=vocab, exclude=list(exclude))
+        elapsed = time.perf_counter() - start
+        rss_after = _current_rss_mb()
+
+        _vocabs.setdefault(name, nlp.vocab)
+        _models[key] = nlp
+
+        stats = {
+            'model': name,
+            'exclude': list(exclude),
+            'pipeline': list(nlp.pipe_names),
+            'load_seconds': round(elapsed, 3),
+            'rss_before_mb': round(rss_before, 1) if rss_before is not None else None,
+            'rss_after_mb': round(rss_after, 1) if rss_after is not None else None
+        }
+        _load_stats[f"{name}[{','.join(exclude)}]"] = stats
+        logger.info(
+            f"Loaded spaCy model {name} (pipeline: {', '.join(nlp.pipe_names)}) "
+            f"in {elapsed:.2f}s, RSS {stats['rss_before_mb']} -> {stats['rss_after_mb']} MB"
+        )
+        return nlp
+
+
+def get_sentence_encoder(name: str = DEFAULT_EMBEDDING_MODEL):
+    """
+    Return a process-wide sentence-transformers model on CPU, loading it on first use.
+
+    Args:
+        name: sentence-transformers model name or local path
+
+    Returns:
+        sentence_transformers.SentenceTransformer: The shared model
+    """
+    key = (name, ('sentence-transformers',))
+    encoder = _models.get(key)
+    if encoder is not None:
+        return encoder
+
+    with _lock:
+        encoder = _models.get(key)
+        if encoder is not None:
+            return encoder
+
+        from sentence_transformers import SentenceTransformer
+
+        rss_before = _current_rss_mb()
+        start = time.perf_counter()
+        encoder = SentenceTransformer(name, device='cpu')
+        elapsed = time.perf_counter() - start
+        rss_after = _current_rss_mb()
+        _models[key] = encoder
+
+        _load_stats[name] = {
+            'model': name,
+            'dimension': encoder.get_sentence_embedding_dimension(),
+            'load_seconds': round(elapsed, 3),
+            'rss_before_mb': round(rss_before, 1) if rss_before is not None else None,
+            'rss_after_mb': round(rss_after, 1) if rss_after is not None else None
+        }
+        logger.info(f"Loaded sentence encoder {name} in {elapsed:.2f}s")
+        return encoder
+
+
+def model_stats() -> Dict[str, dict]:
+    """Return load time and memory figures for every model loaded so far"""
+    stats = {key: dict(value) for key, value in _load_stats.items()}
+    rss = _current_rss_mb()
+    stats['process'] = {'rss_mb': round(rss, 1) if rss is not None else None}
+    return stats
+
+
+def clear_models() -> None:
+    """Drop all cached models (mainly useful in long-lived workers and tests)"""
+    with _lock:
+        _models.clear()
+        _vocabs.clear()
+        _load_stats.clear()
@@ -0,0 +1,66 @@
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from preprocessing.utils.skill_matcher import SkillMatcher, get_skill_matcher
+
+# Defaults for batched inference; tuned for CPU-only ingest boxes
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_N_PROCESS = 1
+
+ENTITY_LABELS = ('PERSON', 'ORG', 'DATE', 'CGPA', 'TECH')
+
+
+def doc_features(doc, skill_matcher: Optional[SkillMatcher] = None) -> dict:
+    """
+    Extract entities and noun-chunk skills from a processed spaCy Doc
+
+    Args:
+        doc: A spaCy Doc
+        skill_matcher: Matcher used to decide whether a noun chunk is a skill
+            (defaults to the shared skill matcher)
+
+    Returns:
+        dict: 'entities' grouped by label and de-duplicated 'skills'
+    """
+    skill_matcher = skill_matcher or get_skill_matcher()
+
+    entities = {label: [] for label in ENTITY_LABELS}
+    for ent in doc.ents:
+        if ent.label_ in entities:
+            entities[ent.label_].append(ent.text)
+
+    skills = [chunk.text for chunk in doc.noun_chunks if skill_matcher.search(chunk.text)]
+
+    return {
+        'entities': entities,
+        'skills': list(set(skills))
+    }
+
+
+def pipe_docs(nlp, texts: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE,
+              n_process: int = DEFAULT_N_PROCESS) -> Iterator[Tuple[str, object]]:
+    """
+    Run texts through nlp.pipe, yielding (text, doc) pairs in input order
+
+    Args:
+        nlp: A spaCy Language pipeline
+        texts: Texts to process
+        batch_size: Number of texts buffered per batch
+        n_process: Number of processes spaCy should use
+
+    Returns:
+        Iterator of (text, doc) tuples
+    """
+    pairs = ((text, text) for text in texts)
+    for doc, text in nlp.pipe(pairs, as_tuples=True, batch_size=batch_size, n_process=n_process):
+        yield text, doc
+
+
+def chunked(items: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,308 @@
+import importlib
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from preprocessing.models.patterns import SECTION_PATTERNS
+from preprocessing.utils.metrics import metrics
+from preprocessing.utils.text_utils import setup_logger
+
+# Extraction limits; each can be overridden per call or through the environment
+DEFAULT_MAX_PAGES = int(os.environ.get('RESUME_PDF_MAX_PAGES', 20))
+DEFAULT_MAX_CHARS = int(os.environ.get('RESUME_PDF_MAX_CHARS', 200000))
+DEFAULT_TIME_BUDGET = float(os.environ.get('RESUME_PDF_TIME_BUDGET', 15.0))
+
+# Comma separated SECTION_PATTERNS names (or 'all'); once all their headings are
+# seen, stop_at_sections() ends extraction a page later. Empty reads every page
+DEFAULT_STOP_SECTIONS = os.environ.get('RESUME_PDF_STOP_SECTIONS', '')
+
+# Backends tried in order; later ones are fallbacks
+DEFAULT_BACKENDS = os.environ.get('RESUME_PDF_BACKENDS', 'pymupdf,pdfminer,pypdf2')
+
+logger = setup_logger(__name__)
+
+
+class PdfBackend:
+    """
+    A PDF text extraction library.
+
+    Subclasses set name and modules (importable names, first one found is
+    used) and implement open().
+    """
+
+    name = ''
+    modules: Tuple[str, ...] = ()
+
+    def available(self) -> bool:
+        """Whether the backing library is installed"""
+        return self._import() is not None
+
+    def _import(self):
+        for module in self.modules:
+            try:
+                return importlib.import_module(module)
+            except ImportError:
+                continue
+        return None
+
+    @contextmanager
+    def open(self, file_path: str) -> Iterator[Tuple[int, Iterator[str]]]:
+        """Yield (page count, lazy iterator of page texts) for a PDF"""
+        raise NotImplementedError
+
+
+class PyMuPDFBackend(PdfBackend):
+    """PyMuPDF (MuPDF bindings), by far the fastest"""
+
+    name = 'pymupdf'
+    modules = ('pymupdf', 'fitz')
+
+    @contextmanager
+    def open(self, file_path: str):
+        pymupdf = self._import()
+        with pymupdf.open(file_path) as doc:
+            yield doc.page_count, (page.get_text() for page in doc)
+
+
+class PdfMinerBackend(PdfBackend):
+    """pdfminer.six, pure Python with careful layout analysis"""
+
+    name = 'pdfminer'
+    modules = ('pdfminer.high_level',)
+
+    @contextmanager
+    def open(self, file_path: str):
+        high_level = self._import()
+        from pdfminer.layout import LTTextContainer
+        from pdfminer.pdfpage import PDFPage
+
+        with open(file_path, 'rb') as file:
+            page_count = sum(1 for _ in PDFPage.get_pages(file))
+            file.seek(0)
+            yield page_count, (
+                ''.join(element.get_text() for element in page if isinstance(element, LTTextContainer))
+                for page in high_level.extract_pages(file)
+            )
+
+
+class PyPDF2Backend(PdfBackend):
+    """PyPDF2, pure Python"""
+
+    name = 'pypdf2'
+    modules = ('PyPDF2',)
+
+    @contextmanager
+    def open(self, file_path: str):
+        PyPDF2 = self._import()
+        with open(file_path, 'rb') as file:
+            reader = PyPDF2.PdfReader(file)
+            yield len(reader.pages), (page.extract_text() or '' for page in reader.pages)
+
+
+_lock = threading.Lock()
+_backends: Dict[str, PdfBackend] = {}
+_stats: Dict[str, Dict[str, float]] = {}
+
+
+def register_backend(backend: PdfBackend) -> None:
+    """Make a backend selectable by its name"""
+    with _lock:
+        _backends[backend.name] = backend
+        _stats.setdefault(backend.name, {'files': 0, 'pages': 0, 'seconds': 0.0, 'failures': 0})
+
+
+for _backend in (PyMuPDFBackend(), PdfMinerBackend(), PyPDF2Backend()):
+    register_backend(_backend)
+
+
+def set_default_backends(names: Union[str, Iterable[str]]) -> None:
+    """
+    Choose the backends used when a call does not name any.
+
+    Also exported to the environment so spawned worker processes follow.
+    """
+    global DEFAULT_BACKENDS
+    DEFAULT_BACKENDS = names if isinstance(names, str) else ','.join(names)
+    os.environ['RESUME_PDF_BACKENDS'] = DEFAULT_BACKENDS
+
+
+def get_backends(names: Optional[Union[str, Iterable[str]]] = None) -> List[PdfBackend]:
+    """Resolve backend names (list or comma separated) to the installed backends, in order"""
+    names = DEFAULT_BACKENDS if names is None else names
+    if isinstance(names, str):
+        names = [name.strip() for name in names.split(',') if name.strip()]
+
+    backends = []
+    for name in names:
+        backend = _backends.get(name.lower())
+        if backend is None:
+            raise ValueError(f"Unknown PDF backend: {name}")
+        if backend.available():
+            backends.append(backend)
+    return backends
+
+
+def backend_stats() -> Dict[str, Dict[str, float]]:
+    """Per-backend counters: files completed, pages extracted, seconds spent, failures"""
+    with _lock:
+        return {name: dict(stats) for name, stats in _stats.items()}
+
+
+def reset_backend_stats() -> None:
+    with _lock:
+        for stats in _stats.values():
+            stats.update(files=0, pages=0, seconds=0.0, failures=0)
+
+
+def _record(backend: str, **counts) -> None:
+    with _lock:
+        stats = _stats[backend]
+        for key, value in counts.items():
+            stats[key] += value
+
+
+def iter_pdf_pages(file_path: str, max_pages: Optional[int] = None, max_chars: Optional[int] = None,
+                   time_budget: Optional[float] = None,
+                   backends: Optional[Union[str, Iterable[str]]] = None) -> Iterator[str]:
+    """
+    Yield the text of a PDF page by page, stopping at the first limit hit.
+
+    Pages are parsed only when reached, so stopping early skips the work for
+    the rest of the file. The time budget is checked between pages; a single
+    page that takes longer still runs to completion.
+
+    Backends are tried in order. If one fails, the next one continues from
+    the first page not yet yielded.
+
+    Args:
+        file_path: PDF file
+        max_pages: Maximum number of pages read
+        max_chars: Maximum number of characters yielded; the last page is cut
+        time_budget: Seconds after which no further page is started
+        backends: Backend names overriding DEFAULT_BACKENDS
+
+    Yields:
+        str: Raw text of each page
+    """
+    max_pages = DEFAULT_MAX_PAGES if max_pages is None else max_pages
+    max_chars = DEFAULT_MAX_CHARS if max_chars is None else max_chars
+    time_budget = DEFAULT_TIME_BUDGET if time_budget is None else time_budget
+    deadline = time.monotonic() + time_budget
+    chars = 0
+    done = 0  # Pages yielded so far
+
+    candidates = get_backends(backends)
+    if not candidates:
+        raise RuntimeError("No PDF backend installed")
+
+    error = None
+    for backend in candidates:
+        try:
+            with backend.open(file_path) as (page_count, pages):
+                if done == 0 and page_count > max_pages:
+                    logger.warning(f"{file_path}: reading first {max_pages} of {page_count} pages")
+
+                for index in range(min(page_count, max_pages)):
+                    if index >= done and done and time.monotonic() > deadline:
+                        logger.warning(f"{file_path}: time budget of {time_budget}s used up after {done} pages")
+                        _record(backend.name, files=1)
+                        return
+
+                    start = time.perf_counter()
+                    text = next(pages, None)
+                    _record(backend.name, seconds=time.perf_counter() - start)
+                    if text is None:
+                        break
+                    if index < done:
+                        # Already yielded by a backend that failed later on
+                        continue
+
+                    _record(backend.name, pages=1)
+                    metrics.inc('resume_pdf_pages_total', backend=backend.name)
+                    done += 1
+                    if chars + len(text) >= max_chars:
+                        logger.warning(f"{file_path}: character limit of {max_chars} reached on page {done}")
+                        _record(backend.name, files=1)
+                        yield text[:max_chars - chars]
+                        return
+
+                    chars += len(text)
+                    yield text
+
+            _record(backend.name, files=1)
+            return
+        except Exception as e:
+            _record(backend.name, failures=1)
+            logger.warning(f"{file_path}: {backend.name} failed after {done} pages: {str(e)}")
+            error = e
+
+    raise error
+
+
+def extract_pdf_text(file_path: str, clean: Optional[Callable[[str], str]] = None, separator: str = "\n",
+                     stop_when: Optional[Callable[[List[str]], bool]] = None, **limits) -> str:
+    """
+    Extract the text of a PDF within the limits of iter_pdf_pages.
+
+    Args:
+        file_path: PDF file
+        clean: Applied to each page's text
+        separator: Placed between pages
+        stop_when: Called with the page texts read so far after each page;
+            returning True stops reading the remaining pages
+        **limits: max_pages, max_chars and time_budget for iter_pdf_pages
+
+    Returns:
+        str: Page texts joined once at the end
+    """
+    pages = []
+    for text in iter_pdf_pages(file_path, **limits):
+        pages.append(clean(text) if clean else text)
+        if stop_when is not None and stop_when(pages):
+            break
+    return separator.join(pages)
+
+
+def sections_found(sections: Iterable[str] = tuple(SECTION_PATTERNS)) -> Callable[[List[str]], bool]:
+    """
+    Build a stop_when predicate for extract_pdf_text that stops once every
+    given section heading has been seen.
+
+    Reading continues for one more page after the last heading, so a section
+    that starts at the bottom of a page keeps its content.
+    """
+    patterns = [re.compile(SECTION_PATTERNS[name], re.I) for name in sections]
+
+    def stop(pages: List[str]) -> bool:
+        if len(pages) < 2:
+            return False
+        earlier = "\n".join(pages[:-1])
+        return all(pattern.search(earlier) for pattern in patterns)
+
+    return stop
+
+
+def stop_at_sections(sections: Optional[str] = None) -> Optional[Callable[[List[str]], bool]]:
+    """
+    stop_when predicate for the configured section headings.
+
+    Args:
+        sections: Comma separated SECTION_PATTERNS names or 'all';
+            defaults to DEFAULT_STOP_SECTIONS
+
+    Returns:
+        A sections_found() predicate, or None to read every page
+    """
+    sections = DEFAULT_STOP_SECTIONS if sections is None else sections
+    names = [name.strip() for name in sections.split(',') if name.strip()]
+    if not names:
+        return None
+    if names == ['all']:
+        return sections_found()
+    unknown = set(names).difference(SECTION_PATTERNS)
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(sorted(unknown))}")
+    return sections_found(names)
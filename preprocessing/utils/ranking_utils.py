@@ -0,0 +1,40 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def top_k(scores, k: int, offset: int = 0, min_score: Optional[float] = None) -> Tuple[np.ndarray, int]:
+    """
+    Select one page of the best scores without sorting the whole array.
+
+    np.argpartition finds the best offset + k scores in linear time; only
+    those are sorted.
+
+    Args:
+        scores: 1-D array of scores, higher is better
+        k: Page size
+        offset: Number of best results to skip
+        min_score: Ignore scores below this threshold
+
+    Returns:
+        Tuple of (indices into scores ordered best first, number of scores
+        passing min_score for pagination)
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    if min_score is None:
+        eligible = np.arange(scores.shape[0])
+    else:
+        eligible = np.flatnonzero(scores >= min_score)
+
+    total = eligible.shape[0]
+    end = min(offset + k, total)
+    if k <= 0 or offset >= end:
+        return np.empty(0, dtype=np.int64), total
+
+    subset = scores[eligible]
+    if end < total:
+        best = np.argpartition(-subset, end - 1)[:end]
+    else:
+        best = np.arange(total)
+    best = best[np.argsort(-subset[best], kind='stable')]
+    return eligible[best[offset:end]], total
@@ -0,0 +1,123 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from preprocessing.models.patterns import SKILL_CATEGORIES, SKILL_KEYWORDS
+from preprocessing.models.skill_taxonomy import DEFAULT_CATEGORY, SKILL_ALIASES
+
+_WORD_CHAR = re.compile(r'\w')
+
+
+def _build_trie(words: Iterable[str]) -> dict:
+    """Build a character trie; the '' key marks the end of a word"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return trie
+
+
+def _trie_to_pattern(node: dict) -> str:
+    """Turn a trie into a regex where shared prefixes are matched only once"""
+    alternatives = [
+        re.escape(char) + _trie_to_pattern(child)
+        for char, child in sorted(node.items()) if char
+    ]
+    if not alternatives:
+        return ''
+
+    optional = '' in node
+    if len(alternatives) == 1 and not optional:
+        return alternatives[0]
+
+    pattern = '(?:' + '|'.join(alternatives) + ')'
+    # Greedy '?' prefers the longer skill and backtracks to the shorter one
+    return pattern + '?' if optional else pattern
+
+
+class SkillMatcher:
+    """
+    Find every known skill in a text in a single regex pass.
+
+    The skill vocabulary is compiled into one trie-shaped pattern so the cost
+    per text position depends on skill length, not on the number of skills.
+    Matches respect word boundaries ('go' does not match 'google', 'c++' does
+    match) and overlapping skills such as 'oracle' inside 'oracle cloud' are
+    all reported. Aliases are matched too and reported under their canonical
+    name, so 'nodejs' in a text is found as 'node.js'.
+    """
+
+    def __init__(self, skills: Dict[str, str], aliases: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            skills: Mapping of skill name to category
+            aliases: Mapping of alternative spelling to canonical skill name;
+                canonical names missing from skills get DEFAULT_CATEGORY
+        """
+        self.categories = {skill.lower(): category for skill, category in skills.items()}
+        # Every matched spelling -> the skill reported for it
+        self.canonical = {skill: skill for skill in self.categories}
+        for alias, skill in (aliases or {}).items():
+            skill = skill.lower()
+            self.categories.setdefault(skill, DEFAULT_CATEGORY)
+            self.canonical.setdefault(skill, skill)
+            self.canonical.setdefault(alias.lower(), skill)
+        pattern = _trie_to_pattern(_build_trie(self.canonical))
+        # Zero-width lookahead lets matches overlap at different start positions
+        self._regex = re.compile(rf'(?=(?<!\w)({pattern})(?!\w))', re.IGNORECASE)
+        self._search_regex = re.compile(rf'(?<!\w)(?:{pattern})(?!\w)', re.IGNORECASE)
+
+        # Shorter skills that are word-bounded prefixes of longer ones
+        # start at the same position, so the regex alone would hide them
+        # (an alias of the same skill, like 'node' in 'node.js', is not repeated)
+        self._prefixes = {}
+        for spelling, skill in self.canonical.items():
+            prefixes = [
+                spelling[:i] for i in range(1, len(spelling))
+                if self.canonical.get(spelling[:i], skill) != skill and not _WORD_CHAR.match(spelling[i])
+            ]
+            if prefixes:
+                self._prefixes[spelling] = prefixes
+
+    def finditer(self, text: str) -> Iterator[Tuple[str, int, int]]:
+        """Yield (skill, start, end) for every skill occurrence, in text order"""
+        covered = 0
+        for match in self._regex.finditer(text):
+            spelling = match.group(1).lower()
+            start = match.start(1)
+            # Short aliases inside a longer match ('js' in 'node.js') are not mentions
+            if start < covered and self.canonical[spelling] != spelling:
+                continue
+            covered = max(covered, match.end(1))
+            for prefix in self._prefixes.get(spelling, ()):
+                yield self.canonical[prefix], start, start + len(prefix)
+            yield self.canonical[spelling], start, match.end(1)
+
+    def find_all(self, text: str) -> List[Tuple[str, int, int]]:
+        """Return all (skill, start, end) occurrences"""
+        return list(self.finditer(text))
+
+    def find_skills(self, text: str) -> List[str]:
+        """Return the distinct skills found, in order of first occurrence"""
+        return list(dict.fromkeys(skill for skill, _, _ in self.finditer(text)))
+
+    def search(self, text: str) -> bool:
+        """Whether the text mentions any known skill"""
+        return self._search_regex.search(text) is not None
+
+    def category(self, skill: str) -> Optional[str]:
+        """Category of a known skill or alias"""
+        return self.categories.get(self.canonical.get(skill.lower(), skill.lower()))
+
+
+@lru_cache(maxsize=1)
+def get_skill_matcher() -> SkillMatcher:
+    """Shared matcher over SKILL_CATEGORIES plus the uncategorised SKILL_KEYWORDS and SKILL_ALIASES"""
+    skills = {skill: DEFAULT_CATEGORY for skill in SKILL_KEYWORDS}
+    for category, category_skills in SKILL_CATEGORIES.items():
+        for skill in category_skills:
+            skills[skill] = category
+    aliases = {alias: skill for skill, alternatives in SKILL_ALIASES.items() for alias in alternatives}
+    return SkillMatcher(skills, aliases)
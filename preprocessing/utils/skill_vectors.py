@@ -0,0 +1,73 @@
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+class SkillVectorStore:
+    """
+    Unit-normalized word vectors for a skill vocabulary.
+
+    Each skill's vector is computed once with nlp.make_doc (tokenizer and
+    vector table only, no pipeline components) and kept as a row of one
+    float32 matrix. Similarity between two lists of skills is then a single
+    matrix product; it equals spaCy's Doc.similarity for the same strings.
+    Skills without a vector get a zero row and so similarity 0.
+    """
+
+    def __init__(self, nlp, skills: Optional[Iterable[str]] = None):
+        """
+        Args:
+            nlp: spaCy pipeline whose vocab provides the vectors
+            skills: Vocabulary to precompute; more skills are added on demand
+        """
+        self.nlp = nlp
+        self.index: Dict[str, int] = {}
+        self.matrix = np.zeros((0, nlp.vocab.vectors_length), dtype=np.float32)
+        self._lock = threading.Lock()
+        if skills is not None:
+            self.add(skills)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def add(self, skills: Iterable[str]) -> None:
+        """Compute and store vectors for skills not in the store yet"""
+        new_skills = [
+            skill for skill in dict.fromkeys(skill.lower().strip() for skill in skills)
+            if skill not in self.index
+        ]
+        if not new_skills:
+            return
+
+        vectors = np.array([self.nlp.make_doc(skill).vector for skill in new_skills], dtype=np.float32)
+        vectors = vectors.reshape(len(new_skills), self.matrix.shape[1])
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+
+        with self._lock:
+            start = len(self.index)
+            for offset, skill in enumerate(new_skills):
+                self.index[skill] = start + offset
+            self.matrix = np.vstack([self.matrix, vectors])
+
+    def rows(self, skills: List[str]) -> np.ndarray:
+        """Return the row indices of skills, adding unknown ones first"""
+        keys = [skill.lower().strip() for skill in skills]
+        missing = [key for key in keys if key not in self.index]
+        if missing:
+            self.add(missing)
+        return np.fromiter((self.index[key] for key in keys), dtype=np.int64, count=len(keys))
+
+    def similarity(self, skills_a: List[str], skills_b: List[str]) -> np.ndarray:
+        """
+        Cosine similarity of every skill in skills_a with every skill in skills_b.
+
+        Returns:
+            np.ndarray: Matrix of shape (len(skills_a), len(skills_b))
+        """
+        if not skills_a or not skills_b:
+            return np.zeros((len(skills_a), len(skills_b)), dtype=np.float32)
+        rows_a = self.rows(skills_a)
+        rows_b = self.rows(skills_b)
+        return self.matrix[rows_a] @ self.matrix[rows_b].T
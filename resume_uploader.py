@@ -1,9 +1,12 @@
 import streamlit as st
 import os
+import time
 import logging
 from datetime import datetime
 from pathlib import Path
 
+from preprocessing.database.ingest_queue import DONE, FAILED, IngestQueue
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -15,6 +18,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Seconds between status refreshes while uploaded files are being ingested
+STATUS_POLL_INTERVAL = 2
+# Stop refreshing this many seconds after the last upload
+STATUS_POLL_TIMEOUT = int(os.environ.get('RESUME_STATUS_POLL_TIMEOUT', 300))
+
+@st.cache_resource
+def get_ingest_queue():
+    """Ingest queue shared across reruns; workers run as a separate service"""
+    return IngestQueue()
+
 def get_upload_directory():
     """Get the upload directory path"""
     try:
@@ -52,10 +65,10 @@ def validate_file(file):
         raise ValueError(f"File size exceeds maximum limit of 10MB")
     
     # Check file extension
-    allowed_extensions = {'.pdf', '.docx'}
+    allowed_extensions = {'.pdf', '.docx', '.doc', '.rtf'}
     file_extension = os.path.splitext(file.name)[1].lower()
     if file_extension not in allowed_extensions:
-        raise ValueError(f"File type not allowed. Please upload PDF or DOCX files only")
+        raise ValueError(f"File type not allowed. Please upload PDF, DOCX, DOC or RTF files only")
 
 def generate_unique_filename(original_filename):
     """Generate a unique filename to prevent overwrites"""
@@ -83,6 +96,11 @@ def save_uploaded_file(uploaded_file, target_dir):
             raise Exception(f"File was not saved successfully at: {file_path}")
             
         logger.info(f"Successfully saved file: {unique_filename}")
+        
+        # Hand the file to the background ingest workers
+        job_id = get_ingest_queue().enqueue(file_path)
+        st.session_state.setdefault('ingest_jobs', {})[job_id] = uploaded_file.name
+        st.session_state['ingest_polled_since'] = time.time()
         return True, unique_filename
     except ValueError as ve:
         logger.warning(f"Validation error: {str(ve)}")
@@ -91,25 +109,58 @@ def save_uploaded_file(uploaded_file, target_dir):
         logger.error(f"Error saving file: {str(e)}")
         return False, f"Error saving file: {str(e)}"
 
+def show_ingest_status():
+    """Show the ingest status of files uploaded in this session, polling until all are finished"""
+    uploads = st.session_state.get('ingest_jobs', {})
+    if not uploads:
+        return
+    
+    jobs = get_ingest_queue().jobs(list(uploads))
+    st.subheader("Processing status")
+    for job_id, name in uploads.items():
+        job = jobs.get(job_id)
+        if job is None:
+            continue
+        if job['status'] == DONE:
+            st.write(f"{name}: processed (candidate {job['candidate_id']})")
+        elif job['status'] == FAILED:
+            st.write(f"{name}: failed - {job['error']}")
+        else:
+            st.write(f"{name}: {job['status']}")
+    
+    if any(job['status'] not in (DONE, FAILED) for job in jobs.values()):
+        polled_since = st.session_state.get('ingest_polled_since', time.time())
+        if time.time() - polled_since > STATUS_POLL_TIMEOUT:
+            st.info("Files are still being processed. Reload the page to check their status again.")
+            st.session_state['ingest_polled_since'] = time.time()
+            return
+        time.sleep(STATUS_POLL_INTERVAL)
+        st.rerun()
+
 def main():
     st.title("Resume Uploader")
-    st.write("Upload your resume in PDF or DOCX format")
+    st.write("Upload your resume in PDF, DOCX, DOC or RTF format")
     
     try:
         # Get upload directory
         input_dir = get_upload_directory()
         
         # File uploader
-        uploaded_file = st.file_uploader("Choose a file", type=['pdf', 'docx'])
+        uploaded_file = st.file_uploader("Choose a file", type=['pdf', 'docx', 'doc', 'rtf'])
         
-        if uploaded_file is not None:
+        # The uploader keeps returning the same file on every rerun; save it once
+        saved = st.session_state.setdefault('saved_uploads', set())
+        if uploaded_file is not None and uploaded_file.file_id not in saved:
             # Save the file
             success, message = save_uploaded_file(uploaded_file, input_dir)
             
             if success:
+                saved.add(uploaded_file.file_id)
                 st.success("File uploaded successfully!")
             else:
                 st.error(message)
+        
+        show_ingest_status()
                 
     except Exception as e:
         logger.error(f"Application error: {str(e)}")
@@ -3,13 +3,13 @@ import os
 from datetime import datetime
 
 LOG_FILE=f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
-log_path=os.path.join(os.getcwd(),"LOGS",LOG_FILE)
+log_path=os.path.join(os.getcwd(),"LOGS")
 os.makedirs(log_path,exist_ok=True)
 
 LOG_FILE_PATH=os.path.join(log_path,LOG_FILE)
 
 logging.basicConfig (
-    filename="LOG_FILE",
-    format="[%(ascii)s] %(lineno)d %(name)s - %(levelname)s - %(message)s",
+    filename=LOG_FILE_PATH,
+    format="[%(asctime)s] %(lineno)d %(name)s - %(levelname)s - %(message)s",
     level=logging.INFO
-)
\ No newline at end of file
+)
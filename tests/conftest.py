@@ -0,0 +1,35 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from preprocessing.Database_setup.db_design import Base
+
+
+@pytest.fixture
+def engine():
+    """In-memory SQLite database with the full schema"""
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def add_candidate(session, candidate_id, skills=(), **columns):
+    """Insert a candidates row (and its skills) with placeholder name and email"""
+    row = {'candidate_id': candidate_id, 'name': f"Candidate {candidate_id}",
+           'email': f"candidate{candidate_id}@example.com", **columns}
+    session.execute(
+        text(f"INSERT INTO candidates ({', '.join(row)}) VALUES ({', '.join(':' + c for c in row)})"), row
+    )
+    for skill in skills:
+        session.execute(
+            text("INSERT INTO skills (candidate_id, skill_name) VALUES (:candidate_id, :skill_name)"),
+            {'candidate_id': candidate_id, 'skill_name': skill}
+        )
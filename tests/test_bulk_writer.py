@@ -0,0 +1,95 @@
+import pytest
+from sqlalchemy import text
+
+from preprocessing.database.bulk_writer import BulkResumeWriter
+
+
+def parsed(path, email, skills=(), work=(), **extra):
+    return {
+        'file_path': path,
+        'candidate': {'name': path, 'email': email, 'experience': 3.0, 'resume_text': f"{path} text"},
+        'skills': [{'name': skill, 'proficiency': None} for skill in skills],
+        'work_history': [
+            {'company': company, 'title': None, 'start_date': None, 'end_date': None, 'description': ''}
+            for company in work
+        ],
+        **extra
+    }
+
+
+def rows(engine, sql):
+    with engine.connect() as conn:
+        return sorted(tuple(row) for row in conn.execute(text(sql)))
+
+
+def candidate_id_of(engine, email):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT candidate_id FROM candidates WHERE email = :email"),
+                            {'email': email}).scalar()
+
+
+@pytest.mark.parametrize('returning', [True, False], ids=['returning', 'lastrowid'])
+def test_batch_is_written_in_input_order(engine, monkeypatch, returning):
+    # MySQL has no multi-row RETURNING and takes one insert per candidate
+    monkeypatch.setattr(engine.dialect, 'insert_executemany_returning_sort_by_parameter_order', returning)
+
+    with BulkResumeWriter(engine, batch_size=10) as writer:
+        for i in range(3):
+            writer.add(parsed(f"r{i}.pdf", f"r{i}@example.com", skills=['Python'], work=[f"Co {i}"]))
+
+    ids = rows(engine, "SELECT email, candidate_id FROM candidates")
+    assert writer.stored == {f"r{i}.pdf": dict(ids)[f"r{i}@example.com"] for i in range(3)}
+    assert len(rows(engine, "SELECT * FROM skills")) == 3
+    assert len(rows(engine, "SELECT * FROM work_experience")) == 3
+
+
+def test_duplicate_emails_reuse_the_candidate(engine):
+    with BulkResumeWriter(engine) as writer:
+        writer.add(parsed("a.pdf", "same@example.com", skills=['sql']))
+    with BulkResumeWriter(engine) as writer:
+        writer.add(parsed("b.pdf", "same@example.com", skills=['java']))
+        writer.add(parsed("c.pdf", "same@example.com", skills=['go']))
+
+    assert len(set(writer.stored.values())) == 1
+    assert rows(engine, "SELECT skill_name FROM skills") == [('sql',)]
+
+
+def test_replacement_rewrites_candidate_skills_and_work(engine):
+    with BulkResumeWriter(engine) as writer:
+        writer.add(parsed("a.pdf", "a@example.com", skills=['sql', 'java'], work=['Old Co']))
+    candidate_id = writer.stored['a.pdf']
+
+    with BulkResumeWriter(engine) as writer:
+        writer.add(parsed("a.pdf", "a@example.com", skills=['Go'], work=['New Co'], candidate_id=candidate_id))
+
+    assert writer.stored == {'a.pdf': candidate_id}
+    assert rows(engine, "SELECT candidate_id, skill_name FROM skills") == [(candidate_id, 'go')]
+    assert rows(engine, "SELECT company_name FROM work_experience") == [('New Co',)]
+
+
+def test_analysis_rows_are_written(engine):
+    with BulkResumeWriter(engine) as writer:
+        writer.add(parsed("a.pdf", "a@example.com", analysis="Extracted data from resume"))
+        writer.add(parsed("b.pdf", "b@example.com"))
+
+    assert rows(engine, "SELECT candidate_id, insights FROM analysis_results") == [
+        (writer.stored['a.pdf'], "Extracted data from resume")
+    ]
+
+
+def test_failed_batch_is_retried_resume_by_resume(engine):
+    with BulkResumeWriter(engine) as writer:
+        writer.add(parsed("a.pdf", "a@example.com"))
+        writer.add(parsed("b.pdf", "b@example.com"))
+    taken_id = writer.stored['b.pdf']
+
+    flushed = []
+    writer = BulkResumeWriter(engine, batch_size=2, on_flush=lambda stored, errors: flushed.append((stored, errors)))
+    # Replacing a with b's email breaks the unique email key
+    writer.add(parsed("a.pdf", "b@example.com", candidate_id=candidate_id_of(engine, 'a@example.com')))
+    writer.add(parsed("c.pdf", "c@example.com"))
+
+    assert list(writer.stored) == ['c.pdf']
+    assert list(writer.errors) == ['a.pdf']
+    assert flushed == [(writer.stored, writer.errors)]
+    assert dict(rows(engine, "SELECT email, candidate_id FROM candidates"))['b@example.com'] == taken_id
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import pytest
+
+from preprocessing.database.bulk_writer import BulkResumeWriter
+from preprocessing.database.candidate_filter import build_prefilter, filter_candidates
+from preprocessing.processors.resume_processor import ResumeProcessor
+
+from .conftest import add_candidate
+
+
+def job(required_experience=0, required_education=None, location=''):
+    return SimpleNamespace(required_experience=required_experience,
+                           required_education=required_education, location=location)
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    # ResumeProcessor logs to resume_processing.log in the working directory
+    monkeypatch.chdir(tmp_path)
+    return ResumeProcessor('sqlite://')
+
+
+def test_extractors_leave_unstated_fields_empty(processor):
+    assert processor.extract_experience("Built APIs in Python")[0] is None
+    assert processor.extract_education("Built APIs in Python")['degree'] is None
+    assert processor.extract_experience("5+ years of experience in Python")[0] == 5.0
+    assert processor.extract_education("M.Tech, 2019")['degree'] == 'Masters'
+
+
+def test_unknown_experience_is_kept(session):
+    add_candidate(session, 1, total_experience=6.0)
+    add_candidate(session, 2, total_experience=1.0)
+    add_candidate(session, 3, total_experience=None)
+    # Rows written before the extractor stopped defaulting to 0
+    add_candidate(session, 4, total_experience=0.0)
+
+    assert filter_candidates(session, job(required_experience=5), ['experience']) == [1, 3, 4]
+
+
+def test_unknown_education_is_kept(session):
+    add_candidate(session, 1, highest_qualification='Masters')
+    add_candidate(session, 2, highest_qualification='High School')
+    add_candidate(session, 3, highest_qualification=None)
+    add_candidate(session, 4, highest_qualification='B.Tech')
+
+    assert filter_candidates(session, job(required_education='bachelor'), ['education']) == [1, 3, 4]
+
+
+def test_parsed_resume_without_fields_passes_prefilter(session, processor):
+    resume = "Jane Doe\nBuilt APIs in Python"
+    experience, _ = processor.extract_experience(resume)
+    education = processor.extract_education(resume)['degree']
+    add_candidate(session, 1, total_experience=experience, highest_qualification=education)
+
+    strict = job(required_experience=3, required_education='master')
+    assert filter_candidates(session, strict, ['experience', 'education']) == [1]
+
+
+def test_must_have_skills_ignore_case(session):
+    add_candidate(session, 1, skills=['python', 'sql'])
+    add_candidate(session, 2, skills=['python'])
+    add_candidate(session, 3, skills=['java'])
+
+    assert filter_candidates(session, job(), (), ['Python', 'SQL']) == [1]
+
+
+def test_written_skill_names_are_normalized(engine, session):
+    with BulkResumeWriter(engine) as writer:
+        writer.add({
+            'file_path': 'a.pdf',
+            'candidate': {'name': 'A', 'email': 'a@example.com'},
+            'skills': [{'name': ' PyTorch ', 'proficiency': None}, {'name': 'Rust', 'proficiency': None}],
+            'work_history': []
+        })
+
+    assert filter_candidates(session, job(), (), ['pytorch', 'RUST']) == [writer.stored['a.pdf']]
+
+
+def test_unknown_requirement_raises():
+    with pytest.raises(ValueError):
+        build_prefilter(job(), ['salary'])
@@ -0,0 +1,114 @@
+from types import SimpleNamespace
+
+import numpy as np
+from sqlalchemy import text
+
+from preprocessing.database import candidate_store
+from preprocessing.database.candidate_store import CandidateStore, education_level
+
+from .conftest import add_candidate
+
+
+def fetched(candidate_id, skills=(), experience=None, qualification=None, location=None):
+    """A (candidate row, skill names) pair as the loaders pass to _append"""
+    row = SimpleNamespace(candidate_id=candidate_id, total_experience=experience,
+                          highest_qualification=qualification, location=location)
+    return row, list(skills)
+
+
+def contents(store):
+    """Candidate ID -> (skills, location) for every row"""
+    return {
+        int(store.candidate_ids[row]): (sorted(store.skills_of(row)), store.location_of(row))
+        for row in range(len(store))
+    }
+
+
+def test_append_keeps_rows_sorted_by_candidate_id():
+    store = CandidateStore()
+    store._append([fetched(2, ['python']), fetched(5, ['sql'], location='Pune')])
+    store._append([fetched(3, ['java']), fetched(1, ['go'])])
+
+    assert store.candidate_ids.tolist() == [1, 2, 3, 5]
+    assert contents(store) == {
+        1: (['go'], None), 2: (['python'], None), 3: (['java'], None), 5: (['sql'], 'Pune')
+    }
+
+
+def test_append_collapses_aliases_and_interns_fields():
+    store = CandidateStore()
+    store._append([
+        fetched(1, ['NodeJS', 'node.js', 'Python'], experience=4.5, qualification='Master of Science',
+                location='Berlin'),
+        fetched(2, [], location='Berlin')
+    ])
+
+    assert store.skills_of(0) == sorted(['node.js', 'python'], key=store.taxonomy.resolve)
+    assert store.skill_indptr.tolist() == [0, 2, 2]
+    assert store.experience.tolist() == [4.5, 0.0]
+    assert store.education_level[0] == education_level('master')
+    assert store.location_id.tolist() == [0, 0]
+
+
+def test_take_reorders_and_drops_rows_with_their_skills():
+    store = CandidateStore()
+    store._append([fetched(1, ['python', 'sql']), fetched(2, []), fetched(3, ['java'], location='Oslo')])
+
+    store._take(np.array([2, 0]))
+
+    assert store.candidate_ids.tolist() == [3, 1]
+    assert store.skills_of(0) == ['java']
+    assert sorted(store.skills_of(1)) == ['python', 'sql']
+    assert store.location_of(0) == 'Oslo'
+
+    store._clear()
+    assert len(store) == 0 and store.skill_indptr.tolist() == [0]
+
+
+def test_posting_lists_follow_row_changes():
+    store = CandidateStore()
+    store._append([fetched(1, ['python', 'sql']), fetched(2, ['python']), fetched(3, ['nodejs', 'python'])])
+
+    assert store.candidates_with_all_skills(['Python']).tolist() == [1, 2, 3]
+    assert store.candidates_with_all_skills(['python', 'node.js']).tolist() == [3]
+    assert store.candidates_with_all_skills(['cobol']).tolist() == []
+    assert store.candidates_with_all_skills([]).tolist() == [1, 2, 3]
+
+    store._take(np.array([1, 2]))
+    assert store.candidates_with_all_skills(['python']).tolist() == [2, 3]
+
+
+def test_refresh_tracks_inserts_updates_and_deletes(session, monkeypatch):
+    monkeypatch.setattr(candidate_store, 'LOAD_PAGE_SIZE', 2)
+    for candidate_id in (1, 2, 3, 4, 5):
+        add_candidate(session, candidate_id, skills=['python'], location='Delhi')
+    store = CandidateStore()
+
+    assert store.refresh(session) == 5
+
+    session.execute(text("DELETE FROM skills WHERE candidate_id = 2"))
+    session.execute(text("DELETE FROM candidates WHERE candidate_id = 2"))
+    session.execute(text(
+        "UPDATE candidates SET location = 'Goa', updated_at = '2999-01-01 00:00:00' WHERE candidate_id = 4"
+    ))
+    session.execute(text("INSERT INTO skills (candidate_id, skill_name) VALUES (4, 'sql')"))
+    add_candidate(session, 0, skills=['go'])
+    store.refresh(session)
+
+    assert contents(store) == {
+        0: (['go'], None), 1: (['python'], 'Delhi'), 3: (['python'], 'Delhi'),
+        4: (['python', 'sql'], 'Goa'), 5: (['python'], 'Delhi')
+    }
+
+
+def test_snapshot_keeps_its_generation(session):
+    add_candidate(session, 1, skills=['python'])
+    store = CandidateStore()
+    store.refresh(session)
+    snapshot = store.snapshot()
+
+    add_candidate(session, 2, skills=['sql'])
+    store.refresh(session)
+
+    assert snapshot.candidate_ids.tolist() == [1]
+    assert store.candidate_ids.tolist() == [1, 2]
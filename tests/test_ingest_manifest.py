@@ -0,0 +1,117 @@
+import os
+
+import pytest
+
+from preprocessing.database import ingest_manifest
+from preprocessing.database.ingest_manifest import IngestManifest
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    with IngestManifest(str(tmp_path / 'manifest.db')) as manifest:
+        yield manifest
+
+
+@pytest.fixture
+def inbox(tmp_path):
+    inbox = tmp_path / 'inbox'
+    inbox.mkdir()
+    return inbox
+
+
+def write(path, content, mtime=None):
+    path.write_bytes(content)
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+    return str(path)
+
+
+def paths(entries):
+    return sorted(os.path.basename(entry['path']) for entry in entries)
+
+
+def ingest(manifest, files, first_id=1):
+    """Scan files and record every new or changed one, as an ingest run would"""
+    selected = manifest.select(files)
+    for record_id, entry in enumerate(selected.values(), first_id):
+        manifest.record(entry, record_id)
+    return selected
+
+
+def test_first_scan_reports_everything_new(manifest, inbox):
+    files = [write(inbox / 'a.pdf', b'a'), write(inbox / 'b.pdf', b'b')]
+
+    scan = manifest.scan(files)
+
+    assert paths(scan['new']) == ['a.pdf', 'b.pdf']
+    assert not scan['changed'] and not scan['unchanged']
+
+
+def test_untouched_files_are_skipped_without_hashing(manifest, inbox, monkeypatch):
+    files = [write(inbox / 'a.pdf', b'a')]
+    ingest(manifest, files)
+    monkeypatch.setattr(ingest_manifest, 'file_sha256', pytest.fail)
+
+    scan = manifest.scan(files)
+
+    assert paths(scan['unchanged']) == ['a.pdf']
+    assert scan['unchanged'][0]['record_id'] == 1
+
+
+def test_touched_but_identical_file_is_unchanged(manifest, inbox):
+    path = write(inbox / 'a.pdf', b'a', mtime=1_000_000_000)
+    ingest(manifest, [path])
+    write(inbox / 'a.pdf', b'a', mtime=2_000_000_000)
+
+    assert paths(manifest.scan([path])['unchanged']) == ['a.pdf']
+    assert manifest.get(path)['mtime_ns'] == 2_000_000_000
+
+
+def test_changed_file_keeps_its_record_id(manifest, inbox):
+    path = write(inbox / 'a.pdf', b'old', mtime=1_000_000_000)
+    ingest(manifest, [path], first_id=7)
+    write(inbox / 'a.pdf', b'new content', mtime=2_000_000_000)
+
+    scan = manifest.scan([path])
+
+    assert paths(scan['changed']) == ['a.pdf']
+    assert scan['changed'][0]['record_id'] == 7
+
+
+def test_copy_of_ingested_file_is_a_duplicate(manifest, inbox):
+    original = write(inbox / 'a.pdf', b'same')
+    ingest(manifest, [original], first_id=3)
+    copy = write(inbox / 'copy.pdf', b'same')
+
+    scan = manifest.scan([original, copy])
+
+    assert paths(scan['duplicate']) == ['copy.pdf']
+    assert manifest.get(copy)['record_id'] == 3
+
+
+def test_deleted_files_are_reported_under_root_and_forgotten(manifest, inbox, tmp_path):
+    kept = write(inbox / 'a.pdf', b'a')
+    removed = write(inbox / 'b.pdf', b'b')
+    elsewhere = tmp_path / 'other'
+    elsewhere.mkdir()
+    outside = write(elsewhere / 'c.pdf', b'c')
+    ingest(manifest, [kept, removed, outside])
+    os.remove(removed)
+
+    assert paths(manifest.scan([kept], root=str(inbox))['deleted']) == ['b.pdf']
+
+    manifest.select([kept], root=str(inbox))
+    assert manifest.get(removed) is None
+    assert manifest.get(outside) is not None
+
+
+def test_select_returns_pending_files_by_given_path(manifest, inbox, monkeypatch):
+    monkeypatch.chdir(inbox)
+    write(inbox / 'a.pdf', b'a')
+    ingest(manifest, ['a.pdf'])
+    write(inbox / 'b.pdf', b'b')
+
+    selected = manifest.select(['a.pdf', 'b.pdf'])
+
+    assert list(selected) == ['b.pdf']
+    assert selected['b.pdf']['path'] == str(inbox / 'b.pdf')
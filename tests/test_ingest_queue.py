@@ -0,0 +1,100 @@
+import threading
+
+import pytest
+
+from preprocessing.database.ingest_queue import DONE, FAILED, QUEUED, RUNNING, IngestQueue
+
+
+@pytest.fixture
+def queue_path(tmp_path):
+    return str(tmp_path / 'queue.db')
+
+
+@pytest.fixture
+def queue(queue_path):
+    with IngestQueue(queue_path, max_attempts=2) as queue:
+        yield queue
+
+
+def test_same_content_is_queued_once(queue):
+    first = queue.enqueue('a.pdf', sha256='aa')
+
+    assert queue.enqueue('copy-of-a.pdf', sha256='aa') == first
+    assert queue.enqueue('b.pdf', sha256='bb') != first
+
+    queue.complete(queue.claim('w1')['id'], candidate_id=1)
+    assert queue.enqueue('a.pdf', sha256='aa') != first
+
+
+def test_claim_takes_oldest_job_and_marks_it_running(queue):
+    first = queue.enqueue('a.pdf', sha256='aa')
+    queue.enqueue('b.pdf', sha256='bb')
+
+    job = queue.claim('w1')
+
+    assert job['id'] == first
+    assert (job['status'], job['attempts'], job['worker']) == (RUNNING, 1, 'w1')
+    assert queue.get(first)['status'] == RUNNING
+    assert queue.claim('w2')['path'].endswith('b.pdf')
+    assert queue.claim('w3') is None
+
+
+def test_concurrent_claims_hand_out_each_job_once(queue, queue_path):
+    job_ids = {queue.enqueue(f"{i}.pdf", sha256=str(i)) for i in range(40)}
+    claimed = []
+
+    def work(name):
+        with IngestQueue(queue_path) as own:
+            while (job := own.claim(name)) is not None:
+                claimed.append(job['id'])
+
+    threads = [threading.Thread(target=work, args=(f"w{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(job_ids)
+
+
+def test_failures_are_retried_until_max_attempts(queue):
+    job_id = queue.enqueue('a.pdf', sha256='aa')
+
+    queue.fail(queue.claim('w1')['id'], "parse error")
+    assert queue.get(job_id)['status'] == QUEUED
+
+    queue.fail(queue.claim('w1')['id'], "parse error")
+    job = queue.get(job_id)
+    assert (job['status'], job['attempts'], job['error']) == (FAILED, 2, "parse error")
+    assert queue.claim('w1') is None
+
+
+def test_requeue_stale_returns_jobs_of_dead_workers(queue):
+    dead = queue.enqueue('a.pdf', sha256='aa')
+    alive = queue.enqueue('b.pdf', sha256='bb')
+    queue.claim('dead')
+    queue.claim('alive')
+
+    assert queue.requeue_stale(3600) == 0
+    assert queue.requeue_stale(0, worker='dead') == 1
+    assert queue.get(dead)['status'] == QUEUED
+    assert queue.get(alive)['status'] == RUNNING
+
+
+def test_requeue_stale_fails_jobs_out_of_attempts(queue):
+    job_id = queue.enqueue('a.pdf', sha256='aa')
+    for _ in range(2):
+        queue.claim('w1')
+        queue.requeue_stale(0)
+
+    assert queue.get(job_id)['status'] == FAILED
+    assert queue.counts() == {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 1}
+
+
+def test_jobs_survive_reopening(queue_path):
+    with IngestQueue(queue_path) as queue:
+        job_id = queue.enqueue('a.pdf', sha256='aa')
+        queue.complete(queue.claim('w1')['id'], candidate_id=42)
+
+    with IngestQueue(queue_path) as queue:
+        assert queue.jobs([job_id])[job_id]['candidate_id'] == 42
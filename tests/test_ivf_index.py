@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from preprocessing.utils.embedding_index import EmbeddingIndex
+from preprocessing.utils.ivf_index import IVFIndex
+
+N_ROWS = 4000
+DIM = 16
+
+
+def unit_vectors(rng, count):
+    vectors = rng.standard_normal((count, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def vectors():
+    return unit_vectors(np.random.default_rng(0), N_ROWS)
+
+
+@pytest.fixture
+def index(tmp_path, vectors):
+    index = EmbeddingIndex(str(tmp_path))
+    index.upsert(range(1, N_ROWS + 1), vectors)
+    return index
+
+
+@pytest.fixture
+def ivf(index):
+    ivf = IVFIndex(index, nprobe=4)
+    ivf.build(n_lists=32)
+    return ivf
+
+
+def exact_top(vectors, query, k, allowed=None):
+    ids = np.arange(1, len(vectors) + 1) if allowed is None else np.asarray(allowed)
+    scores = vectors[ids - 1] @ query
+    return ids[np.argsort(-scores)[:k]]
+
+
+def test_lists_cover_every_live_row_once(ivf):
+    assert ivf.n_lists == 32
+    assert ivf.offsets[-1] == N_ROWS
+    assert np.array_equal(np.sort(ivf.rows), np.arange(N_ROWS))
+    assert not ivf.needs_rebuild
+
+
+def test_search_returns_exact_scores_best_first(ivf, vectors):
+    query = vectors[10]
+    ids, scores = ivf.search(query, 20)
+
+    assert ids[0] == 11
+    assert np.all(np.diff(scores) <= 0)
+    # Vectors are stored as float16
+    assert np.allclose(scores, vectors[ids - 1] @ query, atol=1e-2)
+
+
+def test_recall_grows_with_nprobe(ivf, vectors):
+    queries = vectors[:20]
+
+    assert ivf.recall(queries, 10, nprobe=32) == pytest.approx(1.0)
+    assert ivf.recall(queries, 10, nprobe=8) >= ivf.recall(queries, 10, nprobe=1)
+
+
+def test_filtered_search_stays_inside_allowed_and_finds_k(ivf, vectors):
+    allowed = np.arange(1, N_ROWS + 1, 50)
+    query = vectors[0]
+    ids, _ = ivf.search(query, 20, allowed=allowed)
+
+    assert len(ids) == 20
+    assert np.isin(ids, allowed).all()
+    # A selective filter probes more lists, so recall holds up
+    assert len(np.intersect1d(ids, exact_top(vectors, query, 20, allowed))) >= 15
+
+
+def test_appended_and_removed_rows(ivf, index, vectors):
+    query = vectors[0]
+    index.upsert([N_ROWS + 1], query[None, :])
+    index.remove([1])
+
+    ids, _ = ivf.search(query, 5)
+    assert ids[0] == N_ROWS + 1
+    assert 1 not in ids
+
+
+def test_rebuild_needed_after_many_appends(ivf, index):
+    extra = unit_vectors(np.random.default_rng(1), N_ROWS // 2)
+    index.upsert(range(N_ROWS + 1, N_ROWS + 1 + len(extra)), extra)
+
+    assert ivf.needs_rebuild
+    ivf.build(n_lists=32)
+    assert not ivf.needs_rebuild
+
+
+def test_saved_lists_are_reloaded(ivf, index):
+    reloaded = IVFIndex(index)
+
+    assert reloaded.n_lists == ivf.n_lists
+    assert np.array_equal(reloaded.rows, ivf.rows)
+
+
+def test_search_without_lists_is_exhaustive(index, vectors):
+    ivf = IVFIndex(index)
+    query = vectors[3]
+
+    assert ivf.needs_rebuild
+    assert np.array_equal(ivf.search(query, 10)[0], exact_top(vectors, query, 10))
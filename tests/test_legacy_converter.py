@@ -0,0 +1,74 @@
+import pytest
+
+from preprocessing.processors import legacy_converter
+from preprocessing.processors.legacy_converter import LegacyConverter, convert_file, rtf_to_text
+
+RESUME_RTF = (
+    r"{\rtf1\ansi\deff0{\fonttbl{\f0 Times New Roman;}}{\colortbl;\red0\green0\blue0;}"
+    r"{\info{\author Someone}}"
+    r"\pard\b Jane Doe\b0\par "
+    r"Skills:\tab Python, SQL\par"
+    r"{\*\generator Writer}"
+    r"Caf\'e9 \u8364? Berlin\line \{braces\}}"
+)
+
+
+def test_rtf_text_skips_formatting_destinations():
+    assert rtf_to_text(RESUME_RTF) == "Jane Doe\nSkills:\tPython, SQL\nCafé € Berlin\n{braces}"
+
+
+def test_rtf_unicode_fallback_follows_uc():
+    # \uc2 means two fallback characters follow each \u escape
+    assert rtf_to_text(r"{\rtf1\uc2 a\u233\'e9\'e9b\uc0 \u233 c}") == "aébéc"
+    assert rtf_to_text(r"{\rtf1 \u-3913?}") == chr(0x10000 - 3913)
+
+
+def test_rtf_group_state_is_restored():
+    assert rtf_to_text(r"{\rtf1 {\fonttbl{\f0 Arial;}}{\*\x hidden}shown {\b bold} text}") == "shown bold text"
+
+
+@pytest.fixture
+def no_external_converters(monkeypatch):
+    monkeypatch.setattr(legacy_converter.shutil, 'which', lambda name: None)
+
+
+def test_convert_file_falls_back_to_builtin_rtf_parser(tmp_path, no_external_converters):
+    path = tmp_path / 'resume.rtf'
+    path.write_text(RESUME_RTF, encoding='latin-1')
+
+    assert convert_file(str(path)).startswith("Jane Doe\nSkills:")
+
+
+def test_renamed_rtf_is_detected_by_content(tmp_path, no_external_converters):
+    rtf = tmp_path / 'resume.doc'
+    rtf.write_text(RESUME_RTF, encoding='latin-1')
+    binary = tmp_path / 'binary.doc'
+    binary.write_bytes(b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + b'\0' * 64)
+
+    assert convert_file(str(rtf)).startswith("Jane Doe")
+    assert convert_file(str(binary)) is None
+
+
+def test_converted_text_is_cached_by_content(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(legacy_converter, 'convert_file',
+                        lambda path, timeout: calls.append(path) or "converted")
+    first = tmp_path / 'a.rtf'
+    copy = tmp_path / 'b.rtf'
+    for path in (first, copy):
+        path.write_text(RESUME_RTF)
+
+    converter = LegacyConverter(cache_dir=str(tmp_path / 'cache'), max_workers=0)
+    assert converter.convert(str(first)) == "converted"
+    assert converter.prefetch([str(copy), str(tmp_path / 'skipped.pdf')]) == {str(copy): "converted"}
+    assert calls == [str(first)]
+
+
+def test_failed_conversions_are_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(legacy_converter, 'convert_file', lambda path, timeout: None)
+    path = tmp_path / 'a.doc'
+    path.write_bytes(b'not a document')
+
+    converter = LegacyConverter(cache_dir=str(tmp_path / 'cache'), max_workers=0)
+    assert converter.convert(str(path)) is None
+    assert not list((tmp_path / 'cache').iterdir())
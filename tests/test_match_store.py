@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+
+from preprocessing.database import match_store
+from preprocessing.database.match_store import (
+    INSERT_MATCH_SQL, MATCH_COLUMNS, MatchStore, upsert_statement
+)
+
+from .conftest import add_candidate
+
+JOB_ID = 7
+
+
+def matches(scores):
+    return [{'candidate_id': candidate_id, 'match_score': score, 'skills_match': 0.5}
+            for candidate_id, score in scores.items()]
+
+
+def stored(session, table='job_matches', score='match_score'):
+    rows = session.execute(text(f"SELECT candidate_id, {score} FROM {table} WHERE job_id = :job_id"),
+                           {'job_id': JOB_ID})
+    return sorted(tuple(row) for row in rows)
+
+
+@pytest.fixture
+def store(session):
+    for candidate_id in (1, 2, 3):
+        add_candidate(session, candidate_id)
+    return MatchStore(session)
+
+
+def test_upsert_statement_per_dialect():
+    mysql = str(upsert_statement('mysql', INSERT_MATCH_SQL, MATCH_COLUMNS))
+    assert "ON DUPLICATE KEY UPDATE match_score = VALUES(match_score)" in mysql
+
+    for dialect in ('sqlite', 'postgresql'):
+        statement = str(upsert_statement(dialect, INSERT_MATCH_SQL, MATCH_COLUMNS))
+        assert "ON CONFLICT (job_id, candidate_id) DO UPDATE SET match_score = excluded.match_score" in statement
+
+    assert upsert_statement('mssql', INSERT_MATCH_SQL, MATCH_COLUMNS) is None
+
+
+@pytest.mark.parametrize('native', [True, False], ids=['upsert', 'fallback'])
+def test_save_overwrites_existing_rows(session, store, monkeypatch, native):
+    if not native:
+        monkeypatch.setattr(match_store, 'upsert_statement', lambda *args: None)
+
+    store.save(JOB_ID, 'fp', matches({1: 0.2, 2: 0.4}))
+    store.save(JOB_ID, 'fp', matches({2: 0.9, 3: 0.1}))
+
+    assert stored(session) == [(1, 0.2), (2, 0.9), (3, 0.1)]
+    assert stored(session, 'rankings', 'overall_score') == [(1, 0.2), (2, 0.9), (3, 0.1)]
+
+
+def test_skill_lists_are_stored_only_when_given(session, store):
+    store.save(JOB_ID, 'fp', matches({1: 0.5}) + [
+        {'candidate_id': 2, 'match_score': 0.5, 'skills_match': 1.0,
+         'matched_skills': ['python'], 'missing_skills': []}
+    ])
+
+    assert stored(session, 'rankings', 'skill_matches') == [(1, None), (2, 'python')]
+
+
+def test_changed_fingerprint_rescores_everything(store):
+    store.save(JOB_ID, 'fp', matches({1: 0.5, 2: 0.5, 3: 0.5}))
+
+    assert store.stale_candidates(JOB_ID, 'other') is None
+    assert store.stale_candidates(JOB_ID + 1, 'fp') is None
+
+
+def test_pages_are_selected_best_first(store):
+    store.save(JOB_ID, 'fp', matches({1: 0.2, 2: 0.9, 3: 0.5}))
+
+    assert [m['candidate_id'] for m in store.load(JOB_ID, k=2)] == [2, 3]
+    assert [m['candidate_id'] for m in store.load(JOB_ID, k=2, offset=2)] == [1]
+    assert store.count(JOB_ID, min_score=0.3) == 2
+
+    page, total = store.load_candidates(JOB_ID, [1, 3, 99], k=1, min_score=0.1)
+    assert [m['candidate_id'] for m in page] == [3] and total == 2
+
+
+def test_job_fingerprint_changes_with_scoring_fields():
+    job = SimpleNamespace(description='d', required_skills='python', required_experience=2,
+                          required_education='bachelor', location='remote')
+
+    assert MatchStore.job_fingerprint(job) == MatchStore.job_fingerprint(job)
+    assert MatchStore.job_fingerprint(job, 'tfidf') != MatchStore.job_fingerprint(job, 'embedding')
@@ -0,0 +1,29 @@
+from preprocessing.models.skill_taxonomy import DEFAULT_CATEGORY
+from preprocessing.utils.skill_matcher import SkillMatcher, get_skill_matcher
+
+
+def test_aliases_are_reported_by_canonical_name():
+    matcher = get_skill_matcher()
+
+    assert matcher.find_skills("Services in NodeJS on k8s") == ['node.js', 'kubernetes']
+    assert matcher.category('nodejs') == matcher.category('node.js')
+
+
+def test_alias_inside_longer_match_is_not_a_mention():
+    matcher = get_skill_matcher()
+
+    assert matcher.find_all("node.js") == [('node.js', 0, 7)]
+    assert matcher.find_skills("react.js and JS") == ['react', 'javascript']
+
+
+def test_overlapping_skills_and_word_boundaries():
+    matcher = SkillMatcher({'oracle': 'db', 'oracle cloud': 'cloud', 'go': 'lang', 'c++': 'lang'})
+
+    assert matcher.find_skills("Oracle Cloud, C++ and go at google") == ['oracle', 'oracle cloud', 'c++', 'go']
+
+
+def test_alias_of_unknown_skill_gets_default_category():
+    matcher = SkillMatcher({'python': 'lang'}, {'es': 'elasticsearch'})
+
+    assert matcher.find_skills("ES and Python") == ['elasticsearch', 'python']
+    assert matcher.category('es') == DEFAULT_CATEGORY